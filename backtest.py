@@ -0,0 +1,176 @@
+###############################################################################
+# FILENAME: backtest.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE: 18-Oct-2026
+# DESCRIPTION: Vectorized backtest of the Bot threshold strategy. Replays the
+# No Action / Buy / Hold / Sell transitions of Bot.apply_strategy over a whole
+# price history at once, fills trades at simulated prices and produces the
+# same bot log columns execute_trades / evaluate_performance would.
+###############################################################################
+import pandas as pd
+import numpy as np
+
+from base import TRADE_STATUSES, EXCHANGES, HISTORY_COLUMNS, TRACE_COLUMNS
+
+
+NO_ACTION, BUY, HOLD, SELL = range(4)    # codes into TRADE_STATUSES
+NO_EXCHANGE, COINBASE, FALCONX = range(3)    # codes into EXCHANGES
+
+
+# STATE MACHINE
+def simulate(close, threshold, bet, coinbase_price=None, falconx_price=None, coinbase_fee_estimate=0.0,
+             falconx_fee_estimate=0.0, initial_trade_status='No Action', initial_indicator=None,
+             initial_exchange='Coinbase', initial_position_btc=None, starting_usd=0.0, starting_btc=0.0):
+    """ Array version of the backtest. Returns a dict of numpy arrays (one entry per bar)
+    keyed by bot log column name, with trade_status and the exchange columns as integer codes
+    into base.TRADE_STATUSES and base.EXCHANGES.
+
+    Like apply_strategy, the decision for a bar is made on the close logged on the
+    previous bar (the last row of the history), so bar 0 uses "initial_indicator"
+    (default: its own close).
+
+    The strategy transitions only depend on whether the indicator is below the threshold
+    now and whether a position was open after the previous bar, and a position is open
+    exactly when the indicator was below the threshold, so every bar is decided at once:
+        below now, not open before -> Buy        below now, open before -> Hold
+        above now, open before     -> Sell       above now, not open before -> No Action
+
+    Fills: buys spend "bet" USD on the venue execute_trades would pick (Coinbase if its
+    price plus fee estimate is below the FalconX price). Sells close the whole position on
+    the venue it was opened on. Each venue fills at its own price column (default: close)
+    less its fee estimate. """
+
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    coinbase_price = close if coinbase_price is None else np.asarray(coinbase_price, dtype=np.float64)
+    falconx_price = close if falconx_price is None else np.asarray(falconx_price, dtype=np.float64)
+    fee = np.array([0.0, coinbase_fee_estimate, falconx_fee_estimate])    # indexed by exchange code
+
+    # Decide every bar
+    indicator = np.empty(n)
+    indicator[0] = close[0] if initial_indicator is None else initial_indicator
+    indicator[1:] = close[:-1]
+    below = indicator < threshold
+    was_open = np.empty(n, dtype=bool)
+    was_open[0] = initial_trade_status in ('Buy', 'Hold')
+    was_open[1:] = below[:-1]
+    trade_status = np.select([below & ~was_open, below & was_open, ~below & was_open], [BUY, HOLD, SELL], NO_ACTION).astype(np.int8)
+    is_buy = trade_status == BUY
+    is_sell = trade_status == SELL
+
+    # Pair each sell with the buy that opened it (trade 0 is a position already open at the start)
+    trade_id = np.cumsum(is_buy)
+    buy_rows = np.flatnonzero(is_buy)
+    buy_exchange = np.where(coinbase_price[buy_rows] + coinbase_fee_estimate * coinbase_price[buy_rows] < falconx_price[buy_rows], COINBASE, FALCONX)
+    buy_price = np.where(buy_exchange == COINBASE, coinbase_price[buy_rows], falconx_price[buy_rows])
+    buy_fee = bet * fee[buy_exchange]
+    trade_exchange = np.concatenate(([EXCHANGES.index(initial_exchange)], buy_exchange))
+    initial_btc = bet / close[0] if initial_position_btc is None else initial_position_btc
+    trade_btc = np.concatenate(([initial_btc], (bet - buy_fee) / buy_price))
+
+    sell_rows = np.flatnonzero(is_sell)
+    sell_trade = trade_id[sell_rows]
+    sell_exchange = trade_exchange[sell_trade]
+    sell_price = np.where(sell_exchange == COINBASE, coinbase_price[sell_rows], falconx_price[sell_rows])
+    proceeds = trade_btc[sell_trade] * sell_price
+    sell_fee = proceeds * fee[sell_exchange]
+
+    # Log the trade action details
+    exchange_selected = np.zeros(n, dtype=np.int8)
+    exchange_selected[buy_rows] = buy_exchange
+    exchange_selected[sell_rows] = sell_exchange
+    position_exchange = np.where(is_buy | (trade_status == HOLD), trade_exchange[trade_id], NO_EXCHANGE).astype(np.int8)
+    position_btc = np.where(is_buy | (trade_status == HOLD), trade_btc[trade_id], 0.0)
+    fill_usd = np.full(n, np.nan)
+    fill_usd[buy_rows] = -float(bet)
+    fill_usd[sell_rows] = proceeds - sell_fee
+    capital_risked = np.where(is_buy, float(bet), 0.0)
+
+    usd_change = {COINBASE: np.zeros(n), FALCONX: np.zeros(n)}
+    btc_change = {COINBASE: np.zeros(n), FALCONX: np.zeros(n)}
+    usd_fees = {COINBASE: np.zeros(n), FALCONX: np.zeros(n)}
+    for exchange in (COINBASE, FALCONX):
+        buys = buy_exchange == exchange
+        sells = sell_exchange == exchange
+        usd_change[exchange][buy_rows[buys]] = -bet
+        btc_change[exchange][buy_rows[buys]] = trade_btc[1:][buys]
+        usd_fees[exchange][buy_rows[buys]] = buy_fee[buys]
+        usd_change[exchange][sell_rows[sells]] = proceeds[sells] - sell_fee[sells]
+        btc_change[exchange][sell_rows[sells]] = -trade_btc[sell_trade[sells]]
+        usd_fees[exchange][sell_rows[sells]] = sell_fee[sells]
+
+    # Evaluate performance (same rules as Bot.evaluate_performance)
+    net_profit = np.zeros(n)
+    net_profit[sell_rows] = proceeds - sell_fee - bet    # balance after sale - balance before sale - original capital risked
+    raroi = np.zeros(n)
+    raroi[sell_rows] = net_profit[sell_rows] / bet
+    running_net_profit = np.cumsum(net_profit)
+    running_capital_risked = np.cumsum(capital_risked)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        running_raroi = running_net_profit / running_capital_risked
+    gross_profit = net_profit + usd_fees[COINBASE] + usd_fees[FALCONX]
+
+    return {
+        'indicator': indicator,
+        'trade_status': trade_status,
+        'coinbase_price': coinbase_price,
+        'falconx_price': falconx_price,
+        'exchange_selected': exchange_selected,
+        'capital_risked': capital_risked,
+        'running_capital_risked': running_capital_risked,
+        'coinbase_usd': starting_usd + np.cumsum(usd_change[COINBASE]),
+        'coinbase_btc': starting_btc + np.cumsum(btc_change[COINBASE]),
+        'coinbase_usd_fees': usd_fees[COINBASE],
+        'falconx_usd': starting_usd + np.cumsum(usd_change[FALCONX]),
+        'falconx_btc': starting_btc + np.cumsum(btc_change[FALCONX]),
+        'falconx_usd_fees': usd_fees[FALCONX],
+        'net_profit': net_profit,
+        'running_net_profit': running_net_profit,
+        'raroi': raroi,
+        'running_raroi': running_raroi,
+        'nofee_win_loss': _win_loss(is_sell, gross_profit),
+        'fee_win_loss': _win_loss(is_sell, net_profit),
+        'position_exchange': position_exchange,
+        'position_btc': position_btc,
+        'fill_usd': fill_usd,
+    }
+
+
+def _win_loss(is_sell, profit):
+    """ 1 for a win, -1 for a loss, 0 otherwise (not a sell, or exactly break even). """
+    return np.where(is_sell, np.sign(profit), 0).astype(np.int8)
+
+
+# DATA FRAME API
+def backtest(price_df, threshold, bet, close_label='c', coinbase_label=None, falconx_label=None, **kwargs):
+    """ Runs the strategy over every row of price_df. Returns price_df with the bot log
+    columns (base.HISTORY_COLUMNS) appended, as if apply_strategy, execute_trades and
+    evaluate_performance had run once per row with simulated fills. Optional coinbase /
+    falconx price columns are used as the venue quotes (default: the close). Extra
+    keyword arguments are passed to simulate(). """
+
+    result = simulate(
+        price_df[close_label].to_numpy(dtype=float),
+        threshold,
+        bet,
+        coinbase_price=None if coinbase_label is None else price_df[coinbase_label].to_numpy(dtype=float),
+        falconx_price=None if falconx_label is None else price_df[falconx_label].to_numpy(dtype=float),
+        **kwargs,
+    )
+    return to_frame(price_df, result)
+
+
+def to_frame(price_df, result):
+    """ Converts simulate() output into a bot log data frame (same values the live bot logs). """
+    columns = dict(result)
+    columns['trade_status'] = pd.Categorical.from_codes(result['trade_status'], TRADE_STATUSES)
+    columns['exchange_selected'] = pd.Categorical.from_codes(result['exchange_selected'], EXCHANGES)
+    columns['position_exchange'] = pd.Categorical.from_codes(result['position_exchange'], EXCHANGES)
+    for col_name in ('nofee_win_loss', 'fee_win_loss'):
+        labels = np.array([None, 'Win', 'Loss'], dtype=object)
+        columns[col_name] = labels[result[col_name] % 3]    # 1 -> Win, -1 -> Loss, 0 -> None
+    for col_name in TRACE_COLUMNS:    # simulated fills have no tick to trade trace
+        columns[col_name] = np.full(len(price_df), None if col_name == 'trace_id' else np.nan, dtype=object if col_name == 'trace_id' else np.float64)
+    log_df = pd.DataFrame({col_name: columns[col_name] for col_name in HISTORY_COLUMNS}, index=price_df.index)
+    return pd.concat([price_df, log_df], axis=1)
@@ -7,13 +7,56 @@
 # FILENAME: base.py
 # DESCRIPTION: Base file that defines the interface for EOC trading bots.
 ###############################################################################
+from __future__ import annotations
 import os
 import time
 import datetime
-import requests
-import pandas as pd
-import numpy as np
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# BOT LOG
+TRADE_STATUSES = ['No Action', 'Buy', 'Hold', 'Sell']
+EXCHANGES = ['None', 'Coinbase', 'FalconX']
+WIN_LOSS = ['Win', 'Loss']
+TRACE_COLUMNS = [    # tick to trade trace of the row (see utils/tracing.py)
+    'trace_id',
+    'price_published_at',
+    'price_observed_at',
+    'decision_made_at',
+    'quote_received_at',
+    'order_sent_at',
+    'order_acknowledged_at',
+    'price_age_ms',
+    'tick_to_trade_ms',
+]
+HISTORY_COLUMNS = [    # columns apply_strategy appends to each price row, in order
+    'indicator',
+    'trade_status',
+    'coinbase_price',
+    'falconx_price',
+    'exchange_selected',
+    'capital_risked',
+    'running_capital_risked',
+    'coinbase_usd',
+    'coinbase_btc',
+    'coinbase_usd_fees',
+    'falconx_usd',
+    'falconx_btc',
+    'falconx_usd_fees',
+    'net_profit',
+    'running_net_profit',
+    'raroi',
+    'running_raroi',
+    'nofee_win_loss',
+    'fee_win_loss',
+    'position_exchange',    # exchange the position open after the row was bought on ('None' if flat)
+    'position_btc',    # base token the open position holds, from the bot's own buy fill (0 if flat)
+    'fill_usd',    # usd the row's own fill paid (negative) or received, net of fees (NaN without a fill)
+] + TRACE_COLUMNS
 
 
 class BotInterface(ABC):
@@ -0,0 +1,113 @@
+###############################################################################
+# FILENAME: exchange_client_benchmark.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Benchmark for the pooled exchange client (exchanges/client.py)
+# against bare requests.get / requests.post calls, using a local stand-in
+# exchange server. One cycle makes the same calls execute_trades does (price
+# quote, rfq, balances). --handshake-ms delays each new connection to stand
+# in for the TCP + TLS setup a real exchange costs.
+#
+# Usage: python -m benchmarks.exchange_client_benchmark [--cycles 50] [--handshake-ms 30]
+###############################################################################
+import json
+import time
+import socket
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import requests
+
+from exchanges.client import ExchangeClient
+
+
+RESPONSES = {
+    '/oracle': {'prices': {'BTC': '40000.00'}},
+    '/accounts/usd': {'balance': '100000.00'},
+    '/accounts/btc': {'balance': '0.25'},
+    '/quotes': {'buy_price': '40020.00', 'fx_quote_id': 'q', 'gross_fee_bps': 5, 'gross_fee_usd': 20, 'rebate_bps': 0, 'rebate_usd': 0, 'fee_bps': 5, 'fee_usd': 20},
+    '/balances/total': [{'token': 'USD', 'total_balance': 100000.0}, {'token': 'BTC', 'total_balance': 0.25}],
+}
+CYCLE = [    # (method, path) in the order execute_trades makes them
+    ('GET', 'oracle'),
+    ('POST', 'quotes'),
+    ('GET', 'accounts/usd'),
+    ('GET', 'accounts/btc'),
+    ('GET', 'balances/total'),
+    ('GET', 'balances/total'),
+]
+
+
+# STAND-IN SERVER
+def start_server(handshake_ms):
+    """ Starts a keep-alive JSON server on a free local port. Returns (server, base url). """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'    # keep-alive
+
+        def setup(self):
+            time.sleep(handshake_ms / 1000)    # paid once per new connection
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)    # headers and body go out as separate writes
+            super().setup()
+
+        def _reply(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                self.rfile.read(length)
+            body = json.dumps(RESPONSES.get(self.path, {})).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = _reply
+        do_POST = _reply
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, 'http://127.0.0.1:' + str(server.server_address[1]) + '/'
+
+
+# BENCHMARK
+def bare_cycle(api_url):
+    for method, path in CYCLE:
+        requests.request(method, api_url + path, json={} if method == 'POST' else None).json()
+
+
+def pooled_cycle(client):
+    for method, path in CYCLE:
+        client.request(method, path, json={} if method == 'POST' else None).json()
+
+
+def time_cycles(cycle, cycles):
+    cycle()    # warm up (the pooled client opens its connection here)
+    start = time.perf_counter()
+    for _ in range(cycles):
+        cycle()
+    return (time.perf_counter() - start) / cycles
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark pooled exchange sessions against bare requests calls.')
+    parser.add_argument('--cycles', type=int, default=50)
+    parser.add_argument('--handshake-ms', type=float, default=30.0, help='simulated connection setup cost of the stand-in server')
+    args = parser.parse_args()
+
+    server, api_url = start_server(args.handshake_ms)
+    client = ExchangeClient(api_url)
+    try:
+        bare = time_cycles(lambda: bare_cycle(api_url), args.cycles)
+        pooled = time_cycles(lambda: pooled_cycle(client), args.cycles)
+    finally:
+        client.close()
+        server.shutdown()
+
+    print('calls per cycle: ' + str(len(CYCLE)) + ', simulated handshake: ' + str(args.handshake_ms) + ' ms')
+    print('bare requests:  ' + str(round(bare * 1000, 2)) + ' ms per cycle')
+    print('pooled client:  ' + str(round(pooled * 1000, 2)) + ' ms per cycle (' + str(round(bare / pooled, 1)) + 'x)')
@@ -0,0 +1,92 @@
+###############################################################################
+# FILENAME: filters_benchmark.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Benchmark for the recursive-filter engine (utils/filters.py)
+# against the row by row loops zlema() and rsi() used to run.
+#
+# Usage: python -m benchmarks.filters_benchmark [--sizes 10000 1000000 10000000]
+###############################################################################
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from utils.filters import zlema_array, rsi_array
+
+
+ROLLING_WINDOW = 14
+PANDAS_LOOP_MAX_ROWS = 10000    # the original iloc loops take minutes beyond this
+
+
+# LEGACY IMPLEMENTATIONS
+def loop_zlema(values, rolling_window):
+    """ The original zlema recursion as a plain Python loop over a list (no pandas
+    overhead, so this is the fastest the old approach could ever be). """
+    close = values.tolist()
+    lag = (rolling_window - 1) // 2
+    smoothing_factor = 2 / (rolling_window + 1)
+    out = [float('nan')] * len(close)
+    out[lag - 1] = close[lag - 1]
+    for i in range(lag, len(close)):
+        out[i] = ((1 - smoothing_factor) * out[i - 1]) + smoothing_factor * (close[i] + (close[i] - close[i - lag]))
+    return out
+
+
+def loop_rsi(values, rolling_window):
+    """ The original Wilder smoothing recursion as a plain Python loop over a list. """
+    close = values.tolist()
+    avg_gain = [float('nan')] * len(close)
+    avg_loss = [float('nan')] * len(close)
+    gains = [max(close[i] - close[i - 1], 0) for i in range(1, len(close))]
+    losses = [max(close[i - 1] - close[i], 0) for i in range(1, len(close))]
+    avg_gain[rolling_window] = sum(gains[:rolling_window]) / rolling_window
+    avg_loss[rolling_window] = sum(losses[:rolling_window]) / rolling_window
+    for i in range(rolling_window + 1, len(close)):
+        avg_gain[i] = (avg_gain[i - 1] * (rolling_window - 1) + gains[i - 1]) / rolling_window
+        avg_loss[i] = (avg_loss[i - 1] * (rolling_window - 1) + losses[i - 1]) / rolling_window
+    return [100 - (100 / (1 + g / l)) if l else 100.0 for g, l in zip(avg_gain, avg_loss)]
+
+
+def pandas_loop_rsi(values, rolling_window):
+    """ The original chained .iloc loop from rsi(), kept here for reference timing. """
+    df = pd.DataFrame({'gain': np.clip(np.diff(values, prepend=np.nan), 0, None)})
+    df['avg_gain'] = df['gain'].rolling(window=rolling_window, min_periods=rolling_window).mean()[:rolling_window+1]
+    avg_gain = df['avg_gain'].copy()
+    for i, row in enumerate(avg_gain.iloc[rolling_window+1:]):
+        avg_gain.iloc[i + rolling_window + 1] = (avg_gain.iloc[i + rolling_window] * (rolling_window - 1) + df['gain'].iloc[i + rolling_window + 1]) / rolling_window
+    return avg_gain
+
+
+# BENCHMARK
+def best_time(func, *args, repeat=3):
+    """ Returns the best wall time (seconds) of "repeat" runs. """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(sizes):
+    rng = np.random.default_rng(0)
+    print('rows'.rjust(10) + 'indicator'.rjust(10) + 'engine_s'.rjust(12) + 'loop_s'.rjust(12) + 'speedup'.rjust(10) + 'pandas_loop_s'.rjust(15))
+    for size in sizes:
+        close = 40000 + np.cumsum(rng.normal(0, 50, size))
+        repeat = 3 if size <= 1000000 else 1
+        for name, engine, loop in [('zlema', zlema_array, loop_zlema), ('rsi', rsi_array, loop_rsi)]:
+            engine_s = best_time(engine, close, ROLLING_WINDOW, repeat=repeat)
+            loop_s = best_time(loop, close, ROLLING_WINDOW, repeat=1)
+            pandas_s = ''
+            if name == 'rsi' and size <= PANDAS_LOOP_MAX_ROWS:
+                pandas_s = str(round(best_time(pandas_loop_rsi, close, ROLLING_WINDOW, repeat=1), 3))
+            print(str(size).rjust(10) + name.rjust(10) + str(round(engine_s, 4)).rjust(12) + str(round(loop_s, 3)).rjust(12) + (str(round(loop_s / engine_s)) + 'x').rjust(10) + pandas_s.rjust(15))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the recursive-filter engine against the legacy loops.')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 1000000, 10000000])
+    args = parser.parse_args()
+    run_benchmark(args.sizes)
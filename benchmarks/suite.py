@@ -0,0 +1,335 @@
+###############################################################################
+# FILENAME: suite.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Benchmark suite with baselines. Covers every function in
+# utils/indicators.py across input sizes, Bot.apply_strategy and
+# evaluate_performance on growing histories (as a data frame and as the
+# BotLog run() uses), and a full run() cycle (history store, strategy, trades
+# against the local exchange simulator, evaluation, output). Each case records
+# the best and median wall time, the peak traced memory and the allocations
+# still alive after the call, and is compared against a JSON baseline;
+# anything slower or bigger than the tolerance is flagged and the exit status
+# is 1, so the suite can gate a change.
+#
+# Usage: python -m benchmarks.suite [--groups indicators strategy cycle]
+#            [--sizes 1000 10000 ...] [--history-sizes 1000 ...] [--filter rsi]
+#            [--baseline benchmarks/baseline.json] [--record] [--tolerance 0.25]
+#            [--output results.json]
+###############################################################################
+import io
+import gc
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import statistics
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from base import HISTORY_COLUMNS, TRACE_COLUMNS
+from config import config_params
+from utils import indicators
+
+
+# CONFIG
+GROUPS = ['indicators', 'strategy', 'cycle']
+INDICATOR_SIZES = [1000, 10000, 100000, 1000000, 10000000]
+HISTORY_SIZES = [1000, 10000, 100000, 1000000]
+ROLLING_WINDOW = 14
+REPEAT = 5    # timed runs per case (1 above REPEAT_MAX_ROWS rows)
+REPEAT_MAX_ROWS = 1000000
+CYCLES = 20    # run() cycles timed in the cycle group
+CYCLE_HISTORY_ROWS = 1000    # rows in the history store the cycle group starts from
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_TOLERANCE = 0.25    # fraction slower / bigger than the baseline that is flagged
+TIME_FLOOR = 0.002    # seconds, smaller differences are noise
+MEMORY_FLOOR = 1024 * 1024    # bytes, smaller differences are noise
+
+
+# DATA
+def price_frame(rows, seed=0):
+    """ Synthetic OHLCV frame with the bot's price columns. """
+    rng = np.random.default_rng(seed)
+    close = 40000 + np.cumsum(rng.normal(0, 50, rows))
+    return pd.DataFrame({
+        'time': np.arange(rows, dtype=np.int64),
+        'l': close - rng.uniform(0, 30, rows),
+        'h': close + rng.uniform(0, 30, rows),
+        'o': close + rng.normal(0, 10, rows),
+        'c': close,
+        'v': rng.uniform(1, 10, rows),
+    })
+
+
+def history_frame(rows, seed=0):
+    """ Synthetic bot history: the price frame plus repeated buy / hold / sell round trips
+    alternating between the exchanges, with balances that move on every sell. """
+    df = price_frame(rows, seed)
+    pattern = np.array(['No Action', 'Buy', 'Hold', 'Hold', 'Sell'], dtype=object)
+    status = pattern[np.arange(rows) % len(pattern)]
+    round_trip = np.arange(rows) // len(pattern)
+    exchange = np.where(round_trip % 2 == 0, 'Coinbase', 'FalconX').astype(object)
+    position_exchange = np.where((status == 'Buy') | (status == 'Hold'), exchange, 'None').astype(object)
+    exchange[(status == 'No Action') | (status == 'Hold')] = 'None'
+    profit = np.where(status == 'Sell', np.random.default_rng(seed + 1).normal(20, 100, rows), 0.0)
+    for col_name in HISTORY_COLUMNS:
+        df[col_name] = 0.0
+    df['indicator'] = df['c']
+    df['trade_status'] = status
+    df['exchange_selected'] = exchange
+    df['position_exchange'] = position_exchange
+    df['position_btc'] = np.where(position_exchange != 'None', 10000.0 / df['c'].to_numpy(), 0.0)
+    df['fill_usd'] = np.nan    # profits come from the balances
+    df['capital_risked'] = np.where(status == 'Buy', 10000.0, 0.0)
+    df['running_capital_risked'] = np.cumsum(df['capital_risked'].to_numpy())
+    df['coinbase_usd'] = 100000 + np.cumsum(np.where(exchange == 'Coinbase', profit, 0.0))
+    df['falconx_usd'] = 100000 + np.cumsum(np.where(exchange == 'FalconX', profit, 0.0))
+    df['nofee_win_loss'] = None
+    df['fee_win_loss'] = None
+    for col_name in TRACE_COLUMNS:    # no trades were traced
+        df[col_name] = None if col_name == 'trace_id' else np.nan
+    return df
+
+
+# MEASUREMENT
+def measure(func, repeat):
+    """ Runs func repeat times for the wall times, then once more under tracemalloc for the
+    memory. Returns dict of seconds (best), median_seconds, peak_bytes (traced peak above
+    the starting point), retained_bytes and retained_blocks (allocations still alive after
+    the call, e.g. caches or leaks). """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        with contextlib.redirect_stdout(io.StringIO()):    # the bot prints as it goes
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        peak_bytes = tracemalloc.get_traced_memory()[1] - start_bytes
+        del result
+        gc.collect()
+        retained = tracemalloc.take_snapshot().compare_to(before, 'filename')
+    finally:
+        tracemalloc.stop()
+    return {
+        'seconds': min(timings),
+        'median_seconds': statistics.median(timings),
+        'peak_bytes': peak_bytes,
+        'retained_bytes': sum(stat.size_diff for stat in retained),
+        'retained_blocks': sum(stat.count_diff for stat in retained),
+        'repeat': repeat,
+    }
+
+
+def repeat_for(rows, repeat):
+    return repeat if rows <= REPEAT_MAX_ROWS else 1
+
+
+# CASES
+def indicator_cases(df):
+    """ (name, callable) for every function in utils/indicators.py. """
+    return [
+        ('bollinger_band', lambda: indicators.bollinger_band(df, 'c', ROLLING_WINDOW, 2)),
+        ('roc', lambda: indicators.roc(df, 'c', ROLLING_WINDOW)),
+        ('sma', lambda: indicators.sma(df, 'c', ROLLING_WINDOW)),
+        ('zlema', lambda: indicators.zlema(df, 'c', ROLLING_WINDOW)),
+        ('momentum', lambda: indicators.momentum(df, 'c', ROLLING_WINDOW)),
+        ('cci', lambda: indicators.cci(df, 'h', 'l', 'c', ROLLING_WINDOW)),
+        ('rolling_mean_deviation', lambda: indicators.rolling_mean_deviation(df['c'].to_numpy(), df['c'].rolling(ROLLING_WINDOW).mean().to_numpy(), ROLLING_WINDOW)),
+        ('rsi', lambda: indicators.rsi(df, 'c', ROLLING_WINDOW)),
+        ('money_flow_index', lambda: indicators.money_flow_index(df, 'c', 'h', 'l', 'v', ROLLING_WINDOW)),
+        ('chande_momentum_oscillator', lambda: indicators.chande_momentum_oscillator(df, 'c', ROLLING_WINDOW)),
+        ('annualized_historical_volatility', lambda: indicators.annualized_historical_volatility(df, 'c', ROLLING_WINDOW)),
+        ('garman_klass_volatility', lambda: indicators.garman_klass_volatility(df, 'o', 'h', 'l', 'c', ROLLING_WINDOW)),
+        ('vwap', lambda: indicators.vwap(df, 'c', 'h', 'l', 'v', ROLLING_WINDOW)),
+    ]
+
+
+def strategy_cases(bot, history_df):
+    """ (name, callable) for the strategy and evaluation paths, on a data frame and on a BotLog. """
+    from utils.bot_log import BotLog
+    price_df = price_frame(1, seed=len(history_df))
+    log = BotLog.from_frame(history_df)
+
+    def apply_and_evaluate_log():    # what one run() cycle does to its BotLog (the row is taken back off after)
+        bot.apply_strategy(log, price_df)
+        bot.evaluate_performance(log, new_rows=1)
+        log.rows = log.rows - 1
+
+    return [
+        ('apply_strategy', lambda: bot.apply_strategy(history_df, price_df)),
+        ('evaluate_performance', lambda: bot.evaluate_performance(history_df)),
+        ('evaluate_performance_incremental', lambda: bot.evaluate_performance(history_df.copy(), new_rows=1)),
+        ('apply_and_evaluate_botlog', apply_and_evaluate_log),
+    ]
+
+
+class CycleBench:
+    """ run.run() against the local exchange simulator, with the history store in a temporary
+    directory. cycle() is one run: read the history tail, apply the strategy, execute the trades,
+    evaluate and append the new row to the store. """
+
+    def __init__(self, history_rows=CYCLE_HISTORY_ROWS):
+        from bot import Bot
+        from exchanges.simulator import ExchangeSimulator, SimulatedMarket, point_exchanges_at
+        from utils.history_store import HistoryStore
+        self.market = SimulatedMarket(prices={'BTC': 40000.0}, volatility=1.0, time_scale=3600 * 24 * 30, seed=1)
+        self.simulator = ExchangeSimulator(market=self.market, seed=1).start()
+        point_exchanges_at(self.simulator)
+        self.coinbase_connection, self.falconx_connection = self.simulator.connections()
+        self.directory = tempfile.mkdtemp(prefix='bot_bench_')
+        self.bot = Bot(dict(config_params, history_store_dir=self.directory, coinbase_usd_account_id='usd', coinbase_btc_account_id='btc', threshold=40000, bet=10000))
+        self.store = HistoryStore(self.directory)
+        history_df = history_frame(history_rows)
+        history_df['coinbase_usd'] = history_df['falconx_usd'] = 100000.0    # matches the simulated accounts
+        history_df['trade_status'] = 'No Action'
+        history_df['exchange_selected'] = 'None'
+        history_df['position_exchange'] = 'None'
+        self.store.append(history_df)
+        self.rows = history_rows
+
+    def cycle(self):
+        import run
+        price = self.market.price('BTC')
+        self.rows = self.rows + 1
+        price_df = pd.DataFrame([{'time': self.rows, 'l': price, 'h': price, 'o': price, 'c': price, 'v': 1.0}])
+        return run.run(self.bot, price_df=price_df, connections=(self.coinbase_connection, self.falconx_connection))
+
+    def close(self):
+        self.coinbase_connection.close()
+        self.falconx_connection.close()
+        self.simulator.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+# SUITE
+def run_suite(groups, sizes, history_sizes, cycles, repeat, name_filter=None):
+    """ Runs the selected groups. Returns dict of case key (group/name/rows) -> measurement. """
+    results = {}
+
+    def run_case(group, name, rows, func, case_repeat):
+        key = group + '/' + name + '/' + str(rows)
+        if name_filter and name_filter not in key:
+            return
+        results[key] = measure(func, case_repeat)
+        print_result(key, results[key])
+
+    if 'indicators' in groups:
+        for rows in sizes:
+            df = price_frame(rows)
+            for name, func in indicator_cases(df):
+                run_case('indicators', name, rows, func, repeat_for(rows, repeat))
+            del df
+
+    if 'strategy' in groups:
+        from bot import Bot
+        bot = Bot(config_params)
+        for rows in history_sizes:
+            history_df = history_frame(rows)
+            for name, func in strategy_cases(bot, history_df):
+                run_case('strategy', name, rows, func, repeat_for(rows, repeat))
+            del history_df
+
+    if 'cycle' in groups:
+        bench = CycleBench(CYCLE_HISTORY_ROWS)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                bench.cycle()    # warm up (connections, imports)
+            run_case('cycle', 'run_cycle', CYCLE_HISTORY_ROWS, bench.cycle, cycles)
+        finally:
+            bench.close()
+    return results
+
+
+def print_result(key, result):
+    print(key.ljust(58) + (str(round(result['seconds'] * 1000, 3)) + ' ms').rjust(14) + (str(round(result['peak_bytes'] / 1e6, 2)) + ' MB').rjust(12) + str(result['retained_blocks']).rjust(9))
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """ Descriptions of the cases slower or using more peak memory than the baseline beyond the tolerance. Returns list. """
+    regressions = []
+    for key, result in results.items():
+        previous = baseline['results'].get(key)
+        if previous is None:
+            continue
+        for metric, floor, unit, scale in (('seconds', TIME_FLOOR, ' ms', 1000), ('peak_bytes', MEMORY_FLOOR, ' MB', 1e-6)):
+            current, before = result[metric], previous[metric]
+            if current > before * (1 + tolerance) and current - before > floor:
+                regressions.append(key + ' ' + metric + ': ' + str(round(current * scale, 3)) + unit + ' vs ' + str(round(before * scale, 3)) + unit + ' baseline (+' + str(round((current / before - 1) * 100)) + '%)')
+    return regressions
+
+
+# ENTRY POINT
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the indicators, the strategy and a full run() cycle against a baseline.')
+    parser.add_argument('--groups', nargs='+', choices=GROUPS, default=GROUPS)
+    parser.add_argument('--sizes', nargs='+', type=int, default=INDICATOR_SIZES, help='indicator input rows')
+    parser.add_argument('--history-sizes', nargs='+', type=int, default=HISTORY_SIZES, help='history rows for the strategy group')
+    parser.add_argument('--cycles', type=int, default=CYCLES, help='run() cycles timed in the cycle group')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='timed runs per case')
+    parser.add_argument('--filter', help='only run cases whose key (group/name/rows) contains this')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline json to compare against')
+    parser.add_argument('--record', action='store_true', help='record the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=config_params.get('benchmark_tolerance', DEFAULT_TOLERANCE), help='fraction slower / bigger than the baseline that is flagged')
+    parser.add_argument('--output', help='also write the results to this json file')
+    args = parser.parse_args()
+
+    print('case'.ljust(58) + 'best'.rjust(14) + 'peak'.rjust(12) + 'blocks'.rjust(9))
+    results = run_suite(args.groups, args.sizes, args.history_sizes, args.cycles, args.repeat, args.filter)
+    report = {'environment': environment(), 'created_at': time.time(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    regressions = []
+    if args.record:
+        baseline = {'results': {}}
+        if os.path.exists(args.baseline):    # keep the cases this run did not cover
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update({'environment': report['environment'], 'created_at': report['created_at']})
+        baseline['results'].update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        print('Baseline recorded to ' + args.baseline)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('environment') != report['environment']:
+            print('Note: the baseline was recorded in a different environment ' + str(baseline.get('environment')))
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print('REGRESSION: ' + regression)
+        if not regressions:
+            print('No regressions against ' + args.baseline + ' (tolerance ' + str(round(args.tolerance * 100)) + '%)')
+    else:
+        print('No baseline at ' + args.baseline + ' (record one with --record).')
+    sys.exit(1 if regressions else 0)
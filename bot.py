@@ -9,38 +9,50 @@
 # purchase the user-defined crypto when it reaches the user-defined price
 # threshold.
 ###############################################################################
+from __future__ import annotations
 import os
 import time
 import datetime
-import pytz
-import requests
-import pandas as pd
-import numpy as np
 
-from exchanges.coinbase import get_all_coinbase_accounts, get_coinbase_btc_price_quote_coinbase, get_single_coinbase_account, get_single_coinbase_account_ledger, get_coinbase_fees_quote, get_coinbase_trade_fees
-from exchanges.falconx import get_falconx_btc_price_quote, get_all_falconx_accounts, get_single_falconx_account_balance, get_falconx_token_pairs, place_falconx_market_order
 from abc import ABC, abstractmethod
 from base import BotInterface
+from exchanges.balances import balance_cache
+from utils.bot_log import BotLog
+from utils.lazy import lazy_import
+from utils.metrics import metrics
+from utils import tracing
 from config import config_params
 
+pd = lazy_import('pandas')    # heavy modules load on first use, in the run stage that needs them
+np = lazy_import('numpy')
+coinbase = lazy_import('exchanges.coinbase')
+falconx = lazy_import('exchanges.falconx')
+market_data = lazy_import('exchanges.snapshot')
+
 
 class Bot(BotInterface):
 
     def __init__(self, dictionary):
         for k, v in dictionary.items():
             setattr(self, k, v)
+        self.base_token = self.coinbase_product_id.split('-')[0]    # e.g. BTC for BTC-USD
 
-    def apply_strategy(self, historical_df, price_df) -> pd.DataFrame:
-        """ Apply the strategy logic. Returns df. """
-        df = historical_df.copy()
+    def apply_strategy(self, historical_df, price_df, indicator=None, price_observed_at=None) -> pd.DataFrame:
+        """ Apply the strategy logic. Returns df (the same BotLog, if given one). The indicator
+        defaults to the last close in the history; the event driven mode passes the price that
+        fired its trigger instead. Starts the cycle's tick to trade trace (utils/tracing.py) from
+        price_observed_at (epoch seconds the price arrived, default now) and the last price row's own time. """
+        trace = tracing.start_trace(price_observed_at, price_published_at=tracing.price_time(price_df))
+        log = historical_df if isinstance(historical_df, BotLog) else BotLog.from_frame(historical_df)
 
         # Get previous trade and current trigger info
-        trade_status = df['trade_status'].iloc[-1]    # get current trade status
-        indicator = df['c'].iloc[-1]    # get current trade status FIXME
+        trade_status = log.last('trade_status')    # get current trade status
+        if indicator is None:
+            indicator = log.last('c')    # get current trade status FIXME
         action = ''
 
         # Evaluate trade case
-        if indicator < config_params['threshold']:    # in trade zone when below threshold
+        if indicator < self.threshold:    # in trade zone when below threshold
             if trade_status == 'No Action':
                 action = 'Buy'
             elif trade_status == 'Buy':
@@ -58,65 +70,81 @@ class Bot(BotInterface):
                 action = 'No Action'
             elif trade_status == 'Hold':
                 action = 'Sell'
+        trace.mark('decision_made')
         
-        # Append row to bot history
-        new_entry = price_df.iloc[-1].to_list()
-        new_entry.append(indicator)
-        new_entry.append(action)
-        new_entry.append(0.0)    # coinbase price placeholder
-        new_entry.append(0.0)    # falconx price placeholder
-        new_entry.append('TBD')    # exchange decision placeholder
-        new_entry.append(0.0)    # capital_risked placeholder
-        new_entry.append(0.0)    # running_capital_risked placeholder
-        new_entry.append(0.0)    # coinbase usd
-        new_entry.append(0.0)    # coinbase btc
-        new_entry.append(0.0)    # coinbase usd fees
-        new_entry.append(0.0)    # falconx usd
-        new_entry.append(0.0)    # falconx btc
-        new_entry.append(0.0)    # falconx usd fees
-        new_entry.append(0.0)    # trade net profit
-        new_entry.append(0.0)    # running net profits
-        new_entry.append(0.0)    # trade raroi
-        new_entry.append(0.0)    # running raroi
-        new_entry.append(0.0)    # raw win loss
-        new_entry.append(0.0)    # pure win loss
-        df.loc[len(df)] = new_entry
-        return df
+        # Append row to bot history (one commit, placeholders are filled in by execute_trades and evaluate_performance)
+        new_entry = price_df.iloc[-1].to_dict()
+        new_entry.update({
+            'indicator': indicator,
+            'trade_status': action,
+            'coinbase_price': 0.0,    # coinbase price placeholder
+            'falconx_price': 0.0,    # falconx price placeholder
+            'exchange_selected': None,    # exchange decision placeholder
+            'capital_risked': 0.0,    # capital_risked placeholder
+            'running_capital_risked': 0.0,    # running_capital_risked placeholder
+            'coinbase_usd': 0.0,    # coinbase usd
+            'coinbase_btc': 0.0,    # coinbase btc
+            'coinbase_usd_fees': 0.0,    # coinbase usd fees
+            'falconx_usd': 0.0,    # falconx usd
+            'falconx_btc': 0.0,    # falconx btc
+            'falconx_usd_fees': 0.0,    # falconx usd fees
+            'net_profit': 0.0,    # trade net profit
+            'running_net_profit': 0.0,    # running net profits
+            'raroi': 0.0,    # trade raroi
+            'running_raroi': 0.0,    # running raroi
+            'nofee_win_loss': None,    # raw win loss
+            'fee_win_loss': None,    # pure win loss
+            'position_exchange': None,    # open position venue placeholder
+            'position_btc': 0.0,    # open position size placeholder
+            'fill_usd': np.nan,    # own fill placeholder
+        })
+        new_entry.update(trace.breakdown())    # trace id and stamps so far, execute_trades adds the rest
+        log.append(new_entry)
+        return log if isinstance(historical_df, BotLog) else log.to_frame()
 
-    def execute_trades(self, strategy_result_df, coinbase_connection, falconx_connection, bot):
-        """ Execute trades based on the result of applying strategy logic. Returns df. """
+    def execute_trades(self, strategy_result_df, coinbase_connection, falconx_connection, bot, snapshot=None):
+        """ Execute trades based on the result of applying strategy logic. Returns df (the same BotLog, if given one).
+        Quotes and balances come from "snapshot" when given (e.g. this bot's view of a snapshot
+        shared by several bots), otherwise they are fetched. """
 
         # Get trade action that needs to be taken
-        df = strategy_result_df.copy()
-        trade_status = df['trade_status'].iloc[-1]    
-
-        # Get price quotes
-        coinbase_btc_quote = get_coinbase_btc_price_quote_coinbase(coinbase_connection)    # Coinbase (no fees)
-        print('Coinbase base quote: ' + str(round(coinbase_btc_quote, 2)) + ' USD')
-        coinbase_btc_quote_with_buy_fee = coinbase_btc_quote + config_params['coinbase_fee_estimate'] * coinbase_btc_quote
-        coinbase_btc_quote_with_sell_fee = coinbase_btc_quote - config_params['coinbase_fee_estimate'] * coinbase_btc_quote
-        print('Coinbase buy quote after adding ' + str(config_params['coinbase_fee_estimate'] * 100) + '% fee estimate: ' + str(round(coinbase_btc_quote_with_buy_fee, 2)) + ' USD')    # Coinbase (with fees)
-        print('Coinbase sell quote after subtracting ' + str(config_params['coinbase_fee_estimate'] * 100) + '% fee estimate: ' + str(round(coinbase_btc_quote_with_sell_fee, 2)) + ' USD')    # Coinbase (with fees)
-        falconx_quote = get_falconx_btc_price_quote(falconx_connection)    # FalconX
-        falconx_btc_quote = falconx_quote[0]
-        falconx_quote_id = falconx_quote[1]
-        print('FalconX quote (includes basis point fee): ' + str(falconx_btc_quote) + ' USD')
+        log = strategy_result_df if isinstance(strategy_result_df, BotLog) else BotLog.from_frame(strategy_result_df)
+        trade_status = log.last('trade_status')
+
+        # Get price quotes and balances from both exchanges at once (an exchange that misses its deadline comes back empty)
+        if snapshot is None:
+            snapshot = market_data.fetch_market_snapshot(coinbase_connection, falconx_connection, self.coinbase_usd_account_id, self.coinbase_btc_account_id, token=self.base_token)
+        coinbase_btc_quote = snapshot.coinbase_price    # Coinbase (no fees)
+        if coinbase_btc_quote is not None:
+            print('Coinbase base quote: ' + str(round(coinbase_btc_quote, 2)) + ' USD')
+            coinbase_btc_quote_with_buy_fee = coinbase_btc_quote + self.coinbase_fee_estimate * coinbase_btc_quote
+            coinbase_btc_quote_with_sell_fee = coinbase_btc_quote - self.coinbase_fee_estimate * coinbase_btc_quote
+            print('Coinbase buy quote after adding ' + str(self.coinbase_fee_estimate * 100) + '% fee estimate: ' + str(round(coinbase_btc_quote_with_buy_fee, 2)) + ' USD')    # Coinbase (with fees)
+            print('Coinbase sell quote after subtracting ' + str(self.coinbase_fee_estimate * 100) + '% fee estimate: ' + str(round(coinbase_btc_quote_with_sell_fee, 2)) + ' USD')    # Coinbase (with fees)
+        falconx_btc_quote = snapshot.falconx_price    # FalconX
+        falconx_quote = snapshot.get('falconx_quote')    # reused to size a FalconX buy while it is valid
+        if falconx_btc_quote is not None:
+            print('FalconX quote (includes basis point fee): ' + str(falconx_btc_quote) + ' USD')
 
         # Select best exchange for the desired trade action (i.e. buy low, sell high)
         if trade_status == 'Buy':    # buy low
             capital_risked = self.bet    # amount we are buying
-            if coinbase_btc_quote_with_buy_fee < falconx_btc_quote:
+            if coinbase_btc_quote is None and falconx_btc_quote is None:    # nothing to compare, try again next run
+                trade_status = 'No Action'
+                capital_risked = 0
+                exchange_selected = 'None'
+                print('No exchange quoted in time, the buy is skipped this run.')
+            elif falconx_btc_quote is None or (coinbase_btc_quote is not None and coinbase_btc_quote_with_buy_fee < falconx_btc_quote):
                 exchange_selected = 'Coinbase'
             else:
                 exchange_selected = 'FalconX'
             print('The buy should be executed on: ' + exchange_selected)
         elif trade_status == 'Sell':    # sell high
             capital_risked = 0
-            exchange_selected = df['exchange_selected'].iloc[-1]
-            counter = 1
-            while (exchange_selected == None) or (exchange_selected == 'None'):
-                counter = counter + 1
-                exchange_selected = df['exchange_selected'].iloc[-counter]
+            exchange_selected = self.position_exchange(log)
+            if exchange_selected is None:    # history too short to show where the position was bought, sell where the token is
+                exchange_selected = 'Coinbase' if float(snapshot.get('coinbase_btc', 0.0)) >= float(snapshot.get('falconx_btc', 0.0)) else 'FalconX'
+                print('The exchange of the open position is not in the loaded history, using the one holding the most ' + self.base_token + '.')
             print('The sell should be executed on: ' + exchange_selected)
         elif trade_status == 'Hold': 
             capital_risked = 0
@@ -128,57 +156,170 @@ class Bot(BotInterface):
             print('No trade action should be taken, no position is currently open.')
             
         # Execute the trade on the desired exchange
+        trace = tracing.current_trace()
+        if trace is not None and exchange_selected in ('Coinbase', 'FalconX'):
+            quote_field = 'coinbase_price' if exchange_selected == 'Coinbase' else 'falconx_quote'
+            if snapshot.received_at(quote_field) is not None:
+                trace.mark('quote_received', snapshot.received_at(quote_field))    # the quote the exchange was selected on
+        previous_position_btc = log.last('position_btc', 2) if len(log) > 1 else np.nan
+        own_position_btc = previous_position_btc if self.own_fills and pd.notna(previous_position_btc) and previous_position_btc > 0 else None    # sell only what this bot bought
+        fill = None
         if exchange_selected == 'Coinbase' and trade_status == 'Buy':
-            response = place_coinbase_market_order(coinbase_connection, self.bet, self.coinbase_product_id, 'buy', self.coinbase_usd_account_id, self.coinbase_btc_account_id)    # execute trade
-            coinbase_usd_fees = get_coinbase_trade_fees(auth, self.coinbase_usd_account_id)    # calc usd fees
+            response = coinbase.place_coinbase_market_order(coinbase_connection, self.bet, self.coinbase_product_id, 'buy', self.coinbase_usd_account_id, self.coinbase_btc_account_id)    # execute trade
+            coinbase_usd_fees = coinbase.get_coinbase_trade_fees(coinbase_connection, self.coinbase_usd_account_id)    # calc usd fees
             falconx_usd_fees = 0
+            fill = coinbase.coinbase_fill(response)
         elif exchange_selected == 'Coinbase' and trade_status == 'Sell':
-            response = place_coinbase_market_order(coinbase_connection, self.bet, self.coinbase_product_id, 'sell', self.coinbase_usd_account_id, self.coinbase_btc_account_id)    # execute trade
-            coinbase_usd_fees = get_coinbase_trade_fees(auth, self.coinbase_usd_account_id)    # calc usd fees
+            response = coinbase.place_coinbase_market_order(coinbase_connection, self.bet, self.coinbase_product_id, 'sell', self.coinbase_usd_account_id, self.coinbase_btc_account_id, size=own_position_btc)    # execute trade
+            coinbase_usd_fees = coinbase.get_coinbase_trade_fees(coinbase_connection, self.coinbase_usd_account_id)    # calc usd fees
             falconx_usd_fees = 0
+            fill = coinbase.coinbase_fill(response)
         elif exchange_selected == 'FalconX' and trade_status == 'Buy':
-            response = place_falconx_market_order(falconx_connection, self.bet, ['BTC', 'USD'], 'buy')    
+            response = falconx.place_falconx_market_order(falconx_connection, self.bet, [self.base_token, 'USD'], 'buy', quote=falconx_quote)    
             falconx_usd_fees = response['fee_usd']
             coinbase_usd_fees = 0
+            fill = falconx.falconx_fill(response)
         elif exchange_selected == 'FalconX' and trade_status == 'Sell':
-            response = place_falconx_market_order(falconx_connection, self.bet, ['BTC', 'USD'], 'sell')   
+            response = falconx.place_falconx_market_order(falconx_connection, self.bet, [self.base_token, 'USD'], 'sell', sell_all=not self.own_fills, quantity=own_position_btc)    # shared accounts: never the whole balance
             falconx_usd_fees = response['fee_usd']
             coinbase_usd_fees = 0
+            fill = falconx.falconx_fill(response)
         else:    # HOLD and NO ACTION cases
             coinbase_usd_fees = 0
             falconx_usd_fees = 0
+
+        # Balances after the trade (the snapshot's are still current when no order was placed)
+        order_placed = trade_status in ('Buy', 'Sell') and exchange_selected in ('Coinbase', 'FalconX')
+        if order_placed:
+            balance_cache.invalidate(exchange_selected)
+        balances = market_data.fetch_market_snapshot(coinbase_connection, falconx_connection, self.coinbase_usd_account_id, self.coinbase_btc_account_id, quotes=False, token=self.base_token) if order_placed else snapshot
        
-        # Log the trade action details
-        df.at[len(df) - 1, 'coinbase_price'] = coinbase_btc_quote
-        df.at[len(df) - 1, 'falconx_price'] = falconx_btc_quote
-        df.at[len(df) -1 , 'exchange_selected'] = exchange_selected   
-        df.at[len(df) -1 , 'capital_risked'] = capital_risked  
-        df['running_capital_risked'] = df['capital_risked'].cumsum()
-        df.at[len(df) -1 , 'coinbase_usd'] = get_single_coinbase_account(coinbase_connection, self.coinbase_usd_account_id)
-        df.at[len(df) -1 , 'coinbase_btc'] = get_single_coinbase_account(coinbase_connection, self.coinbase_btc_account_id) 
-        df.at[len(df) -1 , 'coinbase_usd_fees'] = coinbase_usd_fees
-        df.at[len(df) -1 , 'falconx_usd'] = get_single_falconx_account_balance(falconx_connection, 'USD')
-        df.at[len(df) -1 , 'falconx_btc'] = get_single_falconx_account_balance(falconx_connection, 'BTC')   
-        df.at[len(df) -1 , 'falconx_usd_fees'] = falconx_usd_fees
-        df.at[len(df) -1 , 'nofee_win_loss'] =  None    # this value will be changed as applicable during the evaluate_performance phase
-        df.at[len(df) -1 , 'fee_win_loss'] = None    # this value will be changed as applicable during the evaluate_performance phase
+        # Open position after the trade (a buy opens one, a hold carries it forward, anything else leaves none)
+        if order_placed and trade_status == 'Buy':
+            position_exchange = exchange_selected
+            position_btc = np.nan if fill is None else fill[0]
+        elif trade_status == 'Hold':
+            position_exchange = self.position_exchange(log) or 'None'
+            position_btc = previous_position_btc
+        else:
+            position_exchange = 'None'
+            position_btc = 0.0
 
-        return df
+        # Log the trade action details (one write to the row added by apply_strategy)
+        previous_running_capital_risked = log.last('running_capital_risked', 2) if len(log) > 1 else 0.0
+        log.update_last({
+            'trade_status': trade_status,
+            'coinbase_price': np.nan if coinbase_btc_quote is None else coinbase_btc_quote,
+            'falconx_price': np.nan if falconx_btc_quote is None else falconx_btc_quote,
+            'exchange_selected': exchange_selected,
+            'capital_risked': capital_risked,
+            'running_capital_risked': (previous_running_capital_risked if pd.notna(previous_running_capital_risked) else 0.0) + capital_risked,
+            'coinbase_usd': balances.get('coinbase_usd', np.nan),
+            'coinbase_btc': balances.get('coinbase_btc', np.nan),
+            'coinbase_usd_fees': coinbase_usd_fees,
+            'falconx_usd': balances.get('falconx_usd', np.nan),
+            'falconx_btc': balances.get('falconx_btc', np.nan),
+            'falconx_usd_fees': falconx_usd_fees,
+            'nofee_win_loss': None,    # this value will be changed as applicable during the evaluate_performance phase
+            'fee_win_loss': None,    # this value will be changed as applicable during the evaluate_performance phase
+            'position_exchange': position_exchange,
+            'position_btc': position_btc,
+            'fill_usd': np.nan if fill is None else fill[1],
+        })
+        if trace is not None:
+            breakdown = trace.breakdown()
+            log.update_last(breakdown)
+            if pd.notna(breakdown['tick_to_trade_ms']):
+                metrics.observe('bot_price_age_seconds', breakdown['price_age_ms'] / 1000, bot=self.name, exchange=exchange_selected)
+                metrics.observe('bot_tick_to_trade_seconds', breakdown['tick_to_trade_ms'] / 1000, bot=self.name, exchange=exchange_selected)
+
+        return log if isinstance(strategy_result_df, BotLog) else log.to_frame()
+
+    def position_exchange(self, log):
+        """ Exchange the position open before the last row was bought on: the previous row's
+        position_exchange, or for history logged before that column, the last exchange a trade
+        was made on. Returns 'Coinbase', 'FalconX' or None if the loaded history does not say. """
+        exchange = log.last('position_exchange', 2) if len(log) > 1 else None
+        counter = 1
+        while exchange not in ('Coinbase', 'FalconX') and counter < len(log):
+            counter = counter + 1
+            exchange = log.last('exchange_selected', counter)
+        return exchange if exchange in ('Coinbase', 'FalconX') else None
 
-    def evaluate_performance(self, input_df: pd.DataFrame) -> pd.DataFrame:
-        """ Evaluate how the strategy is performing. Returns df. """
+    def execute_synthetic_orders(self, orders, coinbase_connection, falconx_connection, price_observed_at=None, price_published_at=None):
+        """ Places market orders for the synthetic limit orders the order book triggered (see
+        utils/order_book.py), all priced off one market snapshot. An order on the 'best' venue
+        goes to the cheaper exchange for a buy and the dearer one for a sell. Returns list of
+        fill dicts (status 'Filled', 'Skipped' when no usable exchange quoted in time or 'Failed'
+        when its order raised, with the error), each with the order's tick to trade trace from
+        price_observed_at and the tick's own time price_published_at (see utils/tracing.py). """
+        price_observed_at = time.time() if price_observed_at is None else price_observed_at
+        snapshot = market_data.fetch_market_snapshot(coinbase_connection, falconx_connection, self.coinbase_usd_account_id, self.coinbase_btc_account_id, token=self.base_token)
+        coinbase_btc_quote = snapshot.coinbase_price
+        falconx_btc_quote = snapshot.falconx_price
+        fills = []
+        for order in orders:
+            trace = tracing.start_trace(price_observed_at, price_published_at=price_published_at)
+            trace.mark('decision_made')
+            exchange_selected = order.venue
+            if exchange_selected == 'best':
+                quotes = {}
+                if coinbase_btc_quote is not None:
+                    fee = self.coinbase_fee_estimate * coinbase_btc_quote
+                    quotes['Coinbase'] = coinbase_btc_quote + fee if order.side == 'buy' else coinbase_btc_quote - fee
+                if falconx_btc_quote is not None:
+                    quotes['FalconX'] = falconx_btc_quote
+                exchange_selected = None
+                if quotes:
+                    exchange_selected = min(quotes, key=quotes.get) if order.side == 'buy' else max(quotes, key=quotes.get)
+            if exchange_selected is None or not snapshot.available(exchange_selected, ['coinbase_price', 'falconx_quote']):
+                print('No quote in time for synthetic order ' + order.order_id + ', skipped.')
+                fills.append({'order_id': order.order_id, 'status': 'Skipped', 'exchange_selected': None, 'response': None, 'trace': trace.breakdown()})
+                continue
+
+            trace.mark('quote_received', snapshot.received_at('coinbase_price' if exchange_selected == 'Coinbase' else 'falconx_quote'))
+            print('Synthetic order ' + order.order_id + ' (' + order.side + ' ' + str(order.size) + ' USD, trigger ' + str(order.trigger_price) + ') executed on: ' + exchange_selected)
+            try:
+                if exchange_selected == 'Coinbase':
+                    response = coinbase.place_coinbase_market_order(coinbase_connection, order.size, self.coinbase_product_id, order.side, self.coinbase_usd_account_id, self.coinbase_btc_account_id)
+                else:
+                    response = falconx.place_falconx_market_order(falconx_connection, order.size, [self.base_token, 'USD'], order.side, quote=snapshot.get('falconx_quote'), sell_all=False)
+            except Exception as e:    # e.g. a timeout or a refused connection, the other orders still go out
+                print('Synthetic order ' + order.order_id + ' failed: ' + repr(e))
+                balance_cache.invalidate(exchange_selected)
+                fills.append({'order_id': order.order_id, 'status': 'Failed', 'exchange_selected': exchange_selected, 'response': None, 'error': e, 'trace': trace.breakdown()})
+                continue
+            balance_cache.invalidate(exchange_selected)
+            fills.append({'order_id': order.order_id, 'status': 'Filled', 'exchange_selected': exchange_selected, 'response': response, 'trace': trace.breakdown()})
+        return fills
+
+    def evaluate_performance(self, input_df: pd.DataFrame, new_rows=None, check=False) -> pd.DataFrame:
+        """ Evaluate how the strategy is performing. Returns df.
+
+        By default every row is recomputed. With new_rows, only the last new_rows rows (the
+        ones appended this run) are evaluated, carrying the running totals forward from the
+        row before them, and input_df is updated in place instead of copied. With check, the
+        incremental result is compared against a full recompute (ValueError on mismatch).
+        A BotLog is updated in place and returned. """
+        if isinstance(input_df, BotLog):
+            return self._evaluate_log(input_df, new_rows, check)
+        if new_rows is not None:
+            return self._evaluate_new_rows(input_df, new_rows, check)
         df = input_df.copy()
         exchange_selected = df['exchange_selected'].iloc[-1]    # if trade action was taken, what exchange was it done on?
 
-        # Calculate net profits at every "sell" instance by exchange
+        # Calculate net profits at every "sell" instance by exchange (the first row keeps its logged value, its previous balance is not in the frame)
         df['coinbase_usd_shifted'] = df['coinbase_usd'].shift(periods=1)
         df['falconx_usd_shifted'] = df['falconx_usd'].shift(periods=1)
-        df.loc[(df['trade_status'] == 'Sell') & (df['exchange_selected'] == 'Coinbase'), 'net_profit'] = pd.to_numeric(df['coinbase_usd']) - pd.to_numeric(df['coinbase_usd_shifted']) - self.bet    # account balance after sale - account balance before sale - original capital risked (fees are already accounted for in account balance)
-        df.loc[(df['trade_status'] == 'Sell') & (df['exchange_selected'] == 'FalconX'), 'net_profit'] = pd.to_numeric(df['falconx_usd']) - pd.to_numeric(df['falconx_usd_shifted']) - self.bet    # account balance after sale - account balance before sale - original capital risked (fees are already accounted for in account balance)
+        df.loc[(df['trade_status'] == 'Sell') & (df['exchange_selected'] == 'Coinbase') & df['coinbase_usd_shifted'].notna(), 'net_profit'] = pd.to_numeric(df['coinbase_usd']) - pd.to_numeric(df['coinbase_usd_shifted']) - self.bet    # account balance after sale - account balance before sale - original capital risked (fees are already accounted for in account balance)
+        df.loc[(df['trade_status'] == 'Sell') & (df['exchange_selected'] == 'FalconX') & df['falconx_usd_shifted'].notna(), 'net_profit'] = pd.to_numeric(df['falconx_usd']) - pd.to_numeric(df['falconx_usd_shifted']) - self.bet    # account balance after sale - account balance before sale - original capital risked (fees are already accounted for in account balance)
+        if 'fill_usd' in df.columns:    # sells with a logged fill of their own (accounts shared with other bots move for other reasons too)
+            own_fill = (df['trade_status'] == 'Sell') & pd.to_numeric(df['fill_usd']).notna()
+            df.loc[own_fill, 'net_profit'] = pd.to_numeric(df['fill_usd'])[own_fill] - self.bet    # sale proceeds net of fees - original capital risked
 
         # Calculate remaining metrics based on net profits (e.g. raroi, running totals)
         df.loc[df['trade_status'] == 'Sell', 'raroi'] = pd.to_numeric(df['net_profit']) / self.bet    # net returns / original capital risked
-        df['running_net_profit'] = df['net_profit'].cumsum()
+        df['running_net_profit'] = running_total(df, 'net_profit', 'running_net_profit')
         df['running_raroi'] = 0
         df['running_raroi'] = pd.to_numeric(df['running_net_profit']) / pd.to_numeric(df['running_capital_risked'])
 
@@ -196,16 +337,135 @@ class Bot(BotInterface):
         df = df.drop('coinbase_usd_shifted', axis=1)
         df = df.drop('falconx_usd_shifted', axis=1)
         return df
+
+    def _evaluate_log(self, log, new_rows, check):
+        """ evaluate_performance for a BotLog: evaluates a frame of the rows needed and writes the metrics back. """
+        first = 0 if new_rows is None else max(0, len(log) - new_rows)    # first row to evaluate
+        start = max(0, first - 1)    # plus the previous row, to carry totals from
+        df = self.evaluate_performance(log.to_frame(start), None if new_rows is None else len(log) - first)
+        log.update(first, {col_name: df[col_name].to_numpy()[first - start:] for col_name in PERFORMANCE_COLUMNS})
+        if check and new_rows is not None:
+            mismatched = performance_mismatches(log.to_frame(first), self.evaluate_performance(log.to_frame()).iloc[first:])
+            if mismatched:
+                raise ValueError('Incremental performance evaluation differs from the full recompute in: ' + ', '.join(mismatched))
+        return log
+
+    def _evaluate_new_rows(self, df, new_rows, check):
+        """ Incremental evaluate_performance: same rules as the full recompute, applied to the last new_rows rows only. """
+        start = len(df) - new_rows
+        if start < 1:    # no previous row to carry totals from
+            return self.evaluate_performance(df, check=False)
+        rows = df.iloc[start - 1:]    # previous row + new rows
+        status = rows['trade_status'].to_numpy()[1:]
+        exchange = rows['exchange_selected'].to_numpy()[1:]
+        sell = status == 'Sell'
+
+        # Net profits at every "sell" instance by exchange
+        net_profit = pd.to_numeric(rows['net_profit']).to_numpy(dtype=float)[1:].copy()
+        for exchange_name, balance_col in (('Coinbase', 'coinbase_usd'), ('FalconX', 'falconx_usd')):
+            balance = pd.to_numeric(rows[balance_col]).to_numpy(dtype=float)
+            sold = sell & (exchange == exchange_name) & ~np.isnan(balance[:-1])
+            net_profit[sold] = (balance[1:] - balance[:-1] - self.bet)[sold]    # account balance after sale - account balance before sale - original capital risked
+        if 'fill_usd' in rows.columns:    # sells with a logged fill of their own
+            fill_usd = pd.to_numeric(rows['fill_usd']).to_numpy(dtype=float)[1:]
+            own_fill = sell & ~np.isnan(fill_usd)
+            net_profit[own_fill] = fill_usd[own_fill] - self.bet    # sale proceeds net of fees - original capital risked
+
+        # Remaining metrics, running totals continue from the previous row
+        raroi = pd.to_numeric(rows['raroi']).to_numpy(dtype=float)[1:].copy()
+        raroi[sell] = net_profit[sell] / self.bet
+        previous_total = pd.to_numeric(rows['running_net_profit']).iloc[0]
+        running_net_profit = np.cumsum(np.nan_to_num(net_profit)) + (previous_total if pd.notna(previous_total) else 0.0)
+        running_net_profit[np.isnan(net_profit)] = np.nan    # same as pandas cumsum
+        with np.errstate(divide='ignore', invalid='ignore'):
+            running_raroi = running_net_profit / pd.to_numeric(rows['running_capital_risked']).to_numpy(dtype=float)[1:]
+
+        # Win / loss labels, without and with fees
+        gross_profit = net_profit + pd.to_numeric(rows['coinbase_usd_fees']).to_numpy(dtype=float)[1:] + pd.to_numeric(rows['falconx_usd_fees']).to_numpy(dtype=float)[1:]
+        nofee_win_loss = np.select([sell & (gross_profit > 0), sell & (gross_profit < 0)], ['Win', 'Loss'], None)
+        fee_win_loss = np.select([sell & (net_profit > 0), sell & (net_profit < 0)], ['Win', 'Loss'], None)
+
+        index = df.index[start:]
+        df.loc[index, 'net_profit'] = net_profit
+        df.loc[index, 'raroi'] = raroi
+        df.loc[index, 'running_net_profit'] = running_net_profit
+        df.loc[index, 'running_raroi'] = running_raroi
+        for col_name, labels in (('nofee_win_loss', nofee_win_loss), ('fee_win_loss', fee_win_loss)):
+            if df[col_name].dtype != object:    # e.g. all None so far, read back as float
+                df[col_name] = df[col_name].astype(object)
+            df.loc[index, col_name] = labels
+
+        if check:
+            mismatched = performance_mismatches(df.iloc[start:], self.evaluate_performance(df).iloc[start:])
+            if mismatched:
+                raise ValueError('Incremental performance evaluation differs from the full recompute in: ' + ', '.join(mismatched))
+        return df
     
 
-    def output_results(self, df, storage_client):
-        """ Output bot performance / status for dashboarding and record keeping. Returns df. """
-        bucket = storage_client.bucket(self.cloud_bucket_name)
-        blob = bucket.blob(self.cloud_bucket_path + self.output_filename)
+    def output_results(self, df, storage_client, history_store=None, new_rows=1):
+        """ Output bot performance / status for dashboarding and record keeping. Returns df.
+        With a history store, only the last new_rows rows (the ones added this run) are
+        appended and only the store files that changed are uploaded. """
+        if history_store is not None:
+            new_df = df.to_frame(len(df) - new_rows) if isinstance(df, BotLog) else df.tail(new_rows)
+            history_store.append(new_df)
+            print('Appended ' + str(new_rows) + ' row(s) to bot history store (' + str(len(history_store)) + ' rows): ')
+            for record in new_df.to_dict('records'):    # cheaper than a data frame repr fitted to the terminal
+                print(record)
+            if config_params['in_production']:
+                history_store.upload(storage_client.bucket(self.cloud_bucket_name), self.cloud_bucket_path)    # write changed store files to cloud storage
+            return df
+
+        if isinstance(df, BotLog):
+            df = df.to_frame()
         local_filepath = '/tmp/' + self.output_filename
         df.to_csv(local_filepath, index=False)
         print('Final data frame written to output log on cloud: ')
         print(df)
 
         if config_params['in_production']:
-            blob.upload_from_filename(local_filepath)    # write output file to cloud storage
\ No newline at end of file
+            blob = storage_client.bucket(self.cloud_bucket_name).blob(self.cloud_bucket_path + self.output_filename)
+            blob.upload_from_filename(local_filepath)    # write output file to cloud storage
+
+    def record_metrics(self, df):
+        """ Updates the bot's gauges (balances, history size, profit) and counters from the last row of a run (see utils/metrics.py). """
+        if isinstance(df, BotLog):
+            last, rows = {col_name: df.last(col_name) for col_name in ('trade_status', 'exchange_selected', 'coinbase_usd', 'coinbase_btc', 'falconx_usd', 'falconx_btc', 'running_net_profit')}, len(df)
+        else:
+            last, rows = df.iloc[-1].to_dict(), len(df)
+        metrics.inc('bot_runs_total', bot=self.name)
+        metrics.inc('bot_trades_total', bot=self.name, action=last['trade_status'], exchange=last['exchange_selected'])
+        metrics.set('bot_history_rows', rows, bot=self.name)
+        for exchange in ('coinbase', 'falconx'):
+            metrics.set('bot_balance_usd', last[exchange + '_usd'], bot=self.name, exchange=exchange)
+            metrics.set('bot_balance_btc', last[exchange + '_btc'], bot=self.name, exchange=exchange, token=self.base_token)
+        metrics.set('bot_running_net_profit', last['running_net_profit'], bot=self.name)
+        metrics.set('bot_last_run_timestamp', time.time(), bot=self.name)
+
+
+def running_total(df, value_col, running_col):
+    """ Running sum of value_col that continues from the running total stored on the first
+    row, so a data frame holding only the tail of the history gives the same totals as the
+    full history. Returns series. """
+    values = pd.to_numeric(df[value_col])
+    first_value = values.iloc[0] if pd.notna(values.iloc[0]) else 0.0
+    first_total = pd.to_numeric(df[running_col]).iloc[0]
+    offset = first_total - first_value if pd.notna(first_total) else 0.0    # total of the rows before this frame
+    return values.cumsum() + offset
+
+
+PERFORMANCE_COLUMNS = ['net_profit', 'raroi', 'running_net_profit', 'running_raroi', 'nofee_win_loss', 'fee_win_loss']    # columns written by evaluate_performance
+
+
+def performance_mismatches(df, expected_df):
+    """ Names of the evaluate_performance columns that differ between two bot logs (numbers
+    compared to float tolerance, NaN equal to NaN). Returns list. """
+    mismatched = []
+    for col_name in PERFORMANCE_COLUMNS:
+        if col_name.endswith('win_loss'):
+            same = [a == b or (pd.isna(a) and pd.isna(b)) for a, b in zip(df[col_name], expected_df[col_name])]
+            if not all(same):
+                mismatched.append(col_name)
+        elif not np.allclose(pd.to_numeric(df[col_name]).to_numpy(dtype=float), pd.to_numeric(expected_df[col_name]).to_numpy(dtype=float), equal_nan=True):
+            mismatched.append(col_name)
+    return mismatched
@@ -17,5 +17,39 @@ config_params = {
     'output_filename': '',     # FIXME: add your value here
     'bet': 10000,    # size of each bet in USD
     'threshold': 40000,    # price to take action at in usd
+    'coinbase_product_id': 'BTC-USD',    # pair traded (the base token is traded on FalconX against USD too)
+    'coinbase_usd_account_id': '',    # FIXME: add your value here
+    'coinbase_btc_account_id': '',    # FIXME: add your value here (account of the pair's base token)
+    'coinbase_fee_estimate': 0.005,    # fraction added to / taken off the Coinbase quote to compare it with the fee-inclusive FalconX quote
+    'history_store_dir': '/tmp/bot_history/',    # local copy of the append-only bot history store (see utils/history_store.py)
+    'history_tail_rows': 1000,    # rows of history loaded each run (the open position's exchange is carried on every row)
+    'synthetic_fill_store_dir': '/tmp/bot_synthetic_fills/',    # store the event driven mode writes each synthetic order fill and its trace to (see utils/tracing.py)
+    'check_incremental_performance': False,    # also run the full performance recompute each run and fail on any difference
+    'http_pool_size': 4,    # keep-alive connections per exchange (see exchanges/client.py)
+    'http_connect_timeout': 3.05,    # seconds
+    'http_read_timeout': 10,    # seconds
+    'http_retries': 2,    # retries for GET requests (orders and quotes are never retried)
+    'market_data_deadline': 5.0,    # seconds each quote / balance request gets before its exchange is treated as unavailable for the run
+    'balance_cache_ttl': 10.0,    # seconds account balances are reused before being fetched again (fills always refetch)
+    'credentials_backend': 'secret_manager',    # where exchange api secrets come from: 'secret_manager', 'env' or 'file' (see exchanges/credentials.py)
+    'gcp_project_id': '',    # FIXME: add your value here (secret manager backend)
+    'credentials_file': '',    # json file of {secret name: value} (file backend)
+    'credentials_ttl': None,    # seconds before a cached secret is refetched to pick up rotations (None = keep for the life of the process)
+    'trigger_hysteresis': 25.0,    # usd the price must move past the threshold before the event driven mode changes zone (see utils/trigger.py)
+    'trigger_debounce': 2.0,    # seconds a new zone must hold before the event driven mode acts on it
+    'trigger_retry_interval': 30.0,    # seconds before the event driven mode runs again when the last run's trade did not go through
+    'price_feed_url': 'wss://ws-feed.exchange.coinbase.com',    # streaming price feed for the event driven mode
+    'price_feed_product': 'BTC-USD',
+    'multi_bot_workers': 16,    # bots evaluated at the same time by multi_run.py (see multi_bot.py)
+    'multi_bot_configs': 'bots.json',    # json list of per-bot overrides of these parameters, one entry per bot
+    'coinbase_api_url': 'https://api.exchange.coinbase.com/',    # point both urls at exchanges/simulator.py for load tests
+    'falconx_api_url': 'https://api.falconx.io/v1/',
+    'exchange_simulator_urls': [],    # base urls of a simulator running in another process, orders to them are sent outside production too
+    'exchange_capture_file': '',    # record every exchange request / response to this file for replay.py (.gz to compress), '' for off
+    'benchmark_tolerance': 0.25,    # fraction slower / bigger than the baseline that benchmarks/suite.py flags as a regression
+    'metrics_port': 0,    # serve the Prometheus metrics (utils/metrics.py) on this local port, 0 for off
+    'metrics_host': '127.0.0.1',    # interface the metrics port listens on
+    'metrics_jsonl_file': '',    # append the run stage / exchange request spans and a metrics snapshot per run here, '' for off
+    'own_fills': False,    # size sells to the bot's own position and book profits from its own fills, not the account balances (always on in multi_bot.py, whose bots share accounts)
     # TODO: additional config parameters go here
 }
@@ -0,0 +1,66 @@
+###############################################################################
+# FILENAME: balances.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Short lived cache of account balances. One request per
+# exchange fetches every balance on the account (Coinbase accounts, FalconX
+# balances/total) into a dict, so looking up a single token or account is a
+# dict lookup until the entry expires or an order fill invalidates it.
+###############################################################################
+import time
+import threading
+
+from config import config_params
+
+
+# CONFIG
+DEFAULT_TTL = 10.0    # seconds a balance snapshot is reused within a run phase
+
+
+# CACHE
+class BalanceCache:
+    """ TTL cache of {token or account id: balance} per (exchange, connection). Safe to use
+    from the market data threads: concurrent lookups of a cold entry share one fetch. """
+
+    def __init__(self, ttl=None, clock=None):
+        self.ttl = ttl
+        self.clock = clock or time.monotonic    # replay.py runs it on the captured timeline
+        self.entries = {}    # (exchange, connection id) -> (fetched at, balances)
+        self.locks = {}    # (exchange, connection id) -> lock held while fetching
+        self.lock = threading.Lock()
+        self.fetches = 0
+        self.hits = 0
+
+    def get(self, exchange, connection, key, fetch):
+        """ Balance of "key" on the exchange, calling fetch() (returns the full balance dict)
+        only when there is no fresh snapshot. Returns None if the account has no such key. """
+        return self.balances(exchange, connection, fetch).get(key)
+
+    def balances(self, exchange, connection, fetch):
+        """ Full balance dict for the exchange, fetched at most once per ttl. """
+        entry_key = (exchange, id(connection))
+        with self.lock:
+            entry_lock = self.locks.setdefault(entry_key, threading.Lock())
+        with entry_lock:
+            entry = self.entries.get(entry_key)
+            if entry is not None and self.clock() - entry[0] < self._ttl():
+                self.hits = self.hits + 1
+                return entry[1]
+            balances = fetch()
+            self.fetches = self.fetches + 1
+            self.entries[entry_key] = (self.clock(), balances)
+            return balances
+
+    def invalidate(self, exchange=None, connection=None):
+        """ Drops cached balances (all of them, one exchange, or one exchange connection), e.g. after an order fills. """
+        with self.lock:
+            for entry_key in list(self.entries):
+                if (exchange is None or entry_key[0] == exchange) and (connection is None or entry_key[1] == id(connection)):
+                    del self.entries[entry_key]
+
+    def _ttl(self):
+        return config_params.get('balance_cache_ttl', DEFAULT_TTL) if self.ttl is None else self.ttl
+
+
+balance_cache = BalanceCache()    # shared by the exchange modules
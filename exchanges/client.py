@@ -0,0 +1,131 @@
+###############################################################################
+# FILENAME: client.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: HTTP client shared by the exchange modules. Each exchange gets
+# one pooled keep-alive session (so a run reuses its TCP + TLS connections
+# instead of opening one per call), default connect / read timeouts, retries
+# for idempotent requests and the exchange's signing auth attached once.
+# Every request is timed and counted in utils/metrics.py.
+###############################################################################
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.metrics import metrics
+from config import config_params
+
+
+# CONFIG
+DEFAULT_POOL_SIZE = 4    # connections kept alive per exchange host
+DEFAULT_CONNECT_TIMEOUT = 3.05    # seconds, slightly over a multiple of 3 (the tcp retransmission window)
+DEFAULT_READ_TIMEOUT = 10    # seconds
+DEFAULT_RETRIES = 2    # for GET requests only, orders and quotes are never retried
+
+
+# CLIENT
+class ExchangeClient:
+    """ Pooled session for one exchange API. Paths are relative to api_url. """
+
+    def __init__(self, api_url, auth=None, pool_size=None, connect_timeout=None, read_timeout=None, retries=None, name=None):
+        self.api_url = api_url
+        self.name = name or api_url    # exchange label in the metrics
+        self.auth = auth
+        self.pool_size = pool_size or config_params.get('http_pool_size', DEFAULT_POOL_SIZE)
+        self.timeout = (
+            connect_timeout or config_params.get('http_connect_timeout', DEFAULT_CONNECT_TIMEOUT),
+            read_timeout or config_params.get('http_read_timeout', DEFAULT_READ_TIMEOUT),
+        )
+        retries = config_params.get('http_retries', DEFAULT_RETRIES) if retries is None else retries
+
+        self.session = requests.Session()
+        self.session.auth = auth    # signs every request made through the session
+        adapter_kwargs = dict(
+            pool_connections=1,    # one host per client
+            pool_maxsize=self.pool_size,
+            max_retries=Retry(total=retries, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504], allowed_methods=['GET'], raise_on_status=False),
+        )
+        if config_params.get('exchange_capture_file'):    # record every request and response (exchanges/traffic.py)
+            from exchanges.traffic import RecordingAdapter, get_traffic_log
+            adapter = RecordingAdapter(get_traffic_log(), api_url, **adapter_kwargs)
+        else:
+            adapter = HTTPAdapter(**adapter_kwargs)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, method, path, **kwargs):
+        """ Same as requests.request, on the pooled session, with the client's default timeouts. """
+        kwargs.setdefault('timeout', self.timeout)
+        started_at = time.time()
+        start = time.perf_counter()
+        response = None
+        error = None
+        try:
+            response = self.session.request(method, self.api_url + path, **kwargs)
+            return response
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._record(method, path.split('?')[0], started_at, time.perf_counter() - start, response, error)
+
+    def _record(self, method, path, started_at, seconds, response, error):
+        """ Request latency, count by status, errors and retries (see utils/metrics.py). """
+        status = error or str(response.status_code)
+        metrics.observe('exchange_request_seconds', seconds, exchange=self.name, method=method, path=path)
+        metrics.inc('exchange_requests_total', exchange=self.name, method=method, path=path, status=status)
+        if error is not None or response.status_code >= 400:
+            metrics.inc('exchange_errors_total', exchange=self.name, method=method, path=path, status=status)
+        retries = getattr(getattr(response, 'raw', None), 'retries', None)    # urllib3 Retry, with the attempts it made
+        retried = len(retries.history) if retries is not None and retries.history else 0
+        if retried:
+            metrics.inc('exchange_retries_total', retried, exchange=self.name, method=method, path=path)
+        if metrics.sink is not None:
+            metrics.emit({'t': started_at, 'span': 'exchange_request', 'seconds': round(seconds, 6), 'exchange': self.name, 'method': method, 'path': path, 'status': status, 'retries': retried})
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+local_api_urls = set()    # base urls of the simulators running in this process (exchanges/simulator.py)
+
+
+def orders_enabled(client):
+    """ Orders are sent in production, or outside it when the client itself can only reach a
+    local venue: its api_url is a running simulator's (exchanges/simulator.py, or one listed in
+    exchange_simulator_urls) or its session is answered from captured traffic (replay.py). """
+    if config_params['in_production']:
+        return True
+    if client.api_url in local_api_urls or client.api_url in config_params.get('exchange_simulator_urls', []):
+        return True
+    from exchanges.traffic import ReplayAdapter
+    return any(isinstance(adapter, ReplayAdapter) for adapter in client.session.adapters.values())
+
+
+_shared_clients = {}    # (api_url, id(auth)) -> client, for callers that still pass a bare auth object
+
+
+def get_client(connection, api_url):
+    """ The exchange functions accept either an ExchangeClient or, as before, a bare auth
+    object. A bare auth gets one shared client per exchange, so it is still pooled. """
+    if isinstance(connection, ExchangeClient):
+        return connection
+    key = (api_url, id(connection))
+    if key not in _shared_clients or _shared_clients[key].auth is not connection:
+        _shared_clients[key] = ExchangeClient(api_url, connection)
+    return _shared_clients[key]
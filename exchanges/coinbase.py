@@ -17,23 +17,20 @@ import hashlib
 import base64
 import requests
 from requests.auth import AuthBase
-from google.cloud import storage
-from google.cloud import secretmanager
 from config import config_params
+from exchanges.client import ExchangeClient, get_client, orders_enabled
+from exchanges.credentials import get_credential_provider
+from exchanges.balances import balance_cache
+from utils import tracing
 
 
 # CONFIG
-client = secretmanager.SecretManagerServiceClient()    # get authentication info
-project_id = ""    # FIXME: add your value here
-
-CB_PRIME_API_KEY = ''    # FIXME: add your value here
+CB_PRIME_API_KEY = ''    # FIXME: add your value here (secret name, resolved by exchanges/credentials.py on first use)
 CB_PRIME_PASSPHRASE = ''    # FIXME: add your value here
 CB_PRIME_SECRET = ''    # FIXME: add your value here
-cb_prime_api_key = client.access_secret_version({"name": f"projects/{project_id}/secrets/{CB_PRIME_API_KEY}/versions/latest"}).payload.data.decode('UTF-8')
-cb_prime_passphrase = client.access_secret_version({"name": f"projects/{project_id}/secrets/{CB_PRIME_PASSPHRASE}/versions/latest"}).payload.data.decode('UTF-8')
-cb_prime_secret= client.access_secret_version({"name": f"projects/{project_id}/secrets/{CB_PRIME_SECRET}/versions/latest"}).payload.data.decode('UTF-8')
+SECRET_NAMES = [CB_PRIME_API_KEY, CB_PRIME_PASSPHRASE, CB_PRIME_SECRET]
 
-api_url = 'https://api.exchange.coinbase.com/'
+api_url = config_params.get('coinbase_api_url') or 'https://api.exchange.coinbase.com/'
 method = 'GET'
 request_path = '/accounts'
 
@@ -44,14 +41,16 @@ class CoinbaseExchangeAuth(AuthBase):
         self.api_key = api_key
         self.secret_key = secret_key
         self.passphrase = passphrase
+        self.hmac = hmac.new(base64.b64decode(secret_key), digestmod=hashlib.sha256)    # keyed once, copied per request
 
     def __call__(self, request):
         timestamp = str(int(time.time()))
         message = (timestamp + request.method + request.path_url).encode("utf-8")
         if request.body:
-            message = b''.join([message, request.body]) 
-        hmac_key = base64.b64decode(self.secret_key)
-        signature = hmac.new(hmac_key, message, hashlib.sha256)
+            body = request.body if isinstance(request.body, bytes) else request.body.encode()
+            message = b''.join([message, body]) 
+        signature = self.hmac.copy()
+        signature.update(message)
         signature_b64 = base64.b64encode(signature.digest())
 
         request.headers.update({
@@ -64,67 +63,102 @@ class CoinbaseExchangeAuth(AuthBase):
 
 
 # FUNCTIONS
-def get_coinbase_connection():
-    return CoinbaseExchangeAuth(cb_prime_api_key, cb_prime_secret, cb_prime_passphrase)
+def get_coinbase_connection(pool_size=None):
+    """ Returns a pooled client for the Coinbase API with the account's auth attached. """
+    cb_prime_api_key, cb_prime_passphrase, cb_prime_secret = get_credential_provider().get_many(SECRET_NAMES)
+    return ExchangeClient(api_url, CoinbaseExchangeAuth(cb_prime_api_key, cb_prime_secret, cb_prime_passphrase), pool_size=pool_size, name='Coinbase')
 
-def get_all_coinbase_accounts(auth):
+def get_all_coinbase_accounts(connection):
     """ Prints a list of all accounts on the coinbase profile to screen so you can see 
     the balances. """
-    response = requests.get(api_url + 'accounts', auth=auth)
+    response = get_client(connection, api_url).get('accounts')
     accounts = response.json()
     for account in accounts:
         print(account)
 
-def get_single_coinbase_account(auth, account_id):
-    """ Prints the avialable balance information for a specific coin account on the CB profile. """
-    response = requests.get(api_url + 'accounts/' + account_id, auth=auth)
-    return response.json()['balance']
+def get_coinbase_balances(connection):
+    """ Returns a dict of account id -> balance for every account on the CB profile (one request). """
+    response = get_client(connection, api_url).get('accounts')
+    return {account['id']: account['balance'] for account in response.json()}
+
+def get_single_coinbase_account(connection, account_id):
+    """ Returns the balance of a specific coin account on the CB profile (from the balance cache, see exchanges/balances.py). """
+    client = get_client(connection, api_url)
+    balance = balance_cache.get('Coinbase', client, account_id, lambda: get_coinbase_balances(client))
+    if balance is not None:
+        return balance
+
+    print('Account ' + account_id + ' not found on Coinbase profile, returning zero.')
+    return 0
 
-def get_single_coinbase_account_ledger(auth, account_id):
+def get_single_coinbase_account_ledger(connection, account_id):
     """ Returns the avialable ledger information for a specific coin account on the CB profile. """
-    response = requests.get(api_url + 'accounts/' + account_id + '/ledger', auth=auth)
+    response = get_client(connection, api_url).get('accounts/' + account_id + '/ledger')
     return response.json()
 
-def get_coinbase_fees_quote(auth):
+def get_coinbase_fees_quote(connection):
     """ Prints the maker and taker fee rates for the account (depends on volume). """
-    response = requests.get(api_url + 'fees', auth=auth)
+    response = get_client(connection, api_url).get('fees')
     print(response.text)
 
-def get_coinbase_btc_price_quote_coinbase(auth):
+def get_coinbase_btc_price_quote_coinbase(connection):
     """ Returns the current price of BTC. """
-    response = requests.get(api_url + 'oracle', auth=auth)
+    return get_coinbase_price_quote(connection, 'BTC')
+
+def get_coinbase_price_quote(connection, token):
+    """ Returns the current price of the token in USD. """
+    response = get_client(connection, api_url).get('oracle')
     prices = response.json()['prices']
-    return float(prices['BTC'])
+    return float(prices[token])
 
-def place_coinbase_market_order(auth, amount_usd, product_id, side, usd_acct, btc_acct):
-    """ Places a market order on Coinbase. """
+def place_coinbase_market_order(connection, amount_usd, product_id, side, usd_acct, btc_acct, size=None):
+    """ Places a market order on Coinbase for amount_usd worth, or with "size" for that much of the base token. """
     print('Placing market ' + side + ' order on Coinbase...')
-    print('Coinbase USD account balance before trade: ' + str(get_single_coinbase_account(auth, usd_acct)))
-    print('Coinbase BTC account balance before trade: ' + str(get_single_coinbase_account(auth, btc_acct)))
+    print('Coinbase USD account balance before trade: ' + str(get_single_coinbase_account(connection, usd_acct)))
+    print('Coinbase BTC account balance before trade: ' + str(get_single_coinbase_account(connection, btc_acct)))
     data = {
             'type': 'market',
             'side': side,
             'product_id': product_id,
             'funds': amount_usd,   # buy the amount dictated by config file (usd)
         }
-    if config_params['in_production']:     
-        response = requests.post(api_url + 'orders', auth=auth, json=data)
+    if size is not None:
+        del data['funds']
+        data['size'] = str(size)
+    trace = tracing.current_trace()
+    if trace is not None:
+        data['client_oid'] = trace.trace_id    # ties the venue's order to the bot log row
+    client = get_client(connection, api_url)
+    if orders_enabled(client):     
+        tracing.mark('order_sent')
+        response = client.post('orders', json=data)
+        tracing.mark('order_acknowledged')
+        balance_cache.invalidate('Coinbase', client)    # the fill changed the balances
         return response.json()
     else:
         print('Not in production mode, no trade actually executed.')
         return ''
 
-    print('Coinbase USD account balance after trade: ' + str(get_single_coinbase_account(auth, usd_acct)))
-    print('Coinbase BTC account balance after trade: ' + str(get_single_coinbase_account(auth, btc_acct)))
+    print('Coinbase USD account balance after trade: ' + str(get_single_coinbase_account(connection, usd_acct)))
+    print('Coinbase BTC account balance after trade: ' + str(get_single_coinbase_account(connection, btc_acct)))
+
+def coinbase_fill(response):
+    """ (base token quantity, usd paid (negative) or received net of fees) of a market order
+    response, or None if it holds no fill (no order was sent, or it is still pending). """
+    if not isinstance(response, dict) or not float(response.get('filled_size') or 0):
+        return None
+    value = float(response.get('executed_value') or 0)
+    fees = float(response.get('fill_fees') or 0)
+    return float(response['filled_size']), value - fees if response.get('side') == 'sell' else -(value + fees)
 
-def get_coinbase_trade_fees(auth, acct):
+def get_coinbase_trade_fees(connection, acct):
     """ Calculates fees for most recent Coinbase transaction in the given account. """
     print('Coinbase fee ledger for most recent trade executed:')
 
     current_time_str = datetime.datetime.now(tz=pytz.UTC).strftime("%Y-%m-%dT%H")
     fees = 0
 
-    for item in get_single_account_ledger(auth, acct):
+    for item in get_single_coinbase_account_ledger(connection, acct):
         if item['type'] == 'fee':
             time_fee_was_created_at = item['created_at'].split(':')[0]
             if time_fee_was_created_at == current_time_str:
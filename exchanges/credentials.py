@@ -0,0 +1,154 @@
+###############################################################################
+# FILENAME: credentials.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Lazy credential provider for the exchange API keys. Secrets are
+# resolved on first use (never at import time), fetched concurrently when
+# several are needed at once, and cached in memory until they expire or are
+# rotated. Backends: Google Secret Manager, environment variables or a local
+# JSON file, selected in config.py.
+###############################################################################
+import os
+import re
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import config_params
+
+
+# BACKENDS
+class SecretManagerBackend:
+    """ Google Cloud Secret Manager (latest version of each secret). The client is created on first fetch. """
+
+    def __init__(self, project_id):
+        self.project_id = project_id
+        self.client = None
+        self.lock = threading.Lock()
+
+    def fetch(self, name):
+        with self.lock:
+            if self.client is None:
+                from google.cloud import secretmanager    # only needed when this backend is used
+                self.client = secretmanager.SecretManagerServiceClient()
+        response = self.client.access_secret_version({"name": f"projects/{self.project_id}/secrets/{name}/versions/latest"})
+        return response.payload.data.decode('UTF-8')
+
+
+class EnvBackend:
+    """ Environment variables: secret "cb-prime-api-key" is read from CB_PRIME_API_KEY (plus an optional prefix). """
+
+    def __init__(self, prefix=''):
+        self.prefix = prefix
+
+    def fetch(self, name):
+        variable = self.prefix + re.sub('[^0-9A-Za-z]', '_', name).upper()
+        if variable not in os.environ:
+            raise KeyError('Credential ' + name + ' not found in environment variable ' + variable + '.')
+        return os.environ[variable]
+
+
+class FileBackend:
+    """ Local JSON file of {secret name: value}, re-read whenever the file changes. """
+
+    def __init__(self, path):
+        self.path = path
+        self.secrets = None
+        self.modified = None
+        self.lock = threading.Lock()
+
+    def fetch(self, name):
+        with self.lock:
+            modified = os.path.getmtime(self.path)
+            if self.secrets is None or modified != self.modified:
+                with open(self.path) as f:
+                    self.secrets = json.load(f)
+                self.modified = modified
+            if name not in self.secrets:
+                raise KeyError('Credential ' + name + ' not found in ' + self.path + '.')
+            return self.secrets[name]
+
+
+# PROVIDER
+class CredentialProvider:
+    """ In-memory cache in front of a backend. With a ttl, cached secrets are refetched once
+    they are older than ttl seconds, so rotated secrets are picked up without a restart. """
+
+    def __init__(self, backend, ttl=None, max_workers=8):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.cache = {}    # name -> (fetched at, value)
+        self.lock = threading.Lock()
+        self.fetches = 0
+
+    def get(self, name):
+        """ The secret's value, fetched on first use. """
+        return self.get_many([name])[0]
+
+    def get_many(self, names):
+        """ Values of several secrets, fetching the ones not cached concurrently. Returns list. """
+        missing = [name for name in dict.fromkeys(names) if not self._fresh(name)]
+        if len(missing) == 1:
+            self._store(missing[0], self.backend.fetch(missing[0]))
+        elif missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                for name, value in zip(missing, executor.map(self.backend.fetch, missing)):
+                    self._store(name, value)
+        with self.lock:
+            return [self.cache[name][1] for name in names]
+
+    def prefetch(self, names):
+        """ Warms the cache (e.g. at startup, off the trading path). """
+        self.get_many(names)
+
+    def rotate(self, name=None):
+        """ Forgets one cached secret (or all of them) so the next use refetches it. """
+        with self.lock:
+            if name is None:
+                self.cache.clear()
+            else:
+                self.cache.pop(name, None)
+
+    def _fresh(self, name):
+        with self.lock:
+            entry = self.cache.get(name)
+        return entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl)
+
+    def _store(self, name, value):
+        with self.lock:
+            self.cache[name] = (time.monotonic(), value)
+            self.fetches = self.fetches + 1
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_credential_provider():
+    """ The process wide provider, built from config on first use. """
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = CredentialProvider(make_backend(), ttl=config_params.get('credentials_ttl'))
+        return _provider
+
+
+def set_credential_provider(provider):
+    """ Replaces the process wide provider (e.g. with an EnvBackend or FileBackend one for local runs). """
+    global _provider
+    with _provider_lock:
+        _provider = provider
+
+
+def make_backend():
+    backend = config_params.get('credentials_backend', 'secret_manager')
+    if backend == 'secret_manager':
+        return SecretManagerBackend(config_params.get('gcp_project_id', ''))
+    if backend == 'env':
+        return EnvBackend(config_params.get('credentials_env_prefix', ''))
+    if backend == 'file':
+        return FileBackend(config_params['credentials_file'])
+    raise ValueError('Unknown credentials backend: ' + str(backend))
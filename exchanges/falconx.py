@@ -12,27 +12,27 @@ import hmac
 import math
 import hashlib
 import time
+import datetime
 import requests
 import base64
-from google.cloud import storage
-from google.cloud import secretmanager
 from requests.auth import AuthBase
 
 from config import config_params
+from exchanges.client import ExchangeClient, get_client, orders_enabled
+from exchanges.credentials import get_credential_provider
+from exchanges.balances import balance_cache
+from utils import tracing
 
 
 # CONFIG
-client = secretmanager.SecretManagerServiceClient()    # get authentication info
-project_id = ''    # FIXME: add your credentials here
-
-FALCONX_API_KEY = ''    # FIXME: add your value here
+FALCONX_API_KEY = ''    # FIXME: add your value here (secret name, resolved by exchanges/credentials.py on first use)
 FALCONX_PASSPHRASE = ''    # FIXME: add your value here
 FALCONX_SECRET = ''    # FIXME: add your value here
-falconx_api_key = client.access_secret_version({"name": f"projects/{project_id}/secrets/{FALCONX_API_KEY}/versions/latest"}).payload.data.decode('UTF-8')
-falconx_passphrase = client.access_secret_version({"name": f"projects/{project_id}/secrets/{FALCONX_PASSPHRASE}/versions/latest"}).payload.data.decode('UTF-8')
-falconx_secret= client.access_secret_version({"name": f"projects/{project_id}/secrets/{FALCONX_SECRET}/versions/latest"}).payload.data.decode('UTF-8')
+SECRET_NAMES = [FALCONX_API_KEY, FALCONX_PASSPHRASE, FALCONX_SECRET]
 
-api_url = 'https://api.falconx.io/v1/'
+api_url = config_params.get('falconx_api_url') or 'https://api.falconx.io/v1/'
+QUOTE_EXPIRY_MARGIN = 0.5    # seconds before t_expiry that a quote is treated as expired (time to get the order there)
+DEFAULT_QUOTE_TTL = 5.0    # seconds a quote is assumed valid if the response has no t_expiry
 
 
 # AUTHENTICATE
@@ -41,13 +41,14 @@ class FXRfqAuth(AuthBase):
         self.api_key = api_key
         self.secret_key = secret_key
         self.passphrase = passphrase
+        self.hmac = hmac.new(base64.b64decode(secret_key), digestmod=hashlib.sha256)    # keyed once, copied per request
 
     def __call__(self, request):
         timestamp = str(time.time())
         request_body = request.body.decode() if request.body else ''
         message = timestamp + request.method + request.path_url + request_body
-        hmac_key = base64.b64decode(self.secret_key)
-        signature = hmac.new(hmac_key, message.encode(), hashlib.sha256)
+        signature = self.hmac.copy()
+        signature.update(message.encode())
         signature_b64 = base64.b64encode(signature.digest())
 
         request.headers.update({
@@ -60,77 +61,143 @@ class FXRfqAuth(AuthBase):
         return request
 
 
+# QUOTES
+class FalconXQuote:
+    """ A FalconX rfq response, parsed once. Also indexes like the old [price, quote id] list. """
+
+    def __init__(self, data, received_at=None):
+        self.data = data
+        self.received_at = time.time() if received_at is None else received_at
+        self.quote_id = data.get('fx_quote_id')
+        self.side = data.get('side_requested', 'buy')
+        self.buy_price = _to_float(data.get('buy_price'))
+        self.sell_price = _to_float(data.get('sell_price'))
+        self.gross_fee_bps = data.get('gross_fee_bps')
+        self.gross_fee_usd = data.get('gross_fee_usd')
+        self.rebate_bps = data.get('rebate_bps')
+        self.rebate_usd = data.get('rebate_usd')
+        self.fee_bps = data.get('fee_bps')
+        self.fee_usd = data.get('fee_usd')
+        if data.get('t_expiry'):
+            self.expires_at = datetime.datetime.fromisoformat(data['t_expiry'].replace('Z', '+00:00')).timestamp()
+        else:
+            self.expires_at = self.received_at + DEFAULT_QUOTE_TTL
+
+    @property
+    def price(self):
+        """ Price on the quoted side (includes the basis point fee). """
+        return self.sell_price if self.side == 'sell' else self.buy_price
+
+    def is_valid(self, now=None):
+        """ True while the quote can still be used (with QUOTE_EXPIRY_MARGIN to spare). """
+        return (time.time() if now is None else now) < self.expires_at - QUOTE_EXPIRY_MARGIN
+
+    def __getitem__(self, index):
+        return [self.price, self.quote_id][index]
+
+    def print_details(self):
+        print('FalconX Quote details...')
+        print('Buy price for 1 BTC: ' + str(self.buy_price))
+        print('Gross fee bps: ' + str(self.gross_fee_bps))
+        print('Gross fee usd: ' + str(self.gross_fee_usd))
+        print('Rebate bps: ' + str(self.rebate_bps))
+        print('Rebate usd: ' + str(self.rebate_usd))
+        print('Fee bps: ' + str(self.fee_bps))
+        print('Fee usd: ' + str(self.fee_usd))
+
+
+def _to_float(value):
+    return None if value is None else float(value)
+
+
 # FUNCTIONS
-def get_falconx_connection():
-    return FXRfqAuth(falconx_api_key, falconx_secret, falconx_passphrase)
+def get_falconx_connection(pool_size=None):
+    """ Returns a pooled client for the FalconX API with the account's auth attached. """
+    falconx_api_key, falconx_passphrase, falconx_secret = get_credential_provider().get_many(SECRET_NAMES)
+    return ExchangeClient(api_url, FXRfqAuth(falconx_api_key, falconx_secret, falconx_passphrase), pool_size=pool_size, name='FalconX')
+
+def get_falconx_btc_price_quote(connection):
+    """ Returns a FalconXQuote for buying 1 BTC (quote.price is the current price of BTC). """
+    return get_falconx_price_quote(connection, 'BTC')
 
-def get_falconx_btc_price_quote(auth):
-    """ Returns the current price of BTC. """
+def get_falconx_price_quote(connection, token):
+    """ Returns a FalconXQuote for buying 1 of the token with USD. """
     params = {
         'token_pair': {
-        'base_token': 'BTC',
+        'base_token': token,
         'quote_token': 'USD'
         },
         'quantity': {
-        'token': 'BTC',
+        'token': token,
         'value': 1,
         },
         'side': 'buy'
     }
-    r = requests.post(api_url + 'quotes', json=params, auth=auth)
-    print('FalconX Quote details...')
-    print('Buy price for 1 BTC: ' + str(r.json()['buy_price']))
-    print('Gross fee bps: ' + str(r.json()['gross_fee_bps']))
-    print('Gross fee usd: ' + str(r.json()['gross_fee_usd']))
-    print('Rebate bps: ' + str(r.json()['rebate_bps']))
-    print('Rebate usd: ' + str(r.json()['rebate_usd']))
-    print('Fee bps: ' + str(r.json()['fee_bps']))
-    print('Fee usd: ' + str(r.json()['fee_usd']))
-    return [float(r.json()['buy_price']), r.json()['fx_quote_id']]
-
-def get_all_falconx_accounts(auth):
+    r = get_client(connection, api_url).post('quotes', json=params)
+    quote = FalconXQuote(r.json())
+    quote.print_details()
+    return quote
+
+def get_all_falconx_accounts(connection):
     """ Prints the avialable balance information for a specific coin account on the FalconX profile. """
-    response = requests.get(api_url + 'balances/total', auth=auth)
+    response = get_client(connection, api_url).get('balances/total')
     return response.json()
 
-def get_single_falconx_account_balance(auth, token):
-    """ Returns the total balance on FalconX of thhe input token. """
-    response = get_all_falconx_accounts(auth)
-    for item in response:
-        if item['token'] == token:
-            return item['total_balance']
+def get_falconx_balances(connection):
+    """ Returns a dict of token -> total balance for the whole FalconX account (one request). """
+    return {item['token']: item['total_balance'] for item in get_all_falconx_accounts(connection)}
+
+def get_single_falconx_account_balance(connection, token):
+    """ Returns the total balance on FalconX of thhe input token (from the balance cache, see exchanges/balances.py). """
+    client = get_client(connection, api_url)
+    balance = balance_cache.get('FalconX', client, token, lambda: get_falconx_balances(client))
+    if balance is not None:
+        return balance
     
     print('Token balance for ' + token + ' not found on FalconX account, returning zero.')
     return 0
 
-def get_falconx_token_pairs(auth):
-    response = requests.get(api_url + 'pairs', auth=auth)
+def get_falconx_token_pairs(connection):
+    response = get_client(connection, api_url).get('pairs')
     return response.json()
 
-def place_falconx_market_order(auth, amount_usd, product_id, side):
-    """ Places a market order on FalconX. """
+def place_falconx_market_order(connection, amount_usd, product_id, side, quote=None, sell_all=True, quantity=None):
+    """ Places a market order on FalconX. A buy is sized off "quote" (a FalconXQuote, e.g.
+    the one the exchange was selected on) while it is still valid, otherwise off a new rfq.
+    A sell closes the whole BTC position, or with sell_all False sells amount_usd worth, or
+    "quantity" of the token when given (capped at the balance). """
     print('Placing market ' + side + ' order on FalconX...')
-    falconx_usd = get_single_falconx_account_balance(auth, 'USD')
-    falconx_btc = get_single_falconx_account_balance(auth, 'BTC')
+    base_token = product_id[0]
+    falconx_usd = get_single_falconx_account_balance(connection, 'USD')
+    falconx_btc = get_single_falconx_account_balance(connection, base_token)
     print('FalconX USD account balance before trade: ' + str(falconx_usd))
-    print('FalconX BTC account balance before trade: ' + str(falconx_btc))
+    print('FalconX ' + base_token + ' account balance before trade: ' + str(falconx_btc))
 
     if side == 'buy':    # buy into a BTC position
         if falconx_usd <= 0:
             return 'There is a negative or zero balance in the FalconX account currently. No action taken.'
         else:
-            token = 'BTC'
+            token = base_token
             side_for_falconx_api = 'buy'
-            quote = get_falconx_btc_price_quote(auth)[0]
-            value = round(amount_usd / quote, 8)
+            if quote is None or not quote.is_valid():
+                quote = get_falconx_price_quote(connection, base_token)    # re-quote only when needed
+                tracing.mark('quote_received', quote.received_at)    # the order is sized off this one
+            value = round(amount_usd / quote.price, 8)
 
     elif side == 'sell':    # selling out of a BTC position into USD
         if falconx_btc <= 0:
             return 'There is a negative or zero BTC balance in the FalconX account currently. No action taken'
         else:
-            token = 'BTC'
+            token = base_token
             side_for_falconx_api = 'sell'
-            value = round_decimals_down(get_single_falconx_account_balance(auth, 'BTC'), 8)    # sell out of entire BTC position held in the account
+            value = round_decimals_down(get_single_falconx_account_balance(connection, base_token), 8)    # sell out of entire BTC position held in the account
+            if quantity is not None:
+                value = min(value, round_decimals_down(quantity, 8))    # only the given quantity
+            elif not sell_all:
+                if quote is None or not quote.is_valid():
+                    quote = get_falconx_price_quote(connection, base_token)
+                    tracing.mark('quote_received', quote.received_at)
+                value = min(value, round_decimals_down(amount_usd / quote.price, 8))    # only part of the position
     data = {
             "token_pair": {
                 "base_token": product_id[0],
@@ -144,15 +211,31 @@ def place_falconx_market_order(auth, amount_usd, product_id, side):
             "order_type": "market",
         }
 
-    if config_params['in_production']:     
-        response = requests.post(api_url + 'order', auth=auth, json=data)
-        print('FalconX USD account balance after trade: ' + str(get_single_falconx_account_balance(auth, 'USD')))
-        print('FalconX BTC account balance after trade: ' + str(get_single_falconx_account_balance(auth, 'BTC')))
+    client = get_client(connection, api_url)
+    if orders_enabled(client):     
+        tracing.mark('order_sent')
+        response = client.post('order', json=data)
+        tracing.mark('order_acknowledged')
+        balance_cache.invalidate('FalconX', client)    # the fill changed the balances
+        print('FalconX USD account balance after trade: ' + str(get_single_falconx_account_balance(connection, 'USD')))
+        print('FalconX ' + base_token + ' account balance after trade: ' + str(get_single_falconx_account_balance(connection, base_token)))
         return response.json()
     else:
         print('Not in production mode, no trade actually executed.')
         return 'Not in production mode, no trade actually executed.'
 
+def falconx_fill(response):
+    """ (base token quantity, usd paid (negative) or received, fee included in the price) of a
+    market order response, or None if it holds no fill (e.g. no order was sent). """
+    if not isinstance(response, dict) or response.get('status') != 'success':
+        return None
+    side = response.get('side_executed') or response.get('side_requested')
+    price = _to_float(response.get('buy_price') if side == 'buy' else response.get('sell_price'))
+    quantity = _to_float(response.get('quantity_executed') or (response.get('quantity_requested') or {}).get('value'))
+    if not price or not quantity:
+        return None
+    return quantity, -quantity * price if side == 'buy' else quantity * price
+
 def round_decimals_down(number, decimals):
     """ Returns a value rounded down to a specific number of decimal places. """
     if not isinstance(decimals, int):
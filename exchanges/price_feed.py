@@ -0,0 +1,133 @@
+###############################################################################
+# FILENAME: price_feed.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Streaming BTC price feeds for the event driven run mode. A feed
+# is an iterable of PriceTick. WebsocketPriceFeed follows the Coinbase ticker
+# channel (reconnecting when the socket drops); LocalPriceFeed is a stand-in
+# producer that replays a list of prices on a background thread, for tests
+# and dry runs.
+###############################################################################
+import json
+import time
+import queue
+import datetime
+import threading
+
+from config import config_params
+
+
+# CONFIG
+DEFAULT_FEED_URL = 'wss://ws-feed.exchange.coinbase.com'
+RECONNECT_DELAYS = [0.5, 1, 2, 5, 10]    # seconds between reconnect attempts (the last one repeats)
+
+
+# TICKS
+class PriceTick:
+    """ One trade price from the feed. timestamp is the exchange's time (epoch seconds),
+    received_at is the local perf_counter() reading when the tick arrived. """
+
+    __slots__ = ('price', 'timestamp', 'received_at')
+
+    def __init__(self, price, timestamp=None, received_at=None):
+        self.price = price
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.received_at = time.perf_counter() if received_at is None else received_at
+
+    def price_frame(self):
+        """ The tick as a one row price data frame, in the layout apply_strategy expects. Returns df. """
+        import pandas as pd
+        return pd.DataFrame([{'time': self.timestamp, 'l': self.price, 'h': self.price, 'o': self.price, 'c': self.price, 'v': 0.0}])
+
+
+# FEEDS
+class WebsocketPriceFeed:
+    """ Coinbase ticker channel for one product. Needs the websocket-client package. """
+
+    def __init__(self, product_id=None, url=None, timeout=30):
+        self.product_id = product_id or config_params.get('price_feed_product', 'BTC-USD')
+        self.url = url or config_params.get('price_feed_url', DEFAULT_FEED_URL)
+        self.timeout = timeout
+        self.socket = None
+        self.closed = False
+
+    def connect(self):
+        import websocket    # websocket-client, only needed for the event driven mode
+        self.socket = websocket.create_connection(self.url, timeout=self.timeout)
+        self.socket.send(json.dumps({'type': 'subscribe', 'product_ids': [self.product_id], 'channels': ['ticker']}))
+        print('Price feed connected: ' + self.url + ' ' + self.product_id)
+
+    def close(self):
+        self.closed = True
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    def __iter__(self):
+        attempt = 0
+        while not self.closed:
+            try:
+                if self.socket is None:
+                    self.connect()
+                message = self.socket.recv()
+                attempt = 0
+            except Exception as e:    # dropped or timed out: reconnect with backoff
+                if self.closed:
+                    return
+                delay = RECONNECT_DELAYS[min(attempt, len(RECONNECT_DELAYS) - 1)]
+                print('Price feed error (' + repr(e) + '), reconnecting in ' + str(delay) + 's...')
+                self.socket = None
+                attempt = attempt + 1
+                time.sleep(delay)
+                continue
+            tick = parse_ticker(message)
+            if tick is not None:
+                yield tick
+
+
+def parse_ticker(message):
+    """ PriceTick from a Coinbase ticker message, None for any other message. """
+    received_at = time.perf_counter()
+    data = json.loads(message)
+    if data.get('type') != 'ticker' or 'price' not in data:
+        return None
+    timestamp = None
+    if data.get('time'):
+        timestamp = datetime.datetime.fromisoformat(data['time'].replace('Z', '+00:00')).timestamp()
+    return PriceTick(float(data['price']), timestamp, received_at)
+
+
+class LocalPriceFeed:
+    """ Stand-in producer: a thread puts one tick per price on a queue every "interval"
+    seconds, the way a socket delivers them while the bot is busy. Iteration ends after
+    the last price. """
+
+    def __init__(self, prices, interval=0.0):
+        self.prices = list(prices)
+        self.interval = interval
+        self.ticks = queue.Queue()
+        self.producer = None
+        self.closed = False
+
+    def _produce(self):
+        for price in self.prices:
+            if self.closed:
+                break
+            self.ticks.put(PriceTick(float(price)))
+            if self.interval:
+                time.sleep(self.interval)
+        self.ticks.put(None)    # end of feed
+
+    def close(self):
+        self.closed = True
+
+    def __iter__(self):
+        if self.producer is None:
+            self.producer = threading.Thread(target=self._produce, name='local_price_feed', daemon=True)
+            self.producer.start()
+        while True:
+            tick = self.ticks.get()
+            if tick is None:
+                return
+            yield tick
@@ -0,0 +1,501 @@
+###############################################################################
+# FILENAME: simulator.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Local Coinbase + FalconX simulator for load tests and end to
+# end benchmarks of run() / execute_trades without touching the real venues.
+# It serves the endpoints the exchange modules use under /coinbase/ and
+# /falconx/, checks the request signatures, moves prices along a geometric
+# Brownian motion, fills market orders against simulated balances and can
+# inject latency (per endpoint distributions), rate limits and errors.
+#
+# Usage: python -m exchanges.simulator [--port 8765] [--latency lognormal:25:0.5]
+#            [--error-rate 0.01] [--rate-limit 10:20] [--seed 1]
+# then set coinbase_api_url / falconx_api_url in config.py to the printed
+# urls and list both in exchange_simulator_urls. In process:
+#   simulator = ExchangeSimulator(latency='uniform:5:15').start()
+#   point_exchanges_at(simulator)
+#   coinbase_connection, falconx_connection = simulator.connections()
+###############################################################################
+import hmac
+import json
+import math
+import time
+import uuid
+import base64
+import random
+import socket
+import hashlib
+import argparse
+import datetime
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from exchanges.client import local_api_urls
+from config import config_params
+
+
+# CONFIG
+SIMULATOR_CREDENTIALS = {    # venue -> (api key, base64 secret, passphrase) the simulator accepts
+    'coinbase': ('sim-coinbase-key', base64.b64encode(b'sim-coinbase-secret').decode(), 'sim-coinbase-passphrase'),
+    'falconx': ('sim-falconx-key', base64.b64encode(b'sim-falconx-secret').decode(), 'sim-falconx-passphrase'),
+}
+DEFAULT_PRICES = {'BTC': 40000.0, 'ETH': 2000.0, 'SOL': 150.0}
+DEFAULT_BALANCES = {'USD': 100000.0, 'BTC': 0.0, 'ETH': 0.0, 'SOL': 0.0}
+COINBASE_TAKER_FEE = 0.005
+FALCONX_FEE_BPS = 5
+FALCONX_QUOTE_TTL = 5.0    # seconds
+MAX_TIMESTAMP_SKEW = 30    # seconds a signed request's timestamp may be off by
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+# LATENCY
+class Latency:
+    """ Response delay distribution in milliseconds: fixed:ms, uniform:low:high, normal:mean:sd,
+    lognormal:median:sigma or exponential:mean. """
+
+    KINDS = ['fixed', 'uniform', 'normal', 'lognormal', 'exponential']
+
+    def __init__(self, kind='fixed', *params):
+        if kind not in self.KINDS:
+            raise ValueError('Unknown latency distribution: ' + str(kind))
+        self.kind = kind
+        self.params = [float(param) for param in params] or [0.0]
+
+    @classmethod
+    def parse(cls, spec):
+        """ Latency from "kind:param:param" (or a number of milliseconds, or an existing Latency). """
+        if spec is None:
+            return cls('fixed', 0)
+        if isinstance(spec, Latency):
+            return spec
+        if isinstance(spec, (int, float)):
+            return cls('fixed', spec)
+        kind, *params = str(spec).split(':')
+        return cls(kind, *params)
+
+    def sample(self, rng):
+        """ One delay in seconds (never negative). """
+        p = self.params
+        if self.kind == 'fixed':
+            ms = p[0]
+        elif self.kind == 'uniform':
+            ms = rng.uniform(p[0], p[1])
+        elif self.kind == 'normal':
+            ms = rng.gauss(p[0], p[1])
+        elif self.kind == 'lognormal':
+            ms = p[0] * math.exp(rng.gauss(0, p[1]))
+        else:
+            ms = rng.expovariate(1 / p[0]) if p[0] > 0 else 0.0
+        return max(ms, 0.0) / 1000
+
+
+class RateLimit:
+    """ Token bucket: "rate" requests per second with bursts of up to "burst". """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    @classmethod
+    def parse(cls, spec):
+        """ RateLimit from "rate:burst" (or None for no limit). """
+        if spec is None or isinstance(spec, RateLimit):
+            return spec
+        return cls(*str(spec).split(':'))
+
+    def allow(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens = self.tokens - 1
+            return True
+        return False
+
+
+# MARKET
+class SimulatedMarket:
+    """ USD prices that follow a geometric Brownian motion in (scaled) wall clock time, and
+    the account balances / ledger of both venues. Thread safe. """
+
+    def __init__(self, prices=None, balances=None, volatility=0.6, drift=0.0, time_scale=1.0, seed=None):
+        self.prices = dict(prices or DEFAULT_PRICES)
+        self.volatility = volatility    # annualized
+        self.drift = drift    # annualized
+        self.time_scale = time_scale    # simulated seconds per real second
+        self.rng = random.Random(seed)
+        self.updated = time.monotonic()
+        self.lock = threading.RLock()
+        self.coinbase_balances = dict(balances or DEFAULT_BALANCES)    # currency -> balance
+        self.falconx_balances = dict(balances or DEFAULT_BALANCES)    # token -> balance
+        self.ledger = {currency: [] for currency in self.coinbase_balances}    # coinbase currency -> entries
+        self.fills = []
+
+    def price(self, token):
+        """ Current price of the token, after moving every price along to now. """
+        with self.lock:
+            now = time.monotonic()
+            dt = (now - self.updated) * self.time_scale / SECONDS_PER_YEAR
+            self.updated = now
+            if dt > 0:
+                for name in self.prices:
+                    shock = self.rng.gauss(0, 1)
+                    self.prices[name] = self.prices[name] * math.exp((self.drift - 0.5 * self.volatility ** 2) * dt + self.volatility * math.sqrt(dt) * shock)
+            if token not in self.prices:
+                raise KeyError(token)
+            return self.prices[token]
+
+    def fill(self, venue, token, side, usd=None, quantity=None, fee_rate=0.0, spread=0.0):
+        """ Fills a market order for "usd" worth (or "quantity") of the token, capped at what the
+        account holds. The fee is either charged on top (fee_rate, Coinbase) or built into the
+        price (spread, FalconX). Returns dict of the fill. """
+        with self.lock:
+            price = self.price(token) * (1 + spread if side == 'buy' else 1 - spread)
+            balances = self.coinbase_balances if venue == 'coinbase' else self.falconx_balances
+            balances.setdefault(token, 0.0)
+            if side == 'buy':
+                if quantity is None:
+                    quantity = usd / (price * (1 + fee_rate))    # the funds cover the fee too
+                quantity = min(quantity, balances['USD'] / (price * (1 + fee_rate)))
+                value = quantity * price
+                fee = value * fee_rate
+                balances['USD'] = balances['USD'] - value - fee
+                balances[token] = balances[token] + quantity
+            else:
+                if quantity is None:
+                    quantity = usd / price
+                quantity = min(quantity, balances[token])
+                value = quantity * price
+                fee = value * fee_rate
+                balances[token] = balances[token] - quantity
+                balances['USD'] = balances['USD'] + value - fee
+            fill = {'venue': venue, 'token': token, 'side': side, 'price': price, 'quantity': quantity, 'value': value, 'fee': fee, 'time': _now_iso()}
+            self.fills.append(fill)
+            if venue == 'coinbase' and fee:
+                self.ledger.setdefault('USD', []).append({'id': str(len(self.fills)), 'created_at': fill['time'], 'amount': str(-fee), 'balance': str(balances['USD']), 'type': 'fee', 'details': {'product_id': token + '-USD'}})
+            return fill
+
+
+def _now_iso():
+    return datetime.datetime.now(tz=datetime.timezone.utc).isoformat(timespec='microseconds').replace('+00:00', 'Z')
+
+
+# SERVER
+class ExchangeSimulator:
+    """ The simulated venues on a local keep-alive HTTP server. latency is one Latency spec for
+    every endpoint or a dict of endpoint (e.g. 'coinbase/oracle' or 'falconx/order', with
+    'default') -> spec; error_rate is the fraction of requests answered with a 500;
+    rate_limit ("rate:burst") is applied per venue and answered with a 429. """
+
+    def __init__(self, port=0, latency=None, error_rate=0.0, rate_limit=None, check_signatures=True, market=None, seed=None):
+        self.port = port
+        if isinstance(latency, dict):
+            self.latency = {endpoint: Latency.parse(spec) for endpoint, spec in latency.items()}
+        else:
+            self.latency = {'default': Latency.parse(latency)}
+        self.error_rate = error_rate
+        self.rate_limits = {venue: RateLimit.parse(rate_limit) for venue in SIMULATOR_CREDENTIALS}
+        self.check_signatures = check_signatures
+        self.market = market or SimulatedMarket(seed=seed)
+        self.rng = random.Random(seed)
+        self.quotes = {}    # fx quote id -> quote
+        self.stats = {}    # endpoint -> {'requests', 'errors', 'rate_limited', 'unauthorized'}
+        self.lock = threading.Lock()
+        self.server = None
+
+    # lifecycle
+    def start(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'    # keep-alive, like the real venues
+
+            def setup(self):
+                super().setup()
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_GET(self):
+                simulator.handle(self)
+
+            def do_POST(self):
+                simulator.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, name='exchange_simulator', daemon=True).start()
+        local_api_urls.update([self.coinbase_url, self.falconx_url])    # orders to these urls are sent outside production too
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            local_api_urls.difference_update([self.coinbase_url, self.falconx_url])
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def url(self, venue):
+        return 'http://127.0.0.1:' + str(self.port) + '/' + venue + '/'
+
+    @property
+    def coinbase_url(self):
+        return self.url('coinbase')
+
+    @property
+    def falconx_url(self):
+        return self.url('falconx')
+
+    def connections(self, pool_size=None):
+        """ (Coinbase, FalconX) ExchangeClients signed with the simulator's credentials. """
+        from exchanges.client import ExchangeClient
+        from exchanges.coinbase import CoinbaseExchangeAuth
+        from exchanges.falconx import FXRfqAuth
+        coinbase_key, coinbase_secret, coinbase_passphrase = SIMULATOR_CREDENTIALS['coinbase']
+        falconx_key, falconx_secret, falconx_passphrase = SIMULATOR_CREDENTIALS['falconx']
+        return (
+            ExchangeClient(self.coinbase_url, CoinbaseExchangeAuth(coinbase_key, coinbase_secret, coinbase_passphrase), pool_size=pool_size, name='Coinbase'),
+            ExchangeClient(self.falconx_url, FXRfqAuth(falconx_key, falconx_secret, falconx_passphrase), pool_size=pool_size, name='FalconX'),
+        )
+
+    # requests
+    def handle(self, request):
+        length = int(request.headers.get('Content-Length') or 0)
+        body = request.rfile.read(length) if length else b''
+        path = request.path.split('?')[0].strip('/')
+        venue, _, endpoint = path.partition('/')
+        route = self._route(venue, request.command, endpoint)
+        stats_key = venue + '/' + (route[0] if route else endpoint)
+        self._count(stats_key, 'requests')
+
+        time.sleep(self._latency(stats_key).sample(self.rng))
+        if route is None:
+            return self._reply(request, 404, {'message': 'NotFound'})
+        if self.check_signatures and not self._signed(venue, request, body):
+            self._count(stats_key, 'unauthorized')
+            return self._reply(request, 401, {'message': 'invalid signature'})
+        limit = self.rate_limits.get(venue)
+        if limit is not None:
+            with self.lock:
+                allowed = limit.allow()
+            if not allowed:
+                self._count(stats_key, 'rate_limited')
+                return self._reply(request, 429, {'message': 'Public rate limit exceeded'})
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self._count(stats_key, 'errors')
+            return self._reply(request, 500, {'message': 'simulated internal error'})
+
+        name, handler, argument = route
+        try:
+            data = json.loads(body) if body else {}
+            status, payload = handler(data, argument) if argument is not None else handler(data)
+        except (KeyError, ValueError, TypeError) as e:
+            status, payload = 400, {'message': 'bad request: ' + repr(e)}
+        self._reply(request, status, payload)
+
+    def _route(self, venue, method, endpoint):
+        """ (endpoint name, handler, path argument or None), or None for an unknown endpoint. """
+        parts = endpoint.split('/')
+        if venue == 'coinbase':
+            if method == 'GET' and endpoint == 'accounts':
+                return ('accounts', self.coinbase_accounts, None)
+            if method == 'GET' and len(parts) == 2 and parts[0] == 'accounts':
+                return ('accounts/id', self.coinbase_account, parts[1])
+            if method == 'GET' and len(parts) == 3 and parts[0] == 'accounts' and parts[2] == 'ledger':
+                return ('accounts/id/ledger', self.coinbase_ledger, parts[1])
+            if method == 'GET' and endpoint == 'fees':
+                return ('fees', self.coinbase_fees, None)
+            if method == 'GET' and endpoint == 'oracle':
+                return ('oracle', self.coinbase_oracle, None)
+            if method == 'POST' and endpoint == 'orders':
+                return ('orders', self.coinbase_order, None)
+        elif venue == 'falconx':
+            if method == 'POST' and endpoint == 'quotes':
+                return ('quotes', self.falconx_quote, None)
+            if method == 'GET' and endpoint == 'balances/total':
+                return ('balances/total', self.falconx_balances, None)
+            if method == 'GET' and endpoint == 'pairs':
+                return ('pairs', self.falconx_pairs, None)
+            if method == 'POST' and endpoint == 'order':
+                return ('order', self.falconx_order, None)
+        return None
+
+    def _signed(self, venue, request, body):
+        """ True if the request carries a valid, fresh signature for the venue's credentials
+        (same schemes as CoinbaseExchangeAuth and FXRfqAuth). """
+        prefix = 'CB-ACCESS-' if venue == 'coinbase' else 'FX-ACCESS-'
+        api_key, secret, passphrase = SIMULATOR_CREDENTIALS[venue]
+        timestamp = request.headers.get(prefix + 'TIMESTAMP', '')
+        if request.headers.get(prefix + 'KEY') != api_key or request.headers.get(prefix + 'PASSPHRASE') != passphrase:
+            return False
+        try:
+            if abs(time.time() - float(timestamp)) > MAX_TIMESTAMP_SKEW:
+                return False
+        except ValueError:
+            return False
+        message = timestamp.encode() + request.command.encode() + request.path.encode() + body
+        expected = base64.b64encode(hmac.new(base64.b64decode(secret), message, hashlib.sha256).digest()).decode()
+        return hmac.compare_digest(expected, request.headers.get(prefix + 'SIGN', ''))
+
+    def _latency(self, stats_key):
+        return self.latency.get(stats_key) or self.latency.get('default') or Latency()
+
+    def _count(self, stats_key, counter):
+        with self.lock:
+            counts = self.stats.setdefault(stats_key, {'requests': 0, 'errors': 0, 'rate_limited': 0, 'unauthorized': 0})
+            counts[counter] = counts[counter] + 1
+
+    def _reply(self, request, status, payload):
+        body = json.dumps(payload).encode()
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    # coinbase endpoints
+    def coinbase_accounts(self, data):
+        with self.market.lock:
+            return 200, [self._coinbase_account(currency) for currency in self.market.coinbase_balances]
+
+    def coinbase_account(self, data, account_id):
+        currency = account_id.upper()
+        if currency not in self.market.coinbase_balances:
+            return 404, {'message': 'NotFound'}
+        return 200, self._coinbase_account(currency)
+
+    def _coinbase_account(self, currency):
+        balance = str(self.market.coinbase_balances[currency])
+        return {'id': currency.lower(), 'currency': currency, 'balance': balance, 'available': balance, 'hold': '0', 'profile_id': 'simulator'}
+
+    def coinbase_ledger(self, data, account_id):
+        with self.market.lock:
+            return 200, list(reversed(self.market.ledger.get(account_id.upper(), [])))    # newest first
+
+    def coinbase_fees(self, data):
+        return 200, {'maker_fee_rate': str(COINBASE_TAKER_FEE / 2), 'taker_fee_rate': str(COINBASE_TAKER_FEE), 'usd_volume': '0'}
+
+    def coinbase_oracle(self, data):
+        prices = {token: str(round(self.market.price(token), 2)) for token in list(self.market.prices)}
+        return 200, {'timestamp': str(int(time.time())), 'messages': [], 'signatures': [], 'prices': prices}
+
+    def coinbase_order(self, data):
+        token = data['product_id'].split('-')[0]
+        if 'size' in data:    # sized in the base token, otherwise in usd (funds)
+            fill = self.market.fill('coinbase', token, data['side'], quantity=float(data['size']), fee_rate=COINBASE_TAKER_FEE)
+        else:
+            fill = self.market.fill('coinbase', token, data['side'], usd=float(data['funds']), fee_rate=COINBASE_TAKER_FEE)
+        return 200, {
+            'id': str(uuid.uuid4()),
+            'client_oid': data.get('client_oid', ''),
+            'product_id': data['product_id'],
+            'side': data['side'],
+            'type': 'market',
+            'funds': str(data.get('funds', '')),
+            'size': str(data.get('size', '')),
+            'filled_size': str(fill['quantity']),
+            'executed_value': str(fill['value']),
+            'fill_fees': str(fill['fee']),
+            'status': 'done',
+            'settled': True,
+            'done_at': fill['time'],
+        }
+
+    # falconx endpoints
+    def falconx_quote(self, data):
+        token = data['token_pair']['base_token']
+        price = self.market.price(token)
+        quantity = float(data['quantity']['value'])
+        fee = FALCONX_FEE_BPS / 10000
+        quote = {
+            'status': 'success',
+            'fx_quote_id': uuid.uuid4().hex,
+            'token_pair': data['token_pair'],
+            'quantity_requested': {'token': data['quantity']['token'], 'value': str(quantity)},
+            'side_requested': data.get('side', 'buy'),
+            'buy_price': round(price * (1 + fee), 2),
+            'sell_price': round(price * (1 - fee), 2),
+            'gross_fee_bps': FALCONX_FEE_BPS,
+            'gross_fee_usd': round(price * quantity * fee, 2),
+            'rebate_bps': 0,
+            'rebate_usd': 0,
+            'fee_bps': FALCONX_FEE_BPS,
+            'fee_usd': round(price * quantity * fee, 2),
+            't_quote': _now_iso(),
+            't_expiry': (datetime.datetime.now(tz=datetime.timezone.utc) + datetime.timedelta(seconds=FALCONX_QUOTE_TTL)).isoformat().replace('+00:00', 'Z'),
+        }
+        with self.lock:
+            self.quotes[quote['fx_quote_id']] = quote
+        return 200, quote
+
+    def falconx_balances(self, data):
+        with self.market.lock:
+            return 200, [{'token': token, 'total_balance': balance, 'platform_balance': balance, 'pending_balance': 0} for token, balance in self.market.falconx_balances.items()]
+
+    def falconx_pairs(self, data):
+        return 200, [{'base_token': token, 'quote_token': 'USD'} for token in self.market.prices]
+
+    def falconx_order(self, data):
+        token = data['token_pair']['base_token']
+        spread = FALCONX_FEE_BPS / 10000
+        fill = self.market.fill('falconx', token, data['side'], quantity=float(data['quantity']['value']), spread=spread)
+        return 200, {
+            'status': 'success',
+            'trade_id': uuid.uuid4().hex,
+            'token_pair': data['token_pair'],
+            'quantity_requested': data['quantity'],
+            'side_requested': data['side'],
+            'side_executed': data['side'],
+            'buy_price': fill['price'] if data['side'] == 'buy' else None,
+            'sell_price': fill['price'] if data['side'] == 'sell' else None,
+            'quantity_executed': fill['quantity'],
+            'fee_bps': FALCONX_FEE_BPS,
+            'fee_usd': round(fill['value'] * spread / (1 + spread), 2),
+            't_execute': fill['time'],
+        }
+
+
+def point_exchanges_at(simulator):
+    """ Sends every exchange call (and, outside production, the orders) to the simulator. """
+    from exchanges import coinbase, falconx
+    coinbase.api_url = simulator.coinbase_url
+    falconx.api_url = simulator.falconx_url
+    config_params['coinbase_api_url'] = simulator.coinbase_url
+    config_params['falconx_api_url'] = simulator.falconx_url
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local Coinbase + FalconX simulator.')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', default=None, help='fixed:ms, uniform:low:high, normal:mean:sd, lognormal:median:sigma or exponential:mean')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with a 500')
+    parser.add_argument('--rate-limit', default=None, help='requests per second per venue, as rate:burst')
+    parser.add_argument('--volatility', type=float, default=0.6, help='annualized volatility of the simulated prices')
+    parser.add_argument('--time-scale', type=float, default=1.0, help='simulated seconds per real second')
+    parser.add_argument('--no-signatures', action='store_true', help='accept unsigned requests')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    market = SimulatedMarket(volatility=args.volatility, time_scale=args.time_scale, seed=args.seed)
+    simulator = ExchangeSimulator(args.port, args.latency, args.error_rate, args.rate_limit, not args.no_signatures, market, args.seed).start()
+    print('Coinbase: ' + simulator.coinbase_url)
+    print('FalconX:  ' + simulator.falconx_url)
+    print('Credentials (api key, secret, passphrase): ' + json.dumps(SIMULATOR_CREDENTIALS))
+    try:
+        while True:
+            time.sleep(60)
+            print(json.dumps(simulator.stats))
+    except KeyboardInterrupt:
+        simulator.stop()
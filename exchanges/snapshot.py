@@ -0,0 +1,169 @@
+###############################################################################
+# FILENAME: snapshot.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Concurrent market data fetch for a bot run. The price quotes
+# and account balances from both exchanges are requested at the same time on
+# a small thread pool, each with its own deadline, and returned together as
+# one snapshot. Requests that miss their deadline (or fail) are left empty and
+# their exchange is marked as missed, so the caller can trade around it.
+###############################################################################
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import config_params
+from exchanges.coinbase import get_coinbase_price_quote, get_single_coinbase_account
+from exchanges.falconx import get_falconx_price_quote, get_single_falconx_account_balance
+
+
+# CONFIG
+DEFAULT_DEADLINE = 5.0    # seconds each request may take before its exchange is marked as missed
+MAX_WORKERS = 8
+
+_executor = None    # created on first use
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=config_params.get('market_data_workers', MAX_WORKERS), thread_name_prefix='market_data')
+    return _executor
+
+
+# SNAPSHOT
+class MarketSnapshot:
+    """ Prices and balances from one concurrent fetch. Fields that missed their deadline are None. """
+
+    def __init__(self, values, venues, missed, errors, timings, started_at, finished_at, received=None):
+        self.values = values    # field -> value
+        self.venues = venues    # field -> exchange name
+        self.missed = missed    # fields with no value
+        self.errors = errors    # field -> exception, for the fields that failed rather than timed out
+        self.timings = timings    # field -> seconds taken, for the fields that completed
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.received = received or {}    # field -> epoch seconds its response arrived, for the fields that completed
+
+    def get(self, field, default=None):
+        value = self.values.get(field)
+        return default if value is None else value
+
+    def received_at(self, field):
+        """ Epoch seconds the field's response arrived, or None if it missed its deadline. """
+        return self.received.get(field)
+
+    @property
+    def missed_venues(self):
+        return {self.venues[field] for field in self.missed}
+
+    def available(self, venue, fields=None):
+        """ True if every field from the exchange (or every one of "fields") arrived in time. """
+        return not any(self.venues[field] == venue and (fields is None or field in fields) for field in self.missed)
+
+    def view(self, fields):
+        """ The snapshot seen through a renaming of its fields ({new name: field}), e.g. one
+        bot's share of a shared snapshot under the usual field names. Returns MarketSnapshot. """
+        return MarketSnapshot(
+            {name: self.values.get(field) for name, field in fields.items()},
+            {name: self.venues[field] for name, field in fields.items()},
+            {name for name, field in fields.items() if field in self.missed},
+            {name: self.errors[field] for name, field in fields.items() if field in self.errors},
+            {name: self.timings[field] for name, field in fields.items() if field in self.timings},
+            self.started_at,
+            self.finished_at,
+            {name: self.received[field] for name, field in fields.items() if field in self.received},
+        )
+
+    @property
+    def coinbase_price(self):
+        return self.values.get('coinbase_price')
+
+    @property
+    def falconx_price(self):
+        quote = self.values.get('falconx_quote')
+        return None if quote is None else quote.price
+
+    @property
+    def falconx_quote_id(self):
+        quote = self.values.get('falconx_quote')
+        return None if quote is None else quote.quote_id
+
+
+# FETCH
+def fetch_market_snapshot(coinbase_connection, falconx_connection, coinbase_usd_account_id, coinbase_btc_account_id, quotes=True, deadline=None, token='BTC'):
+    """ Fetches the Coinbase price, the FalconX rfq and the USD / token balances on both
+    exchanges concurrently (balances only if quotes is False). Returns MarketSnapshot. """
+    fields = market_fields(coinbase_usd_account_id, coinbase_btc_account_id, token, quotes)
+    fetches = market_fetches(coinbase_connection, falconx_connection, fields.values())
+    return fetch_concurrently(fetches, deadline).view(fields)
+
+
+def fetch_shared_snapshot(coinbase_connection, falconx_connection, bots, quotes=True, deadline=None):
+    """ One concurrent fetch for many bots: every distinct quote and balance the bots need is
+    requested once. Returns (MarketSnapshot, {bot name: that bot's view of it}). """
+    fields = {bot.name: market_fields(bot.coinbase_usd_account_id, bot.coinbase_btc_account_id, bot.base_token, quotes) for bot in bots}
+    shared = {field for bot_fields in fields.values() for field in bot_fields.values()}
+    snapshot = fetch_concurrently(market_fetches(coinbase_connection, falconx_connection, sorted(shared)), deadline)
+    return snapshot, {name: snapshot.view(bot_fields) for name, bot_fields in fields.items()}
+
+
+def market_fields(coinbase_usd_account_id, coinbase_btc_account_id, token='BTC', quotes=True):
+    """ The usual snapshot field names mapped to the fetch behind each of them ("kind:argument"). Returns dict. """
+    fields = {}
+    if quotes:
+        fields['coinbase_price'] = 'coinbase_price:' + token
+        fields['falconx_quote'] = 'falconx_quote:' + token
+    fields['coinbase_usd'] = 'coinbase_account:' + coinbase_usd_account_id
+    fields['coinbase_btc'] = 'coinbase_account:' + coinbase_btc_account_id
+    fields['falconx_usd'] = 'falconx_balance:USD'
+    fields['falconx_btc'] = 'falconx_balance:' + token
+    return fields
+
+
+def market_fetches(coinbase_connection, falconx_connection, fields):
+    """ fetch_concurrently() arguments for "kind:argument" fields. Returns dict. """
+    sources = {
+        'coinbase_price': ('Coinbase', get_coinbase_price_quote, coinbase_connection),
+        'falconx_quote': ('FalconX', get_falconx_price_quote, falconx_connection),
+        'coinbase_account': ('Coinbase', get_single_coinbase_account, coinbase_connection),
+        'falconx_balance': ('FalconX', get_single_falconx_account_balance, falconx_connection),
+    }
+    fetches = {}
+    for field in fields:
+        kind, argument = field.split(':', 1)
+        venue, function, connection = sources[kind]
+        fetches[field] = (venue, function, (connection, argument))
+    return fetches
+
+
+def fetch_concurrently(fetches, deadline=None):
+    """ Runs every fetch (field -> (exchange name, function, args)) on the pool and waits for each
+    until "deadline" seconds after the start. Returns MarketSnapshot. """
+    deadline = config_params.get('market_data_deadline', DEFAULT_DEADLINE) if deadline is None else deadline
+    started_at = time.time()
+    start = time.perf_counter()
+    futures = {field: get_executor().submit(_timed, function, *args) for field, (_, function, args) in fetches.items()}
+
+    values = {}
+    missed = set()
+    errors = {}
+    timings = {}
+    received = {}
+    for field, future in futures.items():
+        try:
+            values[field], timings[field], received[field] = future.result(timeout=max(0.0, start + deadline - time.perf_counter()))
+        except Exception as e:    # timed out or failed: leave the field empty, the request is abandoned
+            values[field] = None
+            missed.add(field)
+            if future.done():
+                errors[field] = e
+            print('Market data for ' + field + ' missed its ' + str(deadline) + 's deadline' + (' (' + repr(e) + ')' if future.done() else '') + '.')
+    venues = {field: venue for field, (venue, _, _) in fetches.items()}
+    return MarketSnapshot(values, venues, missed, errors, timings, started_at, time.time(), received)
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    value = function(*args)
+    return value, time.perf_counter() - start, time.time()
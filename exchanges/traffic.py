@@ -0,0 +1,265 @@
+###############################################################################
+# FILENAME: traffic.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Record / replay of the exchange HTTP traffic. With
+# exchange_capture_file set in config.py, every ExchangeClient records each
+# request and response (with its timing, without the auth headers) to an
+# append-only json lines log, and run.py marks where each cycle starts. A
+# plain log is flushed after every line. A gzipped one (file name ending in
+# .gz) gets one gzip member per cycle, so it compresses well and a killed
+# process loses at most the cycle it was in; use a plain log to capture a
+# cycle that hangs. ReplayAdapter mounted on a session
+# answers from such a log instead of the network, either at the recorded
+# timing or as fast as possible (see replay.py).
+#
+# Log lines:
+#   {"mark": "cycle", "t": ..., "price": {...}, "indicator": ..., "history": [rows] or null}
+#   {"t": start epoch, "ms": elapsed, "api": api url, "method": "GET", "path": "oracle",
+#    "req": request body, "status": 200, "body": response body}    ("error" instead of status / body if it failed)
+###############################################################################
+import gzip
+import json
+import time
+import atexit
+import threading
+from collections import deque
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from config import config_params
+
+
+# CAPTURE
+class TrafficLog:
+    """ Append-only, thread safe writer for a traffic log. Plain logs are flushed line by line,
+    gzipped ones a member (cycle) at a time. Closed at exit. """
+
+    def __init__(self, path):
+        self.path = path
+        self.compressed = path.endswith('.gz')
+        self.file = self._open()
+        self.lock = threading.Lock()
+        self.history_written = False    # the first cycle mark carries the history the process started from
+        atexit.register(self.close)
+
+    def _open(self):
+        return gzip.open(self.path, 'at') if self.compressed else open(self.path, 'a')
+
+    def write(self, entry):
+        line = json.dumps(entry, separators=(',', ':'), default=_plain) + '\n'
+        with self.lock:
+            self.file.write(line)
+            if not self.compressed:    # a sync flush per line would undo most of the compression
+                self.file.flush()
+
+    def mark(self, kind, **data):
+        """ Writes a marker line (e.g. the start of a cycle with the inputs the replay needs). A
+        gzipped log first finishes the member holding everything before the mark. """
+        data.update({'mark': kind, 't': time.time()})
+        if self.compressed:
+            with self.lock:
+                self.file.close()
+                self.file = self._open()    # appends a new gzip member
+        self.write(data)
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+
+def _plain(value):
+    """ json fallback for numpy scalars and timestamps in marker data. """
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def get_traffic_log(path=None):
+    """ The process wide log for path (default: config exchange_capture_file), or None when capture is off. """
+    path = path or config_params.get('exchange_capture_file')
+    if not path:
+        return None
+    with _logs_lock:
+        if path not in _logs:
+            _logs[path] = TrafficLog(path)
+        return _logs[path]
+
+
+def mark_cycle(price_df, indicator=None, history_df=None):
+    """ Marks the start of a bot cycle in the capture log with its price row and indicator, and in
+    the first mark of the process, the history it starts from (no-op when capture is off). """
+    log = get_traffic_log()
+    if log is None:
+        return
+    history = None
+    if history_df is not None and not log.history_written:
+        frame = history_df.to_frame() if hasattr(history_df, 'to_frame') else history_df    # BotLog or data frame
+        history = json.loads(frame.to_json(orient='records', double_precision=15))
+        log.history_written = True
+    log.mark('cycle', price=price_df.iloc[-1].to_dict(), indicator=indicator, history=history)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """ HTTPAdapter that also writes every request / response it sends to a TrafficLog. """
+
+    def __init__(self, traffic_log, api_url, **kwargs):
+        self.traffic_log = traffic_log
+        self.api_url = api_url
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        entry = {'t': time.time(), 'api': self.api_url, 'method': request.method, 'path': _relative_path(request.url, self.api_url), 'req': _text(request.body)}
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+            entry['status'] = response.status_code
+            entry['body'] = response.text
+            return response
+        except Exception as e:
+            entry['error'] = repr(e)
+            raise
+        finally:
+            entry['ms'] = round((time.perf_counter() - start) * 1000, 3)
+            self.traffic_log.write(entry)
+
+
+def _relative_path(url, api_url):
+    return url[len(api_url):] if url.startswith(api_url) else url
+
+
+def _text(body):
+    if body is None:
+        return None
+    return body.decode() if isinstance(body, bytes) else body
+
+
+# REPLAY
+class ReplayMiss(requests.ConnectionError):
+    """ The replayed code made a request the log has no response for. """
+
+
+class TrafficReplay:
+    """ A traffic log split into cycles (at its cycle marks). Responses are served per cycle and
+    per (method, path), in recorded order; a request repeated more often than it was recorded
+    gets the last recorded response again, and one never recorded in the cycle gets the latest
+    one from an earlier cycle (ReplayMiss if there is none). """
+
+    def __init__(self, path, timing='fast'):
+        self.path = path
+        self.timing = timing    # 'fast', 'original' or a speed factor (2 = twice as fast as recorded)
+        self.marks = []
+        self.cycles = []    # per cycle: (method, path) -> deque of entries
+        self.last = {}    # (method, path) -> latest entry served or skipped past, across cycles
+        self.cycle = 0
+        self.served = 0
+        self.now = 0.0    # captured time of the replay's position in the log, see clock()
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        opener = gzip.open if self.path.endswith('.gz') else open
+        current = None
+        with opener(self.path, 'rt') as f:
+            try:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:    # a line cut short by a killed writer, the log ends here
+                        break
+                    if entry.get('mark') == 'cycle':
+                        self.marks.append(entry)
+                        current = {}
+                        self.cycles.append(current)
+                    elif 'mark' not in entry and current is not None:    # traffic before the first mark has no cycle inputs
+                        current.setdefault((entry['method'], entry['path']), deque()).append(entry)
+            except (EOFError, gzip.BadGzipFile):    # a gzip member its killed writer never finished, keep what was read
+                pass
+
+    def __len__(self):
+        return len(self.cycles)
+
+    def start_cycle(self, index):
+        with self.lock:
+            if self.cycle < len(self.cycles):    # keep what the last cycle recorded for the fallback
+                for key, entries in self.cycles[self.cycle].items():
+                    if entries:
+                        self.last[key] = entries[-1]
+            self.cycle = index
+            if index < len(self.marks):
+                self.now = max(self.now, self.marks[index]['t'])
+
+    def next_entry(self, method, path):
+        key = (method, path)
+        with self.lock:
+            entries = self.cycles[self.cycle].get(key) if self.cycle < len(self.cycles) else None
+            if entries:
+                entry = entries.popleft() if len(entries) > 1 else entries[0]
+                self.last[key] = entry
+            elif key in self.last:
+                entry = self.last[key]
+            else:
+                raise ReplayMiss('No recorded response for ' + method + ' ' + path + ' in cycle ' + str(self.cycle))
+            self.served = self.served + 1
+            self.now = max(self.now, entry['t'] + entry.get('ms', 0.0) / 1000)
+        return entry
+
+    def clock(self):
+        """ Seconds on the captured timeline (when the last replayed response arrived), so time based
+        caches (e.g. exchanges/balances.py) expire where they did in the capture, whatever the timing. """
+        with self.lock:
+            return self.now
+
+    def delay(self, entry):
+        """ Seconds to wait before answering with entry. """
+        if self.timing == 'fast':
+            return 0.0
+        speed = 1.0 if self.timing == 'original' else float(self.timing)
+        return entry.get('ms', 0.0) / 1000 / speed
+
+    def connections(self, coinbase_url=None, falconx_url=None):
+        """ (Coinbase, FalconX) ExchangeClients answered from the log (no credentials needed). """
+        from exchanges.client import ExchangeClient
+        from exchanges import coinbase, falconx
+        clients = []
+        for name, api_url in (('Coinbase', coinbase_url or coinbase.api_url), ('FalconX', falconx_url or falconx.api_url)):
+            client = ExchangeClient(api_url, name=name)
+            client.session.mount(api_url, ReplayAdapter(self, api_url))    # longest prefix wins over the http(s) adapters
+            clients.append(client)
+        return tuple(clients)
+
+
+class ReplayAdapter(BaseAdapter):
+    """ Transport adapter that answers every request from a TrafficReplay. """
+
+    def __init__(self, replay, api_url):
+        super().__init__()
+        self.replay = replay
+        self.api_url = api_url
+
+    def send(self, request, **kwargs):
+        entry = self.replay.next_entry(request.method, _relative_path(request.url, self.api_url))
+        delay = self.replay.delay(entry)
+        if delay:
+            time.sleep(delay)
+        if 'error' in entry:
+            raise requests.ConnectionError('Replayed failure: ' + entry['error'], request=request)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response._content = entry['body'].encode()
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.reason = 'Replayed'
+        return response
+
+    def close(self):
+        pass
@@ -0,0 +1,139 @@
+###############################################################################
+# FILENAME: multi_bot.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Runs many bots (different pairs, thresholds, bets) in one
+# process. The bots share one pooled client per exchange (so the secrets are
+# fetched once) and one market snapshot per cycle (so each distinct quote and
+# balance is requested once, not once per bot), and they are evaluated
+# concurrently on a thread pool. Each bot keeps its own history store and
+# output files, and its history stays in memory between cycles. The bots
+# trade out of the same exchange accounts, so each one sells only the
+# position it bought and books its profit from its own fills (own_fills).
+#
+# Example bots.json (each entry overrides config.py for one bot):
+#   [
+#     {"name": "btc-40k", "threshold": 40000, "bet": 10000},
+#     {"name": "eth-2k", "coinbase_product_id": "ETH-USD", "coinbase_btc_account_id": "...", "threshold": 2000, "bet": 5000}
+#   ]
+###############################################################################
+import os
+import re
+import json
+import time
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from bot import Bot
+from exchanges.snapshot import fetch_shared_snapshot
+from utils.bot_log import BotLog
+from utils.history_store import HistoryStore
+from utils.metrics import metrics
+from config import config_params
+
+
+# CONFIG
+def load_bot_configs(path, defaults=None):
+    """ Per-bot parameters: config.py (or "defaults") overridden by each entry of the json list at
+    path. Bots without their own history_store_dir, cloud_bucket_path or output_filename get one
+    named after them. Returns list of dicts. """
+    defaults = config_params if defaults is None else defaults
+    with open(path) as f:
+        overrides = json.load(f)
+
+    configs = []
+    for override in overrides:
+        if not override.get('name'):
+            raise ValueError('Every bot in ' + path + ' needs a name.')
+        slug = re.sub('[^0-9A-Za-z_-]+', '_', override['name'])
+        bot_config = dict(defaults)
+        bot_config['history_store_dir'] = os.path.join(defaults['history_store_dir'], slug)
+        bot_config['cloud_bucket_path'] = defaults['cloud_bucket_path'] + slug + '/'
+        bot_config['output_filename'] = slug + '_' + (defaults['output_filename'] or 'output.csv')
+        bot_config.update(override)
+        configs.append(bot_config)
+    return configs
+
+
+# RUNNER
+class MultiBotRunner:
+    """ Cycles a set of bots together. The connections, the storage client and the market
+    snapshot are shared; the histories are not (each bot needs its own history_store_dir,
+    ValueError otherwise). A bot that fails is reported and its history reloaded from its
+    store next cycle, the other bots carry on. """
+
+    def __init__(self, bot_configs, coinbase_connection, falconx_connection, storage_client=None, max_workers=None):
+        self.bots = [Bot(dict(bot_config, own_fills=True)) for bot_config in bot_configs]    # the accounts are shared, balances say nothing about one bot
+        names = [bot.name for bot in self.bots]
+        directories = [os.path.abspath(bot.history_store_dir) for bot in self.bots]
+        if len(set(names)) != len(names):
+            raise ValueError('Bot names must be unique.')
+        if len(set(directories)) != len(directories):
+            raise ValueError('Every bot needs its own history_store_dir.')
+
+        self.coinbase_connection = coinbase_connection
+        self.falconx_connection = falconx_connection
+        self.storage_client = storage_client
+        self.max_workers = max_workers or config_params.get('multi_bot_workers', 16)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bot')
+        self.stores = {bot.name: HistoryStore(bot.history_store_dir) for bot in self.bots}
+        self.logs = {}    # bot name -> BotLog, loaded on first use and kept between cycles
+        self.lock = threading.Lock()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def run_cycle(self, price_dfs):
+        """ One cycle of every bot. price_dfs maps each product id (e.g. BTC-USD) to its latest
+        price data frame. Returns dict of bot name -> None, or the exception the bot raised. """
+        start = time.perf_counter()
+        price_observed_at = time.time()    # the price data was handed in just now, see utils/tracing.py
+        print('Fetching shared market data for ' + str(len(self.bots)) + ' bots... [' + str(datetime.datetime.utcnow()) + ']')
+        with metrics.span('bot_stage', bot='shared', stage='market_data'):
+            snapshot, views = fetch_shared_snapshot(self.coinbase_connection, self.falconx_connection, self.bots)
+        print('Shared market data: ' + str(len(snapshot.values)) + ' requests in ' + str(round(snapshot.finished_at - snapshot.started_at, 3)) + 's')
+
+        futures = {bot.name: self.executor.submit(self.run_bot, bot, price_dfs[bot.coinbase_product_id], views[bot.name], price_observed_at) for bot in self.bots}
+        results = {}
+        for name, future in futures.items():
+            try:
+                future.result()
+                results[name] = None
+            except Exception as e:    # one bot failing does not stop the others
+                print('Bot ' + name + ' failed this cycle: ' + repr(e))
+                with self.lock:
+                    self.logs.pop(name, None)    # its log may hold a half written row, reload it from the store
+                results[name] = e
+        failed = sum(result is not None for result in results.values())
+        print('Cycle of ' + str(len(self.bots)) + ' bots finished in ' + str(round(time.perf_counter() - start, 3)) + 's (' + str(failed) + ' failed).')
+        metrics.write_snapshot()
+        return results
+
+    def run_bot(self, bot, price_df, snapshot, price_observed_at=None):
+        """ apply_strategy, execute_trades, evaluate_performance and output_results for one bot. """
+        with metrics.span('bot_stage', bot=bot.name, stage='load_data'):
+            log = self._log(bot)
+        with metrics.span('bot_stage', bot=bot.name, stage='strategy'):
+            log = bot.apply_strategy(log, price_df, price_observed_at=price_observed_at)
+        with metrics.span('bot_stage', bot=bot.name, stage='trades'):
+            log = bot.execute_trades(log, self.coinbase_connection, self.falconx_connection, bot, snapshot=snapshot)
+        with metrics.span('bot_stage', bot=bot.name, stage='performance'):
+            log = bot.evaluate_performance(log, new_rows=1, check=bot.check_incremental_performance)
+        with metrics.span('bot_stage', bot=bot.name, stage='output'):
+            bot.output_results(log, self.storage_client, self.stores[bot.name])
+        bot.record_metrics(log)
+        return log
+
+    def _log(self, bot):
+        with self.lock:
+            log = self.logs.get(bot.name)
+        if log is None:
+            store = self.stores[bot.name]
+            if config_params['in_production'] and not len(store):    # first run on this machine, fetch the store from the cloud
+                store.download(self.storage_client.bucket(bot.cloud_bucket_name), bot.cloud_bucket_path)
+            log = BotLog.from_frame(store.read_tail(bot.history_tail_rows))
+            with self.lock:
+                self.logs[bot.name] = log
+        return log
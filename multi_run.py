@@ -0,0 +1,66 @@
+###############################################################################
+# FILENAME: multi_run.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT: 
+# DATE: 18-Oct-2026
+# DESCRIPTION: Runfile that runs every bot listed in the multi_bot_configs
+# file in one process (see multi_bot.py) at the user-defined frequency.
+###############################################################################
+import os
+import sys
+import time
+import datetime
+import schedule
+
+from exchanges.credentials import get_credential_provider
+from multi_bot import MultiBotRunner, load_bot_configs
+from utils.lazy import lazy_import
+from utils.metrics import start_exporters
+from config import config_params
+
+pd = lazy_import('pandas')
+coinbase = lazy_import('exchanges.coinbase')
+falconx = lazy_import('exchanges.falconx')
+
+
+# AUTHENTICATE 
+if config_params['in_production']:
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"]=""    # FIXME: add your credentials here
+
+
+# FUNCTIONS
+def alive(runner):
+    print('EOC Limit Order Bot Template - ' + config_params['version'] + ' is running ' + str(len(runner.bots)) + ' bots... [' + str(datetime.datetime.utcnow()) + ']')
+
+
+def run(runner):
+    print('Beginning multi bot run... [' + str(datetime.datetime.utcnow()) + ']')
+    products = sorted({bot.coinbase_product_id for bot in runner.bots})
+    price_dfs = {product: pd.read_csv('') for product in products}    # FIXME: add price data feed per product
+    runner.run_cycle(price_dfs)
+
+
+# ENTRY POINT
+bot_configs = load_bot_configs(sys.argv[1] if len(sys.argv) > 1 else config_params['multi_bot_configs'])
+workers = config_params['multi_bot_workers']
+start_exporters()    # metrics port / json lines file, when set in config.py
+storage_client = None
+if config_params['in_production']:
+    from google.cloud import storage
+    storage_client = storage.Client()
+    get_credential_provider().prefetch(coinbase.SECRET_NAMES + falconx.SECRET_NAMES)
+runner = MultiBotRunner(
+    bot_configs,
+    coinbase.get_coinbase_connection(pool_size=workers),    # one pool per exchange, big enough for every worker
+    falconx.get_falconx_connection(pool_size=workers),
+    storage_client,
+    workers
+)
+if config_params['in_production']:
+    schedule.every(1).minutes.do(alive, runner=runner)    
+    schedule.every().hour.at(":01").do(run, runner=runner)  
+    while True:
+        schedule.run_pending()
+        time.sleep(1)
+else:
+    run(runner)
@@ -0,0 +1,141 @@
+###############################################################################
+# FILENAME: replay.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE: 18-Oct-2026
+# DESCRIPTION: Replays exchange traffic captured by run.py (run.py --capture
+# FILE, or exchange_capture_file in config.py) through apply_strategy,
+# execute_trades and evaluate_performance, with the exchanges answered from
+# the capture instead of the network (see exchanges/traffic.py). Each cycle
+# gets the price row and indicator it was recorded with, and the history the
+# capturing process started from, so replays of one capture are
+# deterministic and two code versions can be compared on the same market.
+# Timing "fast" answers at once, "original" waits the recorded latency and a
+# number replays that many times faster. Nothing is sent anywhere and the
+# bot history store is not touched.
+#
+# Known difference: the Coinbase fee lookup matches ledger entries against
+# the current hour, so replayed Coinbase trades report no fees unless the
+# replay runs within the hour they were captured in.
+#
+# Usage: python replay.py capture.jsonl.gz [--timing fast|original|4]
+#            [--output replay.json] [--compare replay_before.json]
+###############################################################################
+import io
+import json
+import time
+import argparse
+import contextlib
+
+import pandas as pd
+
+from bot import Bot
+from exchanges.traffic import TrafficReplay
+from exchanges.balances import balance_cache
+from utils.bot_log import BotLog
+from utils.history_store import HistoryStore
+from config import config_params
+
+
+# CONFIG
+COMPARE_COLUMNS = ['trade_status', 'exchange_selected', 'capital_risked', 'coinbase_usd', 'falconx_usd', 'net_profit', 'running_net_profit']
+
+
+# FUNCTIONS
+def replay(bot, traffic_replay, history_df=None, quiet=True):
+    """ Runs every captured cycle. history_df is the history to start from when the capture
+    has none. Returns (data frame of the rows the replay added, list of per cycle seconds). """
+    coinbase_connection, falconx_connection = traffic_replay.connections()    # answered by replay adapters, so orders go to the replay
+    clock = balance_cache.clock
+    balance_cache.invalidate()
+    balance_cache.clock = traffic_replay.clock    # cached balances expire where they did in the capture
+    try:
+        return _replay_cycles(bot, traffic_replay, coinbase_connection, falconx_connection, history_df, quiet)
+    finally:
+        balance_cache.invalidate()    # the entries are stamped on the replay's clock
+        balance_cache.clock = clock
+
+
+def _replay_cycles(bot, traffic_replay, coinbase_connection, falconx_connection, history_df, quiet):
+    log = None if history_df is None else BotLog.from_frame(history_df)
+    start_row = 0 if log is None else len(log)
+    timings = []
+    for index, mark in enumerate(traffic_replay.marks):
+        if mark.get('history') is not None:    # a capturing process (re)started here, from this history
+            log = BotLog.from_frame(pd.DataFrame(mark['history']))
+            if index == 0:
+                start_row = len(log)
+        if log is None:
+            raise ValueError('The capture has no starting history, pass one with --history.')
+
+        traffic_replay.start_cycle(index)
+        price_df = pd.DataFrame([mark['price']])
+        cycle_start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            log = bot.apply_strategy(log, price_df, mark.get('indicator'))
+            log = bot.execute_trades(log, coinbase_connection, falconx_connection, bot)
+            log = bot.evaluate_performance(log, new_rows=1)
+        timings.append(time.perf_counter() - cycle_start)
+    if log is None:
+        return pd.DataFrame(), timings
+    return log.to_frame(start_row), timings
+
+
+def compare(results_df, baseline_path):
+    """ Prints the cycles whose outcome differs from an earlier replay's output. Returns the number of differing cycles. """
+    with open(baseline_path) as f:
+        baseline_rows = json.load(f)['rows']
+    rows = _records(results_df)    # same encoding as the baseline (nan as None)
+    if len(baseline_rows) != len(rows):
+        print('Baseline has ' + str(len(baseline_rows)) + ' cycles, this replay ' + str(len(rows)) + '.')
+    differing = 0
+    for cycle, (row, baseline_row) in enumerate(zip(rows, baseline_rows)):
+        changes = {col_name: (baseline_row.get(col_name), row.get(col_name)) for col_name in COMPARE_COLUMNS if not _same(row.get(col_name), baseline_row.get(col_name))}
+        if changes:
+            differing = differing + 1
+            print('Cycle ' + str(cycle) + ': ' + ', '.join(col_name + ' ' + str(before) + ' -> ' + str(after) for col_name, (before, after) in changes.items()))
+    print(str(differing) + ' of ' + str(len(rows)) + ' cycles differ from ' + baseline_path)
+    return differing
+
+
+def _records(df):
+    return json.loads(df.to_json(orient='records', double_precision=15))
+
+
+def _same(a, b):
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return abs(a - b) <= 1e-9 * max(1.0, abs(a), abs(b))
+    return a == b
+
+
+# ENTRY POINT
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay captured exchange traffic through the bot')
+    parser.add_argument('capture', help='traffic log written by run.py --capture')
+    parser.add_argument('--timing', default='fast', help="'fast', 'original' or a speed factor (e.g. 4)")
+    parser.add_argument('--history', help='history csv to start from if the capture has none (default: the bot history store)')
+    parser.add_argument('--output', help='write the replayed rows and timings to this json file')
+    parser.add_argument('--compare', help='compare the outcome with an earlier --output file')
+    parser.add_argument('--verbose', action='store_true', help='print the bot output of every cycle')
+    args = parser.parse_args()
+
+    bot = Bot(config_params)
+    traffic_replay = TrafficReplay(args.capture, args.timing)
+    print('Replaying ' + str(len(traffic_replay)) + ' cycles from ' + args.capture + ' (timing: ' + str(args.timing) + ')...')
+    history_df = None
+    if not traffic_replay.marks or traffic_replay.marks[0].get('history') is None:
+        history_df = pd.read_csv(args.history) if args.history else HistoryStore(bot.history_store_dir).read_tail(bot.history_tail_rows)
+
+    start = time.perf_counter()
+    results_df, timings = replay(bot, traffic_replay, history_df, quiet=not args.verbose)
+    total = time.perf_counter() - start
+    print(str(len(timings)) + ' cycles, ' + str(traffic_replay.served) + ' responses replayed in ' + str(round(total, 3)) + 's (' + str(round(total / max(1, len(timings)) * 1000, 2)) + ' ms per cycle)')
+    if len(results_df):
+        print(results_df['trade_status'].value_counts().to_dict())
+        print('Running net profit: ' + str(results_df['running_net_profit'].iloc[-1]))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'capture': args.capture, 'timing': args.timing, 'cycle_seconds': timings, 'rows': _records(results_df)}, f)
+    if args.compare:
+        compare(results_df, args.compare)
@@ -8,20 +8,38 @@
 # DESCRIPTION: Runfile that instantiates a limit-order type CEFI trading bot
 # and executes it at the user-defined frequency.
 ###############################################################################
-import os
+import sys
 import time
+PROCESS_START = time.perf_counter()
+if '--profile-startup' in sys.argv:    # start timing imports before anything heavy is loaded
+    from utils.startup_profile import ImportProfiler
+    import_profiler = ImportProfiler().install()
+
+import os
+import atexit
+import argparse
 import datetime
-import requests
 import schedule
-import pandas as pd
-import numpy as np
-from google.cloud import storage
 
-from exchanges.coinbase import get_coinbase_connection
-from exchanges.falconx import get_falconx_connection
+from exchanges.credentials import get_credential_provider
+from exchanges.price_feed import WebsocketPriceFeed, LocalPriceFeed
 from bot import Bot
+from utils.history_store import HistoryStore
+from utils.bot_log import BotLog
+from utils.lazy import lazy_import
+from utils.trigger import ThresholdTrigger, latency_report
+from utils.order_book import SyntheticOrderBook
+from utils.metrics import metrics, start_exporters
+from utils import tracing
 from config import config_params
 
+pd = lazy_import('pandas')    # heavy modules load on first use, not at process start
+coinbase = lazy_import('exchanges.coinbase')
+falconx = lazy_import('exchanges.falconx')
+traffic = lazy_import('exchanges.traffic')
+
+_connections = {}    # exchange name -> pooled client, created once and reused by every cycle and tick
+
 
 # AUTHENTICATE 
 if config_params['in_production']:
@@ -33,61 +51,248 @@ def alive():
     print('EOC Limit Order Bot Template (a.k.a. the "auto ape") - ' + config_params['version'] + ' is busy printing money... [' + str(datetime.datetime.utcnow()) + ']')
 
 
-def run(bot):
+def get_connections():
+    """ Returns the (Coinbase, FalconX) clients, created on first use and closed when the process exits. """
+    if not _connections:
+        _connections['Coinbase'] = coinbase.get_coinbase_connection()
+        _connections['FalconX'] = falconx.get_falconx_connection()
+        atexit.register(close_connections)
+    return _connections['Coinbase'], _connections['FalconX']
+
+
+def close_connections():
+    for connection in _connections.values():
+        connection.close()
+    _connections.clear()
+
+
+def run(bot, price_df=None, indicator=None, event=None, connections=None):
+    """ One cycle: load the history, apply the strategy, trade, evaluate and output. connections
+    is a (Coinbase, FalconX) pair to use instead of the process's own (e.g. the local simulator's).
+    Returns the bot log with the new row. """
     print(bot.name + ' ' + bot.version)
     print('Beginning run... [' + str(datetime.datetime.utcnow()) + ']')
 
     # Connect exchanges
     print('Connecting exchanges... [' + str(datetime.datetime.utcnow()) + ']')
-    coinbase_connection = get_coinbase_connection()
-    falconx_connection = get_falconx_connection()
+    with metrics.span('bot_stage', bot=bot.name, stage='connect'):    # each stage is timed, see utils/metrics.py
+        coinbase_connection, falconx_connection = connections or get_connections()
 
     # Connect data and model file(s)
     print('Connecting data... [' + str(datetime.datetime.utcnow()) + ']')
-    price_df = pd.read_csv('')    # FIXME: add price data feed
-    history_df = pd.read_csv('')    # FIXME: add historical bot log file
+    with metrics.span('bot_stage', bot=bot.name, stage='load_data'):
+        if price_df is None:
+            price_df = pd.read_csv('')    # FIXME: add price data feed
+        price_observed_at = time.time() if event is None else tracing.wall_time(event.tick.received_at)    # start of the tick to trade trace
+        storage_client = None
+        if config_params['in_production']:
+            from google.cloud import storage    # only needed to talk to cloud storage
+            storage_client = storage.Client()
+        history_store = HistoryStore(bot.history_store_dir)
+        if config_params['in_production'] and not len(history_store):    # first run on this machine, fetch the store from the cloud
+            history_store.download(storage_client.bucket(bot.cloud_bucket_name), bot.cloud_bucket_path)
+        history_df = BotLog.from_frame(history_store.read_tail(bot.history_tail_rows))    # only the recent rows the strategy reads, as a typed column store
+        traffic.mark_cycle(price_df, indicator, history_df)    # cycle inputs for replay.py, when the exchange traffic is being captured
 
    # Apply strategy
     print('Applying strategy... [' + str(datetime.datetime.utcnow()) + ']')
-    strategy_result_df = bot.apply_strategy(
-        history_df,
-        price_df,
-    )
+    with metrics.span('bot_stage', bot=bot.name, stage='strategy'):
+        strategy_result_df = bot.apply_strategy(
+            history_df,
+            price_df,
+            indicator,
+            price_observed_at
+        )
+    if event is not None:
+        event.strategy_done_at = time.perf_counter()
 
     # Execute trades
     print('Executing trades... [' + str(datetime.datetime.utcnow()) + ']')
-    execute_trades_result_df = bot.execute_trades(
-        strategy_result_df,
-        coinbase_connection,
-        falconx_connection,
-        bot
-    )
+    with metrics.span('bot_stage', bot=bot.name, stage='trades'):
+        execute_trades_result_df = bot.execute_trades(
+            strategy_result_df,
+            coinbase_connection,
+            falconx_connection,
+            bot
+        )
+    if event is not None:
+        event.order_done_at = time.perf_counter()
 
     # Evaluate performance
     print('Evaluating performance... [' + str(datetime.datetime.utcnow()) + ']')
-    evaluate_performance_result_df = bot.evaluate_performance(
-        execute_trades_result_df
-    )
+    with metrics.span('bot_stage', bot=bot.name, stage='performance'):
+        evaluate_performance_result_df = bot.evaluate_performance(
+            execute_trades_result_df,
+            new_rows=1,    # only the row appended this run
+            check=bot.check_incremental_performance
+        )
 
 
     # Output results
     print('Outputting results... [' + str(datetime.datetime.utcnow()) + ']')
-    storage_client = storage.Client()
-    bot.output_results(
-        evaluate_performance_result_df,
-        storage_client
-    )
+    with metrics.span('bot_stage', bot=bot.name, stage='output'):
+        bot.output_results(
+            evaluate_performance_result_df,
+            storage_client,
+            history_store
+        )
+    bot.record_metrics(evaluate_performance_result_df)
+    metrics.write_snapshot()    # counters and gauges to the json lines file, if one is set
     print(bot.name + ' ' + bot.version + ' run complete.')
+    return evaluate_performance_result_df
+
+
+def run_event_driven(bot, feed, book=None):
+    """ Runs the bot the moment the streaming price crosses its threshold (after hysteresis and
+    debouncing, see utils/trigger.py) instead of on the hourly schedule. A run that fails or
+    does not leave the bot in the zone's trade status (e.g. a buy with no quote in time) is
+    retried every trigger_retry_interval seconds while the price stays in the zone. With a
+    synthetic order book, every tick also fills the resting orders it triggers. """
+    trigger = ThresholdTrigger(bot.threshold, bot.trigger_hysteresis, bot.trigger_debounce)
+    fill_store = HistoryStore(bot.synthetic_fill_store_dir) if book is not None else None
+    events = []
+    retry_at = None    # perf_counter() reading of the next retry, None while the last run settled
+    print('Waiting for threshold crossings at ' + str(bot.threshold) + ' USD... [' + str(datetime.datetime.utcnow()) + ']')
+    try:
+        for tick in feed:
+            schedule.run_pending()    # keep the alive heartbeat going between runs
+            if book is not None:
+                fill_synthetic_orders(bot, book, tick, fill_store)
+            event = trigger.update(tick)
+            if event is None and retry_at is not None and time.perf_counter() >= retry_at:
+                event = trigger.retry(tick)
+            if event is None:
+                continue
+            print('Trigger fired: ' + str(event.price) + ' USD is ' + event.zone + ' the threshold (was ' + str(event.previous_zone) + ')')
+            try:
+                log = run(bot, price_df=tick.price_frame(), indicator=event.price, event=event)
+                trade_status = log.last('trade_status')
+            except Exception as e:    # e.g. an exchange outage, the next tick still gets through
+                print('Run failed: ' + repr(e))
+                trade_status = None
+            events.append(event)
+            if trigger.settled(trade_status):
+                retry_at = None
+                print('Trigger to order: ' + str(round(event.latency()['trigger_to_order'] * 1000, 1)) + ' ms')
+            else:
+                retry_at = time.perf_counter() + bot.trigger_retry_interval
+                print('Run ended on ' + str(trade_status) + ' while ' + event.zone + ' the threshold, retrying in ' + str(bot.trigger_retry_interval) + ' s')
+    except KeyboardInterrupt:
+        pass
+    finally:
+        feed.close()
+        latency_report(events)
+    return events
+
+
+def fill_synthetic_orders(bot, book, tick, fill_store=None):
+    triggered = book.on_tick(tick.price)
+    if not triggered:
+        return
+    print('Price ' + str(tick.price) + ' USD triggered ' + str(len(triggered)) + ' synthetic order(s)... [' + str(datetime.datetime.utcnow()) + ']')
+    try:
+        coinbase_connection, falconx_connection = get_connections()
+        fills = bot.execute_synthetic_orders(triggered, coinbase_connection, falconx_connection, tracing.wall_time(tick.received_at), tick.timestamp)
+    except Exception as e:    # no fill came back, every order goes back in the book
+        print('Synthetic orders failed: ' + repr(e))
+        fills = [{'order_id': order.order_id, 'status': 'Failed'} for order in triggered]
+    for order, fill in zip(triggered, fills):
+        if fill['status'] == 'Filled':
+            book.complete(order.order_id)
+        else:    # skipped or failed: back in the book with its time priority, retried on the next tick that triggers it
+            book.restore(order.order_id)
+    if fill_store is not None:    # one row per fill with its trace, for utils/tracing.py report
+        fill_store.append(pd.DataFrame([dict(order.to_dict(), status=fill['status'], exchange_selected=fill.get('exchange_selected') or 'None', **fill['trace']) for order, fill in zip(triggered, fills) if 'trace' in fill]))
+    print('Tick to synthetic fills: ' + str(round((time.perf_counter() - tick.received_at) * 1000, 1)) + ' ms (' + str(len(book)) + ' order(s) resting)')
+
+
+def profile_startup(bot, baseline_path, record, simulate=False):
+    """ Runs one cycle and reports import time, time to first cycle and the slowest imports.
+    With simulate, the cycle trades against the local exchange simulator (see simulated_cycle),
+    so it completes without credentials or a price feed. A baseline is only recorded from a
+    cycle that completed. """
+    from utils.startup_profile import report
+    price_df, connections, simulator = None, None, None
+    if simulate:
+        bot, price_df, simulator = simulated_cycle(bot)
+        connections = simulator.connections()
+    cycle_start = time.perf_counter()
+    try:
+        run(bot, price_df=price_df, connections=connections)
+        completed = True
+    except Exception as e:    # still report the startup cost when the cycle itself fails
+        print('First cycle failed: ' + repr(e))
+        completed = False
+    cycle_end = time.perf_counter()
+    import_profiler.uninstall()
+    if simulator is not None:
+        simulator.stop()
+    if record and not completed:
+        print('Not recording a baseline from a cycle that failed (try --simulator).')
+        record = False
+    report(import_profiler, cycle_start - PROCESS_START, cycle_end - cycle_start if completed else None, baseline_path, record)
+    return completed
+
+
+def simulated_cycle(bot):
+    """ Inputs for a cycle that completes offline: a copy of the bot on the local exchange
+    simulator's accounts, with a one row history (just below the threshold, so the cycle buys)
+    in a temporary store, and a one row price frame. Returns (bot, price_df, simulator). """
+    import tempfile
+    from exchanges.simulator import ExchangeSimulator, SimulatedMarket, point_exchanges_at
+    simulator = ExchangeSimulator(market=SimulatedMarket(prices={bot.base_token: float(bot.threshold)}, seed=1), seed=1).start()
+    point_exchanges_at(simulator)
+    bot = Bot(dict(vars(bot), history_store_dir=tempfile.mkdtemp(prefix='startup_profile_'), coinbase_usd_account_id='usd', coinbase_btc_account_id='btc'))
+    price = float(bot.threshold) - 1.0
+    price_df = pd.DataFrame([{'time': 0, 'l': price, 'h': price, 'o': price, 'c': price, 'v': 1.0}])
+    history_df = price_df.copy()
+    history_df['trade_status'] = 'No Action'
+    history_df['exchange_selected'] = 'None'
+    history_df['position_exchange'] = 'None'
+    history_df['coinbase_usd'] = history_df['falconx_usd'] = 100000.0    # the simulated accounts
+    HistoryStore(bot.history_store_dir).append(history_df)
+    return bot, price_df, simulator
 
 
 # ENTRY POINT
-bot = Bot(config_params)
-if config_params['in_production']:
-    schedule.every(1).minutes.do(alive)    
-    schedule.every().hour.at(":01").do(run, bot=bot)  
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
-else:
-    run(bot)
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='EOC Limit Order Bot Template')
+    parser.add_argument('--profile-startup', action='store_true', help='run one cycle and report the cold start profile')
+    parser.add_argument('--startup-baseline', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_baseline.json'), help='startup profile baseline to compare against')
+    parser.add_argument('--record-baseline', action='store_true', help='record the startup profile as the new baseline')
+    parser.add_argument('--simulator', action='store_true', help='with --profile-startup, run the cycle against the local exchange simulator (how the baseline is recorded)')
+    parser.add_argument('--event-driven', action='store_true', help='run on threshold crossings from the streaming price feed instead of hourly')
+    parser.add_argument('--local-feed', help='with --event-driven, replay prices from this file (one per line) instead of the websocket feed')
+    parser.add_argument('--order-book', help='with --event-driven, also fill the resting synthetic orders saved in this file (see utils/order_book.py)')
+    parser.add_argument('--feed-interval', type=float, default=1.0, help='seconds between --local-feed ticks')
+    parser.add_argument('--capture', help='record the exchange traffic to this file for replay.py (overrides exchange_capture_file)')
+    args = parser.parse_args()
+    if args.capture:
+        config_params['exchange_capture_file'] = args.capture
 
+    bot = Bot(config_params)
+    start_exporters()    # metrics port / json lines file, when set in config.py
+    if args.profile_startup:
+        profile_startup(bot, args.startup_baseline, args.record_baseline, args.simulator)
+    elif args.event_driven:
+        if args.local_feed:
+            with open(args.local_feed) as f:
+                feed = LocalPriceFeed([line for line in f.read().split() if line], args.feed_interval)
+        else:
+            feed = WebsocketPriceFeed()
+        if config_params['in_production']:
+            get_credential_provider().prefetch(coinbase.SECRET_NAMES + falconx.SECRET_NAMES)
+            schedule.every(1).minutes.do(alive)
+        book = SyntheticOrderBook(args.order_book) if args.order_book else None
+        if book is not None and book.pending():
+            print('Synthetic order(s) ' + ', '.join(order.order_id for order in book.pending()) + ' were in flight when the last run stopped: check them on the venues, then complete or restore them.')
+        run_event_driven(bot, feed, book)
+    elif config_params['in_production']:
+        get_credential_provider().prefetch(coinbase.SECRET_NAMES + falconx.SECRET_NAMES)    # all exchange secrets at once, before the first run
+        schedule.every(1).minutes.do(alive)    
+        schedule.every().hour.at(":01").do(run, bot=bot)  
+        while True:
+            schedule.run_pending()
+            time.sleep(1)
+    else:
+        run(bot)
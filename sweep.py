@@ -0,0 +1,175 @@
+###############################################################################
+# FILENAME: sweep.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE: 18-Oct-2026
+# DESCRIPTION: Parameter sweep for the Bot strategy. Backtests every
+# combination of a grid of strategy parameters (threshold, bet, fee
+# estimates...) across a process pool and ranks the results. The price
+# history is put in shared memory once instead of being pickled per task,
+# and finished results are checkpointed so an interrupted sweep resumes
+# (checkpoint rows carry a fingerprint of the price data they were run on,
+# and a row is only reused when the same prices and the same simulate()
+# arguments, defaults included, would be run again).
+#
+# Usage: python sweep.py prices.csv --thresholds 30000 35000 40000 --bets 1000 10000 --checkpoint sweep.jsonl
+###############################################################################
+import os
+import json
+import hashlib
+import inspect
+import argparse
+import itertools
+import multiprocessing
+from multiprocessing import shared_memory
+import pandas as pd
+import numpy as np
+
+from backtest import simulate
+
+
+PRICE_ARRAYS = ['close', 'coinbase_price', 'falconx_price']    # rows of the shared price block
+SIMULATE_DEFAULTS = {    # simulate() keyword -> default, for the arguments a grid can set
+    name: parameter.default for name, parameter in inspect.signature(simulate).parameters.items()
+    if name not in PRICE_ARRAYS
+}
+
+_worker = {}    # per worker process: shared memory handle and price views
+
+
+# WORKER
+def _attach(shm_name, shape):
+    """ Pool initializer. Maps the shared price block into this process without copying it. """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    prices = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _worker['shm'] = shm    # keep the mapping alive for the life of the worker
+    _worker['prices'] = dict(zip(PRICE_ARRAYS, prices))
+
+
+def _evaluate(params):
+    """ Backtests one parameter combination and returns its summary metrics. """
+    prices = _worker['prices']
+    result = simulate(prices['close'], coinbase_price=prices['coinbase_price'], falconx_price=prices['falconx_price'], **params)
+    return dict(params, **summarize(result))
+
+
+def summarize(result):
+    """ Summary metrics of a simulate() result. """
+    running_net_profit = result['running_net_profit']
+    drawdown = np.maximum.accumulate(np.maximum(running_net_profit, 0.0)) - running_net_profit    # from the best equity seen so far
+    final_raroi = result['running_raroi'][-1] if len(running_net_profit) else np.nan
+    return {
+        'raroi': float(final_raroi) if np.isfinite(final_raroi) else 0.0,
+        'net_profit': float(running_net_profit[-1]) if len(running_net_profit) else 0.0,
+        'capital_risked': float(result['running_capital_risked'][-1]) if len(running_net_profit) else 0.0,
+        'trades': int((result['capital_risked'] > 0).sum()),
+        'wins': int((result['fee_win_loss'] == 1).sum()),
+        'losses': int((result['fee_win_loss'] == -1).sum()),
+        'nofee_wins': int((result['nofee_win_loss'] == 1).sum()),
+        'max_drawdown': float(drawdown.max()) if len(drawdown) else 0.0,
+    }
+
+
+# SWEEP
+def run_sweep(price_df, grid, close_label='c', coinbase_label=None, falconx_label=None, processes=None, checkpoint_path=None):
+    """ Backtests every combination in "grid" (a dict of simulate() keyword -> list of
+    values, e.g. {'threshold': [...], 'bet': [...]}) and returns a data frame ranked by
+    raroi. If checkpoint_path is given, each finished combination is appended to it as a
+    JSON line and combinations already in the file for the same price data are not run again. """
+
+    names = list(grid)
+    combinations = [dict(zip(names, values)) for values in itertools.product(*[[_plain(v) for v in grid[name]] for name in names])]
+    close = price_df[close_label].to_numpy(dtype=np.float64)
+    prices = np.stack([
+        close,
+        close if coinbase_label is None else price_df[coinbase_label].to_numpy(dtype=np.float64),
+        close if falconx_label is None else price_df[falconx_label].to_numpy(dtype=np.float64),
+    ])
+    data_fingerprint = fingerprint(prices, [close_label, coinbase_label, falconx_label])
+
+    results = []
+    done = set()
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        wanted = {_key(params): params for params in combinations}
+        with open(checkpoint_path) as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    key = _key(row)
+                    if row.get('fingerprint') == data_fingerprint and key in wanted and key not in done:    # other arguments and other price data are left alone
+                        results.append(dict(wanted[key], **{k: v for k, v in row.items() if k not in SIMULATE_DEFAULTS}))    # with this grid's columns, not the grid it was run in
+                        done.add(key)
+    pending = [params for params in combinations if _key(params) not in done]
+    print('Sweeping ' + str(len(pending)) + ' of ' + str(len(combinations)) + ' parameter combinations (' + str(len(done)) + ' already checkpointed)...')
+
+    if pending:
+        shm = shared_memory.SharedMemory(create=True, size=prices.nbytes)
+        try:
+            np.ndarray(prices.shape, dtype=np.float64, buffer=shm.buf)[:] = prices    # copy the history in once
+            checkpoint = open(checkpoint_path, 'a') if checkpoint_path else None
+            try:
+                with multiprocessing.Pool(processes or os.cpu_count(), initializer=_attach, initargs=(shm.name, prices.shape)) as pool:
+                    chunksize = max(1, len(pending) // ((processes or os.cpu_count()) * 4))
+                    for row in pool.imap_unordered(_evaluate, pending, chunksize=chunksize):
+                        row['fingerprint'] = data_fingerprint
+                        results.append(row)
+                        if checkpoint:
+                            checkpoint.write(json.dumps(row) + '\n')
+                            checkpoint.flush()
+            finally:
+                if checkpoint:
+                    checkpoint.close()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    ranked_df = pd.DataFrame(results)
+    if ranked_df.empty:
+        return ranked_df
+    return ranked_df.drop(columns='fingerprint').sort_values(['raroi', 'net_profit'], ascending=False).reset_index(drop=True)
+
+
+def fingerprint(prices, labels):
+    """ Short hash of the price block and the column labels it came from, stored with each checkpoint row. """
+    digest = hashlib.sha256(np.ascontiguousarray(prices).tobytes())
+    digest.update(json.dumps(labels).encode())
+    return digest.hexdigest()[:16]
+
+
+def _key(params):
+    """ Every simulate() argument of a grid combination or checkpoint row, with the defaults
+    filled in for the ones it does not set, so rows from a grid with other dimensions only
+    match when they ran the same backtest. """
+    arguments = dict(SIMULATE_DEFAULTS)
+    arguments.update({k: v for k, v in params.items() if k in SIMULATE_DEFAULTS})
+    return tuple(sorted(arguments.items()))
+
+
+def _plain(value):
+    """ numpy scalars -> python scalars, so parameters round trip through the json checkpoint. """
+    return value.item() if isinstance(value, np.generic) else value
+
+
+# ENTRY POINT
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sweep threshold / bet for the Bot strategy over a price history.')
+    parser.add_argument('prices', help='csv file with the price history')
+    parser.add_argument('--close-label', default='c')
+    parser.add_argument('--thresholds', nargs='+', type=float, required=True)
+    parser.add_argument('--bets', nargs='+', type=float, required=True)
+    parser.add_argument('--coinbase-fee-estimates', nargs='+', type=float, default=[0.0])
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--checkpoint', default=None, help='json lines file used to resume an interrupted sweep')
+    parser.add_argument('--output', default=None, help='write the ranked table to this csv file')
+    args = parser.parse_args()
+
+    ranked_df = run_sweep(
+        pd.read_csv(args.prices),
+        {'threshold': args.thresholds, 'bet': args.bets, 'coinbase_fee_estimate': args.coinbase_fee_estimates},
+        close_label=args.close_label,
+        processes=args.processes,
+        checkpoint_path=args.checkpoint,
+    )
+    print(ranked_df.head(20))
+    if args.output:
+        ranked_df.to_csv(args.output, index=False)
@@ -0,0 +1,90 @@
+###############################################################################
+# FILENAME: conftest.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Shared fixtures for the behaviour tests: synthetic price data,
+# a one row starting history, bot parameters for the simulated accounts and
+# the local exchange simulator (exchanges/simulator.py), pointed at for the
+# length of one test.
+#
+# Usage: python -m pytest -q tests
+###############################################################################
+import numpy as np
+import pandas as pd
+import pytest
+
+from base import HISTORY_COLUMNS
+from config import config_params
+
+
+# DATA
+def make_price_frame(rows, seed=0, volatility=50.0):
+    """ Synthetic OHLCV frame with the bot's price columns. """
+    rng = np.random.default_rng(seed)
+    close = 40000 + np.cumsum(rng.normal(0, volatility, rows))
+    return pd.DataFrame({
+        'time': np.arange(rows, dtype=np.int64),
+        'l': close - rng.uniform(0, 30, rows),
+        'h': close + rng.uniform(0, 30, rows),
+        'o': close + rng.normal(0, 10, rows),
+        'c': close,
+        'v': rng.uniform(1, 10, rows),
+    })
+
+
+def make_history(close=41000.0):
+    """ One 'No Action' row to start a bot log from, with the simulated accounts' balances. """
+    row = {'time': 0, 'l': close, 'h': close, 'o': close, 'c': close, 'v': 1.0}
+    row.update({col_name: 0.0 for col_name in HISTORY_COLUMNS})
+    row.update({
+        'trade_status': 'No Action',
+        'exchange_selected': 'None',
+        'position_exchange': 'None',
+        'nofee_win_loss': None,
+        'fee_win_loss': None,
+        'trace_id': None,
+        'fill_usd': np.nan,
+        'coinbase_usd': 100000.0,
+        'falconx_usd': 100000.0,
+    })
+    return pd.DataFrame([row])
+
+
+def price_row(close, time=0):
+    return pd.DataFrame([{'time': time, 'l': close, 'h': close, 'o': close, 'c': close, 'v': 1.0}])
+
+
+def bot_params(**overrides):
+    """ config.py with the simulator's account ids and a fixed strategy. """
+    params = dict(config_params, coinbase_usd_account_id='usd', coinbase_btc_account_id='btc', coinbase_fee_estimate=0.005, threshold=40000, bet=10000)
+    params.update(overrides)
+    return params
+
+
+# FIXTURES
+@pytest.fixture
+def start_simulator(monkeypatch):
+    """ Returns a function that starts the exchange simulator on a market and points the
+    exchange modules at it. Everything is put back when the test ends. """
+    from exchanges import coinbase, falconx
+    from exchanges.balances import balance_cache
+    from exchanges.simulator import ExchangeSimulator, point_exchanges_at
+
+    for name in ('coinbase_api_url', 'falconx_api_url'):
+        monkeypatch.setitem(config_params, name, config_params.get(name))
+    monkeypatch.setattr(coinbase, 'api_url', coinbase.api_url)
+    monkeypatch.setattr(falconx, 'api_url', falconx.api_url)
+    simulators = []
+
+    def start(market):
+        simulator = ExchangeSimulator(market=market, seed=1).start()
+        simulators.append(simulator)
+        point_exchanges_at(simulator)
+        balance_cache.invalidate()
+        return simulator
+
+    yield start
+    for simulator in simulators:
+        simulator.stop()
+    balance_cache.invalidate()
@@ -0,0 +1,59 @@
+###############################################################################
+# FILENAME: test_backtest.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The vectorized backtest (backtest.py) makes the same decisions
+# as running Bot.apply_strategy once per bar, and its performance columns
+# match Bot.evaluate_performance on the same log.
+###############################################################################
+import numpy as np
+import pytest
+
+from backtest import backtest
+from bot import Bot, performance_mismatches
+from tests.conftest import make_price_frame, make_history, bot_params
+
+
+@pytest.fixture
+def price_df():
+    """ A random walk that crosses the 40000 threshold many times. """
+    df = make_price_frame(300, seed=11, volatility=200.0)
+    df['cb'] = df['c'] * np.random.default_rng(11).uniform(0.99, 1.01, len(df))    # Coinbase cheaper on some bars
+    return df
+
+
+def sequential(bot, price_df):
+    """ apply_strategy one bar at a time, as the hourly schedule would. """
+    log_df = make_history(close=price_df['c'].iloc[0])
+    for i in range(len(price_df)):
+        log_df = bot.apply_strategy(log_df, price_df[['time', 'l', 'h', 'o', 'c', 'v']].iloc[i:i + 1])
+    return log_df.iloc[1:].reset_index(drop=True)
+
+
+@pytest.mark.parametrize('threshold', [40000, 39500])
+def test_decisions_match_apply_strategy(price_df, threshold):
+    bot = Bot(bot_params(threshold=threshold))
+    expected = sequential(bot, price_df)
+    result_df = backtest(price_df, threshold, 10000, coinbase_label='cb', coinbase_fee_estimate=0.005)
+
+    assert set(expected['trade_status']) == {'No Action', 'Buy', 'Hold', 'Sell'}
+    assert list(result_df['trade_status'].astype(str)) == list(expected['trade_status'])
+    np.testing.assert_array_equal(result_df['indicator'].to_numpy(dtype=float), expected['indicator'].to_numpy(dtype=float))
+
+
+def test_performance_matches_evaluate_performance(price_df):
+    result_df = backtest(price_df, 40000, 10000, coinbase_label='cb', coinbase_fee_estimate=0.005, falconx_fee_estimate=0.001)
+    bot = Bot(bot_params(bet=10000))
+    assert set(result_df.loc[result_df['trade_status'] == 'Sell', 'exchange_selected']) == {'Coinbase', 'FalconX'}
+    assert performance_mismatches(bot.evaluate_performance(result_df.copy()), result_df) == []
+
+
+def test_open_position_carried_in(price_df):
+    below = price_df[price_df['c'] < 40000].index[0]
+    start_df = price_df.iloc[below:].reset_index(drop=True)    # first bar is already below the threshold
+    result_df = backtest(start_df, 40000, 10000, initial_trade_status='Hold', initial_position_btc=0.25, initial_exchange='FalconX')
+    assert result_df['trade_status'].iloc[0] == 'Hold'
+    first_sell = result_df.index[result_df['trade_status'] == 'Sell'][0]
+    assert result_df['fill_usd'].iloc[first_sell] == pytest.approx(0.25 * start_df['c'].iloc[first_sell])
+    assert result_df['exchange_selected'].iloc[first_sell] == 'FalconX'
@@ -0,0 +1,94 @@
+###############################################################################
+# FILENAME: test_balances.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The balance cache (exchanges/balances.py) reuses a snapshot
+# until its TTL runs out or a fill invalidates it, and concurrent cold
+# lookups share one fetch.
+###############################################################################
+import time
+import threading
+
+from exchanges.balances import BalanceCache
+
+
+class Account:
+    """ Balances that change when an order fills, counting the fetches. """
+
+    def __init__(self):
+        self.balances = {'USD': 100000.0, 'BTC': 0.0}
+        self.fetches = 0
+
+    def fetch(self):
+        self.fetches = self.fetches + 1
+        return dict(self.balances)
+
+    def fill(self, usd, btc):
+        self.balances = {'USD': self.balances['USD'] + usd, 'BTC': self.balances['BTC'] + btc}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_expiry():
+    clock = Clock()
+    cache = BalanceCache(ttl=10.0, clock=clock)
+    account = Account()
+    connection = object()
+    assert cache.get('Coinbase', connection, 'USD', account.fetch) == 100000.0
+    account.fill(-10000.0, 0.25)    # not seen until the entry expires
+    clock.now = 9.9
+    assert cache.get('Coinbase', connection, 'BTC', account.fetch) == 0.0
+    clock.now = 10.0
+    assert cache.get('Coinbase', connection, 'BTC', account.fetch) == 0.25
+    assert (account.fetches, cache.fetches, cache.hits) == (2, 2, 1)
+
+
+def test_invalidate_after_a_fill():
+    cache = BalanceCache(ttl=60.0)
+    coinbase, falconx = Account(), Account()
+    connection = object()
+    cache.get('Coinbase', connection, 'USD', coinbase.fetch)
+    cache.get('FalconX', connection, 'USD', falconx.fetch)
+
+    coinbase.fill(-10000.0, 0.25)
+    cache.invalidate('Coinbase')    # what execute_trades does after an order on the exchange
+    assert cache.get('Coinbase', connection, 'USD', coinbase.fetch) == 90000.0
+    assert cache.get('FalconX', connection, 'USD', falconx.fetch) == 100000.0
+    assert (coinbase.fetches, falconx.fetches) == (2, 1)
+
+
+def test_invalidate_one_connection():
+    cache = BalanceCache(ttl=60.0)
+    account = Account()
+    first, second = object(), object()
+    cache.get('Coinbase', first, 'USD', account.fetch)
+    cache.get('Coinbase', second, 'USD', account.fetch)
+    cache.invalidate('Coinbase', second)
+    cache.get('Coinbase', first, 'USD', account.fetch)
+    cache.get('Coinbase', second, 'USD', account.fetch)
+    assert account.fetches == 3
+
+
+def test_concurrent_cold_lookups_share_one_fetch():
+    cache = BalanceCache(ttl=60.0)
+    account = Account()
+    connection = object()
+
+    def slow_fetch():
+        time.sleep(0.1)
+        return account.fetch()
+
+    threads = [threading.Thread(target=cache.get, args=('FalconX', connection, key, slow_fetch)) for key in ('USD', 'BTC') * 4]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert account.fetches == 1
+    assert cache.hits == 7
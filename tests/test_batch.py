@@ -0,0 +1,80 @@
+###############################################################################
+# FILENAME: test_batch.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The multi-window functions (utils/batch.py) give the same
+# values as one utils/indicators.py call per window, across the cumulative
+# sum blocks, around NaN and on inputs shorter than the window.
+###############################################################################
+import numpy as np
+import pytest
+
+from utils import batch, indicators
+from tests.conftest import make_price_frame
+
+
+WINDOWS = [1, 2, 5, 14, 50, 300]    # 300 is wider than BLOCK_ROWS, so the blocks grow to fit it
+CASES = {    # batch function -> (indicator function, extra arguments)
+    'sma_windows': (lambda df, w: indicators.sma(df, 'c', w), ()),
+    'roc_windows': (lambda df, w: indicators.roc(df, 'c', w), ()),
+    'momentum_windows': (lambda df, w: indicators.momentum(df, 'c', w), ()),
+    'bollinger_band_windows': (lambda df, w: indicators.bollinger_band(df, 'c', w, 2), (2,)),
+    'annualized_historical_volatility_windows': (lambda df, w: indicators.annualized_historical_volatility(df, 'c', w), ()),
+}
+
+
+def expected(name, df):
+    single, _ = CASES[name]
+    return np.column_stack([single(df, w).iloc[:, -1].to_numpy(dtype=np.float64) for w in WINDOWS])
+
+
+def assert_same(result, expected_result):
+    np.testing.assert_array_equal(np.isnan(result), np.isnan(expected_result))
+    np.testing.assert_allclose(result, expected_result, rtol=1e-7, atol=1e-8, equal_nan=True)    # pandas' own rolling variance drifts by ~1e-9
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_matches_one_call_per_window(name):
+    df = make_price_frame(3000, seed=3)    # a dozen cumulative sum blocks
+    result = getattr(batch, name)(df['c'].to_numpy(), WINDOWS, *CASES[name][1])
+    assert result.shape == (len(df), len(WINDOWS))
+    assert_same(result, expected(name, df))
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_nan_rows(name):
+    df = make_price_frame(1500, seed=4)
+    df.loc[[0, 400, 401, 1000], 'c'] = np.nan    # leading and mid series gaps, one on a block edge
+    result = getattr(batch, name)(df['c'].to_numpy(), WINDOWS, *CASES[name][1])
+    assert_same(result, expected(name, df))
+
+
+@pytest.mark.parametrize('rows', [0, 1, 13, 14, 15])
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_short_inputs(name, rows):
+    df = make_price_frame(rows, seed=5)
+    result = getattr(batch, name)(df['c'].to_numpy(), WINDOWS, *CASES[name][1])
+    assert result.shape == (rows, len(WINDOWS))
+    if rows:
+        assert_same(result, expected(name, df))
+
+
+def test_block_centering_keeps_long_high_priced_series_accurate():
+    # a plain cumulative sum of 50000 prices near 1e6 loses the small variance to rounding,
+    # so compare with each window computed on its own
+    rng = np.random.default_rng(6)
+    values = 1e6 + np.cumsum(rng.normal(0, 0.01, 50000))
+    means, variances = batch.rolling_moments(values, [20, 100])
+    for i, w in enumerate([20, 100]):
+        windows = np.lib.stride_tricks.sliding_window_view(values, w)
+        assert np.isnan(means[:w - 1, i]).all() and np.isnan(variances[:w - 1, i]).all()
+        np.testing.assert_allclose(means[w - 1:, i], windows.mean(axis=1), rtol=1e-12)
+        np.testing.assert_allclose(variances[w - 1:, i], windows.var(axis=1, ddof=1), rtol=1e-9)
+
+
+def test_to_frame():
+    df = make_price_frame(30)
+    frame = batch.to_frame(batch.sma_windows(df['c'], [5, 10]), [5, 10], 'sma', index=df.index)
+    assert list(frame.columns) == [('sma', 5), ('sma', 10)]
+    np.testing.assert_allclose(frame[('sma', 10)], df['c'].rolling(10).mean(), equal_nan=True)
@@ -0,0 +1,53 @@
+###############################################################################
+# FILENAME: test_bot_log.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: BotLog (utils/bot_log.py) round trips a history frame,
+# refuses reads past either end of its rows, and evaluate_performance on a
+# BotLog matches the full recompute row by row.
+###############################################################################
+import numpy as np
+import pytest
+
+from backtest import backtest
+from bot import Bot, performance_mismatches
+from utils.bot_log import BotLog
+from tests.conftest import make_price_frame, make_history, bot_params
+
+
+def test_last_reads_back_from_the_end():
+    log = BotLog.from_frame(make_history(41000.0))
+    log.append(dict(make_history(39000.0).iloc[0], trade_status='Buy', exchange_selected='FalconX'))
+    assert log.last('trade_status') == 'Buy'
+    assert log.last('trade_status', 2) == 'No Action'
+    assert log.last('c', 2) == 41000.0
+
+
+@pytest.mark.parametrize('offset', [0, -1, 3, 1000])
+def test_last_out_of_range(offset):
+    log = BotLog.from_frame(make_history())
+    log.append(make_history().iloc[0].to_dict())
+    with pytest.raises(IndexError):
+        log.last('trade_status', offset)
+
+
+def test_frame_round_trip():
+    df = make_history()
+    back = BotLog.from_frame(df).to_frame()
+    assert back['trade_status'].tolist() == ['No Action']
+    assert back['nofee_win_loss'].tolist() == [None]
+    assert back['c'].tolist() == df['c'].tolist()
+
+
+def test_incremental_bot_log_matches_full():
+    price_df = make_price_frame(400, seed=2, volatility=300.0)
+    price_df['cb'] = price_df['c'] * np.random.default_rng(2).uniform(0.99, 1.01, len(price_df))
+    history = backtest(price_df, 40000, 10000, coinbase_label='cb', coinbase_fee_estimate=0.001)
+    bot = Bot(bot_params())
+    expected = bot.evaluate_performance(history)
+    log = BotLog.from_frame(history.iloc[:1])
+    for row in history.iloc[1:].to_dict('records'):
+        log.append(row)
+        bot.evaluate_performance(log, new_rows=1, check=True)    # ValueError on any difference
+    assert performance_mismatches(log.to_frame(), expected) == []
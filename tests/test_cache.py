@@ -0,0 +1,80 @@
+###############################################################################
+# FILENAME: test_cache.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The indicator cache (utils/cache.py) returns the same frames
+# as calling the indicator, extends a cached prefix when rows were only
+# appended, and counts memory and disk evictions separately.
+###############################################################################
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import indicators
+from utils.cache import CHECK_ROWS, IndicatorCache
+from tests.conftest import make_price_frame
+
+
+@pytest.mark.parametrize('func, args', [
+    (indicators.rsi, ('c', 14)),
+    (indicators.zlema, ('c', 14)),
+    (indicators.sma, ('c', 14)),
+    (indicators.vwap, ('c', 'h', 'l', 'v', 14)),
+])
+def test_cache_extension_matches_full(func, args):
+    df = make_price_frame(2000, seed=3)
+    cache = IndicatorCache()
+    cache.compute(func, df.iloc[:1500], *args)
+    extended = cache.compute(func, df, *args)
+    expected = func(df, *args)
+    assert cache.stats()['extensions'] == 1
+    pd.testing.assert_frame_equal(extended, expected, rtol=1e-12)
+
+
+def test_cache_hit():
+    df = make_price_frame(500, seed=4)
+    cache = IndicatorCache()
+    cache.compute(indicators.rsi, df, 'c', 14)
+    pd.testing.assert_frame_equal(cache.compute(indicators.rsi, df.copy(), 'c', 14), indicators.rsi(df, 'c', 14))
+    assert cache.stats()['hits'] == 1
+
+
+@pytest.mark.parametrize('rows', [500, 1000])    # same length, or rows appended after the change
+def test_cache_recomputes_changed_history(rows):
+    df = make_price_frame(1000, seed=4)
+    cache = IndicatorCache()
+    cache.compute(indicators.rsi, df.iloc[:500], 'c', 14)
+    changed = df.iloc[:rows].copy()
+    changed.loc[500 - CHECK_ROWS // 2, 'c'] = changed.loc[500 - CHECK_ROWS // 2, 'c'] + 100.0    # a cached row changed, not just appended to
+    pd.testing.assert_frame_equal(cache.compute(indicators.rsi, changed, 'c', 14), indicators.rsi(changed, 'c', 14))
+    assert cache.stats()['misses'] == 2
+    assert cache.stats()['extensions'] == 0
+
+
+def test_cache_nan_rows_still_hit():
+    df = make_price_frame(300, seed=5)
+    df.loc[295, 'c'] = np.nan
+    cache = IndicatorCache()
+    cache.compute(indicators.sma, df, 'c', 14)
+    cache.compute(indicators.sma, df, 'c', 14)
+    assert cache.stats()['hits'] == 1
+
+
+def test_memory_and_disk_evictions_are_counted_apart(tmp_path):
+    df = make_price_frame(1000, seed=6)
+    cache = IndicatorCache(max_bytes=3 * 8 * len(df), disk_dir=str(tmp_path), max_disk_bytes=1)    # room for three result columns, none on disk
+    for window in [5, 10, 15, 20, 25]:
+        cache.compute(indicators.sma, df, 'c', window)
+    stats = cache.stats()
+    assert (stats['evictions'], stats['entries']) == (2, 3)
+    assert stats['disk_evictions'] == 5
+    assert not list(tmp_path.glob('*.pkl'))
+
+
+def test_disk_tier_serves_a_new_cache(tmp_path):
+    df = make_price_frame(300, seed=7)
+    IndicatorCache(disk_dir=str(tmp_path)).compute(indicators.rsi, df, 'c', 14)
+    cache = IndicatorCache(disk_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(cache.compute(indicators.rsi, df, 'c', 14), indicators.rsi(df, 'c', 14))
+    assert (cache.stats()['disk_hits'], cache.stats()['hits']) == (1, 1)
@@ -0,0 +1,89 @@
+###############################################################################
+# FILENAME: test_credentials.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The credential provider (exchanges/credentials.py) builds the
+# backend named in config.py, caches secrets until their TTL runs out or they
+# are rotated, and picks up a rotated secret from its backend.
+###############################################################################
+import json
+import time
+
+import pytest
+
+from config import config_params
+from exchanges import credentials
+from exchanges.credentials import CredentialProvider, EnvBackend, FileBackend, SecretManagerBackend, make_backend
+
+
+class Backend:
+    """ Secrets that can be rotated, counting the fetches. """
+
+    def __init__(self, secrets):
+        self.secrets = dict(secrets)
+        self.fetches = []
+
+    def fetch(self, name):
+        self.fetches.append(name)
+        return self.secrets[name]
+
+
+@pytest.mark.parametrize('name, settings, backend_class', [
+    ('secret_manager', {'gcp_project_id': 'eoc'}, SecretManagerBackend),
+    ('env', {'credentials_env_prefix': 'EOC_'}, EnvBackend),
+    ('file', {'credentials_file': 'secrets.json'}, FileBackend),
+])
+def test_backend_selection(monkeypatch, name, settings, backend_class):
+    monkeypatch.setitem(config_params, 'credentials_backend', name)
+    for key, value in settings.items():
+        monkeypatch.setitem(config_params, key, value)
+    assert isinstance(make_backend(), backend_class)
+
+
+def test_unknown_backend(monkeypatch):
+    monkeypatch.setitem(config_params, 'credentials_backend', 'vault')
+    with pytest.raises(ValueError):
+        make_backend()
+
+
+def test_provider_is_built_from_config_on_first_use(monkeypatch):
+    monkeypatch.setattr(credentials, '_provider', None)
+    monkeypatch.setitem(config_params, 'credentials_backend', 'env')
+    monkeypatch.setitem(config_params, 'credentials_ttl', 60)
+    provider = credentials.get_credential_provider()
+    assert isinstance(provider.backend, EnvBackend) and provider.ttl == 60
+    assert credentials.get_credential_provider() is provider
+
+
+def test_env_and_file_backends(monkeypatch, tmp_path):
+    monkeypatch.setenv('EOC_CB_PRIME_API_KEY', 'env key')
+    assert EnvBackend('EOC_').fetch('cb-prime-api-key') == 'env key'
+    with pytest.raises(KeyError):
+        EnvBackend('EOC_').fetch('missing')
+
+    path = tmp_path / 'secrets.json'
+    path.write_text(json.dumps({'fx-secret': 'one'}))
+    backend = FileBackend(str(path))
+    assert backend.fetch('fx-secret') == 'one'
+
+
+def test_ttl_rotation():
+    backend = Backend({'key': 'old', 'secret': 's'})
+    provider = CredentialProvider(backend, ttl=0.2)
+    assert provider.get_many(['key', 'secret']) == ['old', 's']
+    backend.secrets['key'] = 'new'    # rotated in the backend
+    assert provider.get('key') == 'old'    # still cached
+    time.sleep(0.25)
+    assert provider.get('key') == 'new'
+    assert sorted(backend.fetches) == ['key', 'key', 'secret']
+
+
+def test_rotate_forgets_a_secret():
+    backend = Backend({'key': 'old', 'secret': 's'})
+    provider = CredentialProvider(backend)    # no ttl: cached until rotated
+    provider.prefetch(['key', 'secret'])
+    backend.secrets['key'] = 'new'
+    provider.rotate('key')
+    assert provider.get_many(['key', 'secret']) == ['new', 's']
+    assert sorted(backend.fetches) == ['key', 'key', 'secret']
@@ -0,0 +1,86 @@
+###############################################################################
+# FILENAME: test_falconx_quote.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: A FalconX quote (exchanges/falconx.py) is parsed once, sizes
+# a buy while it is valid and is only fetched again once it is about to
+# expire.
+###############################################################################
+import time
+import datetime
+
+import pytest
+
+from exchanges import falconx
+from exchanges.balances import balance_cache
+from exchanges.falconx import FalconXQuote, QUOTE_EXPIRY_MARGIN, DEFAULT_QUOTE_TTL
+
+
+def rfq(price, expires_in=None, quote_id='q1'):
+    data = {'fx_quote_id': quote_id, 'side_requested': 'buy', 'buy_price': str(price), 'sell_price': str(price - 10), 'fee_usd': 0.0}
+    if expires_in is not None:
+        data['t_expiry'] = datetime.datetime.fromtimestamp(time.time() + expires_in, datetime.timezone.utc).isoformat().replace('+00:00', 'Z')
+    return data
+
+
+class Response:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class Client:
+    """ FalconX API stand in: quotes at 41000, fills every order, records the requests. """
+
+    def __init__(self):
+        self.posts = []
+
+    def get(self, path):
+        return Response([{'token': 'USD', 'total_balance': 100000.0}, {'token': 'BTC', 'total_balance': 0.0}])
+
+    def post(self, path, json=None):
+        self.posts.append((path, json))
+        if path == 'quotes':
+            return Response(rfq(41000.0, expires_in=30, quote_id='fresh'))
+        return Response({'status': 'success', 'side_requested': 'buy', 'buy_price': '41000.0', 'quantity_requested': json['quantity'], 'fee_usd': 0.0})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = Client()
+    monkeypatch.setattr(falconx, 'get_client', lambda connection, url: client)
+    monkeypatch.setattr(falconx, 'orders_enabled', lambda *args: True)
+    balance_cache.invalidate()
+    yield client
+    balance_cache.invalidate()
+
+
+def test_quote_is_parsed_once():
+    quote = FalconXQuote(rfq(40000.0, expires_in=10))
+    assert quote.price == 40000.0
+    assert (quote[0], quote[1]) == (40000.0, 'q1')    # still indexes like the old [price, quote id] list
+    assert quote.is_valid()
+    assert not quote.is_valid(now=quote.expires_at - QUOTE_EXPIRY_MARGIN)
+
+
+def test_default_ttl_without_expiry():
+    quote = FalconXQuote(rfq(40000.0), received_at=1000.0)
+    assert quote.expires_at == 1000.0 + DEFAULT_QUOTE_TTL
+
+
+def test_valid_quote_is_reused(client):
+    quote = FalconXQuote(rfq(40000.0, expires_in=10))
+    falconx.place_falconx_market_order(None, 10000, ['BTC', 'USD'], 'buy', quote=quote)
+    assert [path for path, _ in client.posts] == ['order']    # no second rfq
+    assert client.posts[0][1]['quantity']['value'] == round(10000 / 40000.0, 8)
+
+
+@pytest.mark.parametrize('expires_in', [QUOTE_EXPIRY_MARGIN / 2, -5.0])    # inside the margin, or already expired
+def test_expiring_quote_is_fetched_again(client, expires_in):
+    quote = FalconXQuote(rfq(40000.0, expires_in=expires_in))
+    falconx.place_falconx_market_order(None, 10000, ['BTC', 'USD'], 'buy', quote=quote)
+    assert [path for path, _ in client.posts] == ['quotes', 'order']
+    assert client.posts[1][1]['quantity']['value'] == round(10000 / 41000.0, 8)    # sized off the fresh quote
@@ -0,0 +1,155 @@
+###############################################################################
+# FILENAME: test_filters.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The recursive-filter engine (utils/filters.py) and the zlema()
+# and rsi() built on it give the same numbers as a plain per-bar loop, across
+# block boundaries, NaN warm-up patterns and inputs shorter than the window.
+###############################################################################
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import filters, indicators
+from tests.conftest import make_price_frame
+
+
+# REFERENCE LOOPS
+def loop_filter(values, decay, gain, start, initial):
+    out = [math.nan] * len(values)
+    if 0 <= start < len(values):
+        out[start] = initial
+        for i in range(start + 1, len(values)):
+            out[i] = decay * out[i - 1] + gain * values[i]
+    return np.array(out, dtype=np.float64)
+
+
+def loop_seeded(values, rolling_window, decay, gain):
+    first = next((i for i, value in enumerate(values) if not math.isnan(value)), len(values))
+    start = first + rolling_window - 1
+    if start >= len(values):
+        return np.full(len(values), np.nan)
+    seed = sum(values[first:start + 1]) / rolling_window
+    return loop_filter(values, decay, gain, start, seed)
+
+
+def loop_ema(values, rolling_window):
+    smoothing_factor = 2 / (rolling_window + 1)
+    return loop_seeded(values, rolling_window, 1 - smoothing_factor, smoothing_factor)
+
+
+def loop_wilder(values, rolling_window):
+    return loop_seeded(values, rolling_window, (rolling_window - 1) / rolling_window, 1 / rolling_window)
+
+
+def loop_zlema(close, rolling_window):
+    lag = int(math.floor((rolling_window - 1) / 2))
+    smoothing_factor = 2 / (rolling_window + 1)
+    start = max(lag - 1, 0)
+    out = [math.nan] * len(close)
+    if start >= len(close):
+        return np.array(out, dtype=np.float64)
+    out[start] = close[start]
+    for i in range(start + 1, len(close)):
+        delagged = close[i] + (close[i] - close[i - lag])
+        out[i] = (1 - smoothing_factor) * out[i - 1] + smoothing_factor * delagged
+    return np.array(out, dtype=np.float64)
+
+
+def loop_rsi(close, rolling_window):
+    if not close:
+        return np.array([], dtype=np.float64)
+    gains = [math.nan] + [max(b - a, 0.0) for a, b in zip(close[:-1], close[1:])]
+    losses = [math.nan] + [max(a - b, 0.0) for a, b in zip(close[:-1], close[1:])]
+    avg_gain = loop_wilder(gains, rolling_window)
+    avg_loss = loop_wilder(losses, rolling_window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def series(n, seed=0):
+    return list(40000 + np.cumsum(np.random.default_rng(seed).normal(0, 50, n)))
+
+
+def assert_same(values, expected):
+    np.testing.assert_array_equal(np.isnan(values), np.isnan(expected))
+    np.testing.assert_allclose(values, expected, rtol=1e-9, equal_nan=True)
+
+
+# ENGINE
+@pytest.mark.parametrize('decay', [0.0, 0.5, 0.9, 0.999, 1.0])
+def test_linear_filter_matches_loop(decay):
+    values = series(70000 if decay == 0.999 else 3000)    # several blocks for every decay
+    assert_same(filters.linear_filter(values, decay, 1 - decay, 5, values[5]), loop_filter(values, decay, 1 - decay, 5, values[5]))
+
+
+@pytest.mark.parametrize('start', [-1, 0, 9, 10, 11])
+def test_linear_filter_start_outside_or_at_the_end(start):
+    values = series(10)
+    expected = loop_filter(values, 0.5, 0.5, start, 1.0) if 0 <= start < 10 else np.full(10, np.nan)
+    assert_same(filters.linear_filter(values, 0.5, 0.5, start, 1.0), expected)
+
+
+def test_linear_filter_rejects_bad_decay():
+    with pytest.raises(ValueError):
+        filters.linear_filter(series(10), 1.5, 0.5, 0, 1.0)
+
+
+def test_nan_after_start_carries_forward_like_the_loop():
+    values = series(500)
+    values[200] = math.nan
+    assert_same(filters.linear_filter(values, 0.8, 0.2, 0, values[0]), loop_filter(values, 0.8, 0.2, 0, values[0]))
+
+
+# AVERAGES
+@pytest.mark.parametrize('leading_nans', [0, 1, 13, 40])
+@pytest.mark.parametrize('rolling_window', [1, 2, 14])
+def test_averages_skip_the_warm_up(leading_nans, rolling_window):
+    values = [math.nan] * leading_nans + series(300)
+    assert_same(filters.ema_array(values, rolling_window), loop_ema(values, rolling_window))
+    assert_same(filters.wilder_array(values, rolling_window), loop_wilder(values, rolling_window))
+
+
+@pytest.mark.parametrize('n', [0, 1, 13, 14, 15])
+def test_averages_of_short_inputs(n):
+    values = series(n)
+    assert_same(filters.ema_array(values, 14), loop_ema(values, 14))
+    assert_same(filters.wilder_array(values, 14), loop_wilder(values, 14))
+
+
+def test_all_nan_input():
+    values = [math.nan] * 20
+    assert np.isnan(filters.ema_array(values, 5)).all()
+    assert np.isnan(filters.wilder_array(values, 5)).all()
+
+
+# INDICATORS
+@pytest.mark.parametrize('n', [0, 1, 2, 6, 7, 8, 2000])
+@pytest.mark.parametrize('rolling_window', [1, 2, 3, 14, 15])
+def test_zlema_matches_loop(n, rolling_window):
+    close = series(n, seed=rolling_window)
+    assert_same(filters.zlema_array(close, rolling_window), loop_zlema(close, rolling_window))
+
+
+@pytest.mark.parametrize('n', [0, 1, 14, 15, 16, 2000])
+@pytest.mark.parametrize('rolling_window', [2, 14])
+def test_rsi_matches_loop(n, rolling_window):
+    close = series(n, seed=rolling_window)
+    assert_same(filters.rsi_array(close, rolling_window), loop_rsi(close, rolling_window))
+
+
+def test_rsi_of_a_flat_then_rising_series():
+    close = [100.0] * 20 + [100.0 + i for i in range(1, 21)]    # no losses: rsi is 100 once gains start, NaN while flat
+    assert_same(filters.rsi_array(close, 14), loop_rsi(close, 14))
+
+
+def test_data_frame_functions_use_the_engine():
+    df = make_price_frame(1000, seed=8)
+    close = df['c'].tolist()
+    assert_same(indicators.zlema(df, 'c', 14)['14__ZLEMA'].to_numpy(dtype=np.float64), loop_zlema(close, 14))
+    assert_same(indicators.rsi(df, 'c', 14)['14 _RSI'].to_numpy(dtype=np.float64), loop_rsi(close, 14))
+    assert list(indicators.rsi(df, 'c', 14).columns) == list(df.columns) + ['14 _RSI']
+    pd.testing.assert_frame_equal(indicators.zlema(df, 'c', 14)[df.columns], df)    # input columns untouched
@@ -0,0 +1,57 @@
+###############################################################################
+# FILENAME: test_history_store.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The history store (utils/history_store.py) reads back what was
+# appended across seals and compactions, and a crash part way through a seal
+# or a compaction never loses or repeats rows.
+###############################################################################
+import pandas as pd
+import pytest
+
+from utils import history_store
+from utils.history_store import HistoryStore
+from tests.conftest import make_price_frame
+
+
+def append_rows(store, df):
+    for i in range(len(df)):
+        store.append(df.iloc[i:i + 1])
+
+
+def test_reads_back_across_seals_and_compactions(tmp_path):
+    df = make_price_frame(95, seed=1)
+    store = HistoryStore(str(tmp_path), segment_rows=10, compact_segments=4, compact_rows=30)
+    append_rows(store, df)
+    assert len(store) == 95
+    assert store.manifest['journal_rows'] == 5
+    pd.testing.assert_frame_equal(HistoryStore(str(tmp_path)).read(), df)
+    pd.testing.assert_frame_equal(store.read_tail(12), df.tail(12).reset_index(drop=True))
+
+
+@pytest.mark.parametrize('step, failing', [
+    ('seal', 'manifest'),    # before the new manifest is written
+    ('seal', 'remove'),    # after it, while removing the sealed journal
+    ('compact', 'remove'),    # after it, while removing the merged segments
+])
+def test_crash_part_way_loses_nothing(tmp_path, monkeypatch, step, failing):
+    df = make_price_frame(40, seed=2)
+    store = HistoryStore(str(tmp_path), segment_rows=10, compact_segments=4 if step == 'compact' else 100, compact_rows=100)
+    append_rows(store, df.iloc[:39])
+
+    def crash(*args):
+        raise OSError('power cut')
+
+    if failing == 'manifest':
+        monkeypatch.setattr(HistoryStore, '_write_manifest', crash)
+    else:
+        monkeypatch.setattr(history_store.os, 'remove', crash)
+    with pytest.raises(OSError):
+        store.append(df.iloc[39:])
+    monkeypatch.undo()
+
+    reopened = HistoryStore(str(tmp_path))
+    pd.testing.assert_frame_equal(reopened.read(), df)
+    reopened.append(make_price_frame(1, seed=3))    # a stale journal is started over, not appended to
+    assert len(reopened.read()) == 41
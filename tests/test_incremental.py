@@ -0,0 +1,46 @@
+###############################################################################
+# FILENAME: test_incremental.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: evaluate_performance on only the rows appended each cycle
+# gives the same results as the full recompute, and its check catches a
+# difference.
+###############################################################################
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import backtest
+from bot import Bot, performance_mismatches
+from tests.conftest import make_price_frame, bot_params
+
+
+@pytest.fixture
+def history():
+    """ A few hundred cycles with buys, holds and sells on both exchanges. """
+    price_df = make_price_frame(400, seed=2, volatility=300.0)
+    price_df['cb'] = price_df['c'] * np.random.default_rng(2).uniform(0.99, 1.01, len(price_df))    # cheaper than FalconX on some bars
+    return backtest(price_df, 40000, 10000, coinbase_label='cb', coinbase_fee_estimate=0.001)
+
+
+def test_history_trades(history):
+    assert (history['trade_status'] == 'Sell').sum() > 3
+    assert set(history.loc[history['trade_status'] == 'Buy', 'exchange_selected']) == {'Coinbase', 'FalconX'}
+
+
+def test_incremental_frame_matches_full(history):
+    bot = Bot(bot_params())
+    expected = bot.evaluate_performance(history)
+    df = history.iloc[:1].copy()
+    for i in range(1, len(history)):
+        df = bot.evaluate_performance(pd.concat([df, history.iloc[i:i + 1]]), new_rows=1)
+    assert performance_mismatches(df, expected) == []
+
+
+def test_incremental_check_catches_a_difference(history):
+    bot = Bot(bot_params())
+    df = bot.evaluate_performance(history.iloc[:-1])
+    df.loc[df.index[-1], 'running_net_profit'] = 1e6    # corrupt the total the next row carries forward
+    with pytest.raises(ValueError):
+        bot.evaluate_performance(pd.concat([df, history.iloc[-1:]]), new_rows=1, check=True)
@@ -0,0 +1,79 @@
+###############################################################################
+# FILENAME: test_metrics.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The metrics registry (utils/metrics.py) exports counters,
+# gauges and cumulative histograms in the Prometheus text format, over http
+# and as json lines spans.
+###############################################################################
+import json
+import urllib.request
+
+import pytest
+
+from utils.metrics import Metrics
+
+
+@pytest.fixture
+def registry():
+    registry = Metrics(buckets=[0.1, 1.0])
+    yield registry
+    registry.close()
+
+
+def test_prometheus_text(registry):
+    registry.inc('bot_runs_total')
+    registry.inc('bot_runs_total', 2)
+    registry.inc('exchange_requests_total', exchange='Coinbase', status=200)
+    registry.set('bot_balance_usd', 1250.5)
+    registry.observe('bot_stage_seconds', 0.05, stage='strategy')
+    registry.observe('bot_stage_seconds', 0.5, stage='strategy')
+    registry.observe('bot_stage_seconds', 2.0, stage='strategy')
+    assert registry.prometheus_text().splitlines() == [
+        '# HELP bot_balance_usd USD balance after the last run.',
+        '# TYPE bot_balance_usd gauge',
+        'bot_balance_usd 1250.5',
+        '# HELP bot_runs_total Completed run() cycles.',
+        '# TYPE bot_runs_total counter',
+        'bot_runs_total 3.0',
+        '# HELP bot_stage_seconds Duration of each run() stage.',
+        '# TYPE bot_stage_seconds histogram',
+        'bot_stage_seconds_bucket{stage="strategy",le="0.1"} 1',
+        'bot_stage_seconds_bucket{stage="strategy",le="1.0"} 2',
+        'bot_stage_seconds_bucket{stage="strategy",le="+Inf"} 3',
+        'bot_stage_seconds_sum{stage="strategy"} 2.55',
+        'bot_stage_seconds_count{stage="strategy"} 3',
+        '# HELP exchange_requests_total Exchange requests, by response status.',
+        '# TYPE exchange_requests_total counter',
+        'exchange_requests_total{exchange="Coinbase",status="200"} 1.0',
+    ]
+
+
+def test_label_values_are_escaped(registry):
+    registry.set('custom', None, note='say "hi"\\\n')
+    assert registry.prometheus_text().splitlines()[-1] == 'custom{note="say \\"hi\\"\\\\\\n"} NaN'
+
+
+def test_span_records_errors_and_json_lines(registry, tmp_path):
+    path = tmp_path / 'metrics.jsonl'
+    registry.log_to(str(path))
+    with pytest.raises(RuntimeError):
+        with registry.span('bot_stage', stage='trade') as span:
+            span.note(rows=3)
+            raise RuntimeError
+    snapshot = registry.snapshot()
+    assert snapshot['counters']['bot_stage_errors_total'] == [{'labels': {'stage': 'trade'}, 'value': 1}]
+    assert snapshot['histograms']['bot_stage_seconds'][0]['count'] == 1
+    event = json.loads(path.read_text())
+    assert (event['span'], event['stage'], event['rows'], event['error']) == ('bot_stage', 'trade', 3, 'RuntimeError')
+
+
+def test_served_over_http(registry):
+    registry.inc('bot_runs_total')
+    registry.serve(0)
+    url = 'http://127.0.0.1:' + str(registry.server.server_address[1])
+    with urllib.request.urlopen(url + '/metrics') as response:
+        assert response.read().decode() == registry.prometheus_text()
+    with urllib.request.urlopen(url + '/metrics.json') as response:
+        assert json.loads(response.read()) == registry.snapshot()
@@ -0,0 +1,63 @@
+###############################################################################
+# FILENAME: test_multi_bot.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Bots sharing one set of exchange accounts (multi_bot.py) each
+# sell only the position they bought and book profit from their own fills,
+# not from the shared account balances.
+###############################################################################
+import io
+import json
+import contextlib
+
+import pytest
+
+import multi_bot
+from exchanges.simulator import SimulatedMarket
+from utils.history_store import HistoryStore
+from tests.conftest import make_history, price_row, bot_params
+
+
+@pytest.fixture
+def runner(tmp_path, start_simulator):
+    market = SimulatedMarket(prices={'BTC': 40000.0}, volatility=0.0, seed=3)
+    simulator = start_simulator(market)
+    coinbase_connection, falconx_connection = simulator.connections()
+    path = tmp_path / 'bots.json'
+    path.write_text(json.dumps([{'name': 'low', 'threshold': 40000}, {'name': 'high', 'threshold': 45000}]))
+    configs = multi_bot.load_bot_configs(str(path), bot_params(history_store_dir=str(tmp_path), check_incremental_performance=True))
+    for bot_config in configs:
+        HistoryStore(bot_config['history_store_dir']).import_frame(make_history(41000.0))
+    runner = multi_bot.MultiBotRunner(configs, coinbase_connection, falconx_connection, None, 2)
+    runner.market = market
+    yield runner
+    runner.close()
+
+
+def cycle(runner, close, time):
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = runner.run_cycle({'BTC-USD': price_row(close, time)})
+    assert results == {'low': None, 'high': None}
+
+
+def test_each_bot_sells_its_own_position(runner):
+    cycle(runner, 39000.0, 1)    # decided on the starting close (41000): only 'high' buys
+    cycle(runner, 39000.0, 2)    # 'low' buys, 'high' holds
+    low, high = runner.logs['low'].to_frame(), runner.logs['high'].to_frame()
+    assert (low['trade_status'].iloc[-1], high['trade_status'].iloc[-1]) == ('Buy', 'Hold')
+    high_position = high['position_btc'].iloc[-1]
+    assert low['position_btc'].iloc[-1] > 0 and high_position > 0
+
+    cycle(runner, 42000.0, 3)
+    cycle(runner, 42000.0, 4)    # above 40000 but not 45000: 'low' sells, 'high' holds
+    low, high = runner.logs['low'].to_frame(), runner.logs['high'].to_frame()
+    assert (low['trade_status'].iloc[-1], high['trade_status'].iloc[-1]) == ('Sell', 'Hold')
+    assert high['position_btc'].iloc[-1] == high_position
+
+    held = runner.market.coinbase_balances['BTC'] + runner.market.falconx_balances['BTC']
+    assert held == pytest.approx(high_position, rel=1e-9)    # 'low' left 'high''s btc where it was
+
+    sell = low.iloc[-1]
+    assert sell['net_profit'] == pytest.approx(sell['fill_usd'] - 10000)
+    assert abs(sell['net_profit']) < 0.02 * 10000    # flat market: fees only, nothing of the other bot's position
@@ -0,0 +1,105 @@
+###############################################################################
+# FILENAME: test_order_book.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The synthetic order book (utils/order_book.py) triggers the same
+# orders as a scan of every resting order, keeps time priority, and holds
+# triggered orders in flight until their fill comes back, so an order whose
+# fill failed goes back in the book where it was.
+###############################################################################
+import random
+
+import pytest
+
+from bot import Bot
+from exchanges import coinbase
+from exchanges.price_feed import PriceTick
+from exchanges.simulator import SimulatedMarket
+from utils.order_book import SyntheticOrderBook
+from tests.conftest import bot_params
+
+
+def scan(orders, price):
+    """ Orders a tick triggers, found the slow way. """
+    buys = sorted((o for o in orders if o.side == 'buy' and o.trigger_price >= price), key=lambda o: (-o.trigger_price, o.seq))
+    sells = sorted((o for o in orders if o.side == 'sell' and o.trigger_price <= price), key=lambda o: (o.trigger_price, o.seq))
+    return [o.order_id for o in buys + sells]
+
+
+def test_index_matches_scan():
+    rng = random.Random(5)
+    book = SyntheticOrderBook()
+    for _ in range(3000):
+        action = rng.random()
+        if action < 0.5 or not len(book):
+            book.add(rng.choice(['buy', 'sell']), rng.randrange(39000, 41000, 50), rng.uniform(10, 1000))
+        elif action < 0.6:
+            book.cancel(rng.choice(list(book.orders)))
+        elif action < 0.7:
+            book.amend(rng.choice(list(book.orders)), trigger_price=rng.randrange(39000, 41000, 50))
+        else:
+            price = rng.uniform(38500, 41500)
+            expected = scan(book.orders.values(), price)
+            triggered = book.on_tick(price)
+            assert [o.order_id for o in triggered] == expected
+            for order in triggered:
+                book.complete(order.order_id)
+        assert book.resting() == sorted(book.resting(), key=lambda o: (o.side != 'buy', o.key()))
+
+
+def test_restore_keeps_time_priority(tmp_path):
+    path = str(tmp_path / 'book.json')
+    book = SyntheticOrderBook(path)
+    first = book.add('buy', 40000, 100)
+    second = book.add('buy', 40000, 100)
+    assert [o.order_id for o in book.on_tick(39990)] == [first, second]
+    assert len(book) == 0 and len(book.pending()) == 2
+    with pytest.raises(ValueError):
+        book.add('buy', 40000, 100, order_id=first)    # still in flight
+
+    book.complete(second)
+    book.add('buy', 40000, 100, order_id='late')
+    book.restore(first)    # its fill failed
+    assert [o.order_id for o in book.resting('buy')] == [first, 'late']
+
+    reloaded = SyntheticOrderBook(path)
+    assert [o.order_id for o in reloaded.resting('buy')] == [first, 'late']
+    assert reloaded.pending() == []
+
+
+def test_in_flight_orders_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'book.json')
+    book = SyntheticOrderBook(path)
+    order_id = book.add('sell', 41000, 250, 'FalconX')
+    book.on_tick(41500)
+    reloaded = SyntheticOrderBook(path)
+    assert [o.order_id for o in reloaded.pending()] == [order_id]
+    reloaded.restore(order_id)
+    assert reloaded.best('sell').order_id == order_id
+
+
+def test_failed_fill_goes_back_in_the_book(start_simulator, monkeypatch):
+    simulator = start_simulator(SimulatedMarket(prices={'BTC': 40000.0}, volatility=0.0, seed=3))
+    coinbase_connection, falconx_connection = simulator.connections()
+
+    def refused(*args, **kwargs):
+        raise ConnectionError('refused')
+
+    monkeypatch.setattr(coinbase, 'place_coinbase_market_order', refused)
+    book = SyntheticOrderBook()
+    on_coinbase = book.add('buy', 41000, 100, 'Coinbase')
+    on_falconx = book.add('buy', 41000, 100, 'FalconX')
+    triggered = book.on_tick(40000)
+    fills = Bot(bot_params()).execute_synthetic_orders(triggered, coinbase_connection, falconx_connection)
+    assert {fill['order_id']: fill['status'] for fill in fills} == {on_coinbase: 'Failed', on_falconx: 'Filled'}
+
+    run = pytest.importorskip('run')    # needs the scheduler package
+    monkeypatch.setattr(run, 'get_connections', lambda: (coinbase_connection, falconx_connection))
+    book = SyntheticOrderBook()
+    on_coinbase = book.add('buy', 41000, 100, 'Coinbase')
+    on_falconx = book.add('buy', 41000, 100, 'FalconX')
+    tick = PriceTick(40000.0)
+    run.fill_synthetic_orders(Bot(bot_params()), book, tick)
+    assert [o.order_id for o in book.resting()] == [on_coinbase]
+    assert book.pending() == []
@@ -0,0 +1,82 @@
+###############################################################################
+# FILENAME: test_pipeline.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The indicator pipeline (utils/pipeline.py) gives the same
+# columns as calling the utils/indicators.py functions one by one, and
+# computes each shared intermediate once.
+###############################################################################
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import indicators
+from utils.pipeline import INDICATORS, IndicatorPipeline, typical_price
+from tests.conftest import make_price_frame
+
+
+LABELS = {    # indicator name -> column label arguments
+    'bollinger_band': {'column_label': 'c'},
+    'roc': {'close_label': 'c'},
+    'sma': {'close_label': 'c'},
+    'zlema': {'close_label': 'c'},
+    'momentum': {'close_label': 'c'},
+    'cci': {'high_label': 'h', 'low_label': 'l', 'close_label': 'c'},
+    'rsi': {'close_label': 'c'},
+    'money_flow_index': {'close_label': 'c', 'high_label': 'h', 'low_label': 'l', 'volume_label': 'v'},
+    'chande_momentum_oscillator': {'close_label': 'c'},
+    'annualized_historical_volatility': {'close_label': 'c'},
+    'garman_klass_volatility': {'open_label': 'o', 'high_label': 'h', 'low_label': 'l', 'close_label': 'c'},
+    'vwap': {'close_label': 'c', 'high_label': 'h', 'low_label': 'l', 'volume_label': 'v'},
+}
+WINDOWS = [5, 14]
+
+
+def params(name, rolling_window):
+    p = dict(LABELS[name], rolling_window=rolling_window)
+    if name == 'bollinger_band':
+        p['standard_deviation'] = 2
+    return p
+
+
+def test_every_indicator_has_labels():
+    assert set(LABELS) == set(INDICATORS)
+
+
+@pytest.mark.parametrize('seed', [1, 7])
+def test_pipeline_matches_indicator_functions(seed):
+    df = make_price_frame(1000, seed=seed)
+    pipeline = IndicatorPipeline([(name, params(name, w)) for name in sorted(LABELS) for w in WINDOWS])
+    result_df = pipeline.run(df)
+
+    assert list(result_df.columns[:len(df.columns)]) == list(df.columns)
+    for name in sorted(LABELS):
+        for w in WINDOWS:
+            expected_df = getattr(indicators, name)(df, **params(name, w))
+            col_name = expected_df.columns[-1]
+            pd.testing.assert_series_equal(result_df[col_name], expected_df[col_name], rtol=1e-9, check_names=False)
+
+
+def test_shared_intermediates_are_one_node():
+    pipeline = IndicatorPipeline()
+    pipeline.add('cci', **params('cci', 14))
+    pipeline.add('money_flow_index', **params('money_flow_index', 14))
+    pipeline.add('vwap', **params('vwap', 20))
+    graph = pipeline.graph()
+    tp = typical_price('h', 'l', 'c')
+    assert tp in graph
+    assert sum(1 for node in graph if node[0] == 'typical_price') == 1
+    assert sum(1 for node in graph if node[0] == 'rolling_mean' and node[1] == tp) == 1
+
+
+def test_indicator_columns_only():
+    df = make_price_frame(50)
+    result_df = IndicatorPipeline().add('sma', close_label='c', rolling_window=5).run(df, include_input=False)
+    assert list(result_df.columns) == ['5 _SMA']
+    np.testing.assert_allclose(result_df['5 _SMA'], df['c'].rolling(5).mean(), equal_nan=True)
+
+
+def test_unknown_indicator():
+    with pytest.raises(ValueError):
+        IndicatorPipeline().add('macd', close_label='c', rolling_window=5)
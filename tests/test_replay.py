@@ -0,0 +1,91 @@
+###############################################################################
+# FILENAME: test_replay.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Cycles replayed from captured exchange traffic (replay.py)
+# reproduce the captured cycles exactly, every time, including from a gzip
+# capture whose process never closed it, and leave no replay state behind.
+###############################################################################
+import io
+import json
+import contextlib
+
+import pytest
+
+import replay
+from bot import Bot
+from config import config_params
+from exchanges import traffic
+from exchanges.client import ExchangeClient, orders_enabled
+from exchanges.balances import balance_cache
+from exchanges.simulator import SimulatedMarket
+from exchanges.traffic import TrafficReplay
+from utils.bot_log import BotLog
+from tests.conftest import make_history, price_row, bot_params
+
+
+CYCLES = 80
+
+
+@pytest.fixture
+def capture(tmp_path, monkeypatch, start_simulator):
+    """ Captures CYCLES cycles against a volatile simulated market. Returns (capture path, baseline rows path). """
+    path = str(tmp_path / 'capture.jsonl.gz')
+    monkeypatch.setitem(config_params, 'exchange_capture_file', path)
+    market = SimulatedMarket(prices={'BTC': 40000.0}, volatility=1.2, time_scale=3600 * 24 * 30, seed=5)
+    simulator = start_simulator(market)
+    coinbase_connection, falconx_connection = simulator.connections()
+    bot = Bot(bot_params())
+    log = BotLog.from_frame(make_history())
+    for i in range(CYCLES):
+        price_df = price_row(market.price('BTC'), i + 1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            traffic.mark_cycle(price_df, None, log)
+            bot.apply_strategy(log, price_df)
+            bot.execute_trades(log, coinbase_connection, falconx_connection, bot)
+            bot.evaluate_performance(log, new_rows=1)
+    traffic.get_traffic_log(path).close()
+    captured = log.to_frame(1)
+    assert set(captured['trade_status']) >= {'Buy', 'Sell'}
+    rows_path = str(tmp_path / 'rows.json')
+    with open(rows_path, 'w') as f:
+        json.dump({'rows': json.loads(captured.to_json(orient='records', double_precision=15))}, f)
+    return path, rows_path
+
+
+def test_replay_reproduces_the_capture(capture):
+    path, rows_path = capture
+    for _ in range(2):
+        replayed, timings = replay.replay(Bot(bot_params()), TrafficReplay(path))
+        assert len(timings) == CYCLES
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert replay.compare(replayed, rows_path) == 0
+
+
+def test_replay_of_an_unclosed_capture(capture, tmp_path):
+    path, rows_path = capture
+    with open(path, 'rb') as f:
+        data = f.read()
+    truncated = str(tmp_path / 'killed.jsonl.gz')
+    with open(truncated, 'wb') as f:
+        f.write(data[:len(data) * 2 // 3])    # as if the process died mid write
+    replayed, timings = replay.replay(Bot(bot_params()), TrafficReplay(truncated))
+    assert 0 < len(timings) < CYCLES
+    complete = len(replayed) - 1    # the last cycle's traffic may be cut short
+    with open(rows_path) as f:
+        rows = json.load(f)['rows'][:complete]
+    with open(rows_path, 'w') as f:
+        json.dump({'rows': rows}, f)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert replay.compare(replayed.iloc[:complete], rows_path) == 0
+
+
+def test_replay_restores_state(capture, monkeypatch):
+    path, rows_path = capture
+    monkeypatch.setitem(config_params, 'in_production', False)
+    clock = balance_cache.clock
+    replay.replay(Bot(bot_params()), TrafficReplay(path))
+    assert balance_cache.clock is clock
+    assert balance_cache.entries == {}
+    assert not orders_enabled(ExchangeClient('https://api.exchange.coinbase.com/'))
@@ -0,0 +1,82 @@
+###############################################################################
+# FILENAME: test_simulator.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The exchange simulator (exchanges/simulator.py) rejects bad
+# and stale signatures, rate limits and injects errors, and orders outside
+# production only go to a running simulator or a replay, never to a live url.
+###############################################################################
+import time
+import types
+import base64
+
+import pytest
+
+from exchanges import coinbase
+from exchanges.client import ExchangeClient, orders_enabled
+from exchanges.coinbase import CoinbaseExchangeAuth
+from exchanges.simulator import ExchangeSimulator, SIMULATOR_CREDENTIALS, MAX_TIMESTAMP_SKEW
+from exchanges.traffic import ReplayAdapter
+from config import config_params
+
+
+@pytest.fixture
+def simulator():
+    simulator = ExchangeSimulator(seed=1).start()
+    yield simulator
+    simulator.stop()
+
+
+def coinbase_client(simulator, secret=None):
+    api_key, simulator_secret, passphrase = SIMULATOR_CREDENTIALS['coinbase']
+    return ExchangeClient(simulator.coinbase_url, CoinbaseExchangeAuth(api_key, secret or simulator_secret, passphrase), retries=0)
+
+
+def test_signed_request(simulator):
+    assert coinbase_client(simulator).get('accounts').status_code == 200
+
+
+def test_bad_signature(simulator):
+    response = coinbase_client(simulator, secret=base64.b64encode(b'wrong-secret').decode()).get('accounts')
+    assert response.status_code == 401
+    assert simulator.stats['coinbase/accounts']['unauthorized'] == 1
+
+
+def test_stale_timestamp(simulator, monkeypatch):
+    stale = time.time() - MAX_TIMESTAMP_SKEW - 5
+    monkeypatch.setattr(coinbase, 'time', types.SimpleNamespace(time=lambda: stale))    # only the signing clock, not the simulator's
+    assert coinbase_client(simulator).get('accounts').status_code == 401
+
+
+def test_rate_limit():
+    with ExchangeSimulator(rate_limit='0.01:2', seed=1) as simulator:
+        client = coinbase_client(simulator)
+        assert [client.get('accounts').status_code for _ in range(3)] == [200, 200, 429]
+        assert simulator.stats['coinbase/accounts']['rate_limited'] == 1
+
+
+def test_error_injection():
+    with ExchangeSimulator(error_rate=1.0, seed=1) as simulator:
+        assert coinbase_client(simulator).get('accounts').status_code == 500
+        assert simulator.stats['coinbase/accounts']['errors'] == 1
+
+
+def test_orders_only_reach_local_venues(simulator, monkeypatch):
+    monkeypatch.setitem(config_params, 'in_production', False)
+    assert orders_enabled(coinbase_client(simulator))
+    assert not orders_enabled(ExchangeClient('https://api.exchange.coinbase.com/'))
+
+    replay_client = ExchangeClient('https://api.exchange.coinbase.com/')
+    replay_client.session.mount(replay_client.api_url, ReplayAdapter(None, replay_client.api_url))
+    assert orders_enabled(replay_client)
+
+    simulator.stop()    # a stopped simulator's port may be reused by anything
+    assert not orders_enabled(coinbase_client(simulator))
+
+
+def test_order_fills_on_the_simulator(simulator, monkeypatch):
+    monkeypatch.setitem(config_params, 'in_production', False)
+    response = coinbase.place_coinbase_market_order(coinbase_client(simulator), '1000', 'BTC-USD', 'buy', 'usd', 'btc')
+    assert response['product_id'] == 'BTC-USD'
+    assert len(simulator.market.fills) == 1
@@ -0,0 +1,70 @@
+###############################################################################
+# FILENAME: test_snapshot.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The concurrent market data fetch (exchanges/snapshot.py) waits
+# for every request until one shared deadline, records a late responder as
+# missed and keeps failures apart from timeouts.
+###############################################################################
+import time
+
+from exchanges.snapshot import fetch_concurrently
+
+
+def respond(value, delay=0.0):
+    def fetch(connection, argument):
+        time.sleep(delay)
+        return value
+    return fetch
+
+
+def fail(connection, argument):
+    raise ConnectionError('exchange down')
+
+
+def test_late_responder_is_missed_once_the_deadline_passes():
+    started = time.perf_counter()
+    snapshot = fetch_concurrently({
+        'coinbase_price:BTC': ('Coinbase', respond(40000.0, 0.05), (None, 'BTC')),
+        'falconx_quote:BTC': ('FalconX', respond('late quote', 1.0), (None, 'BTC')),
+    }, deadline=0.3)
+    elapsed = time.perf_counter() - started
+
+    assert 0.3 <= elapsed < 0.9    # waited for the deadline, not for the late response
+    assert snapshot.values == {'coinbase_price:BTC': 40000.0, 'falconx_quote:BTC': None}
+    assert snapshot.missed == {'falconx_quote:BTC'}
+    assert snapshot.missed_venues == {'FalconX'}
+    assert snapshot.errors == {}    # timed out, not failed
+    assert set(snapshot.timings) == set(snapshot.received) == {'coinbase_price:BTC'}
+    assert snapshot.available('Coinbase') and not snapshot.available('FalconX')
+    assert snapshot.received_at('falconx_quote:BTC') is None
+
+
+def test_requests_run_concurrently():
+    started = time.perf_counter()
+    snapshot = fetch_concurrently({'coinbase_account:' + str(i): ('Coinbase', respond(float(i), 0.2), (None, str(i))) for i in range(4)}, deadline=1.0)
+    assert time.perf_counter() - started < 0.6    # four 0.2 s requests, not 0.8 s back to back
+    assert not snapshot.missed
+
+
+def test_failure_is_recorded_with_its_error():
+    snapshot = fetch_concurrently({
+        'falconx_balance:USD': ('FalconX', fail, (None, 'USD')),
+        'falconx_balance:BTC': ('FalconX', respond(1.5), (None, 'BTC')),
+    }, deadline=1.0)
+    assert snapshot.missed == {'falconx_balance:USD'}
+    assert isinstance(snapshot.errors['falconx_balance:USD'], ConnectionError)
+    assert snapshot.available('FalconX', fields=['falconx_balance:BTC'])
+
+
+def test_view_renames_the_fields():
+    snapshot = fetch_concurrently({
+        'coinbase_price:BTC': ('Coinbase', respond(40000.0), (None, 'BTC')),
+        'falconx_quote:BTC': ('FalconX', respond('late quote', 1.0), (None, 'BTC')),
+    }, deadline=0.2)
+    view = snapshot.view({'coinbase_price': 'coinbase_price:BTC', 'falconx_quote': 'falconx_quote:BTC'})
+    assert view.coinbase_price == 40000.0
+    assert view.falconx_price is None
+    assert view.missed == {'falconx_quote'}
+    assert view.get('falconx_quote', 'none') == 'none'
@@ -0,0 +1,86 @@
+###############################################################################
+# FILENAME: test_streaming.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The streaming indicators (utils/streaming.py) give the same
+# values as their batch functions in utils/indicators.py, including across a
+# save / restore of their state.
+###############################################################################
+import numpy as np
+import pytest
+
+from utils import indicators
+from utils.streaming import STREAMING_INDICATORS, RollingWindow, StreamingIndicator, load_indicator
+from tests.conftest import make_price_frame
+
+
+WINDOW = 14
+CASES = {    # batch function name -> (batch call, output column, bar values in update() order)
+    'bollinger_band': (lambda df: indicators.bollinger_band(df, 'c', WINDOW, 2), str(WINDOW) + '__BBands', ['c'], (WINDOW, 2)),
+    'roc': (lambda df: indicators.roc(df, 'c', WINDOW), str(WINDOW) + ' _ROC', ['c'], (WINDOW,)),
+    'sma': (lambda df: indicators.sma(df, 'c', WINDOW), str(WINDOW) + ' _SMA', ['c'], (WINDOW,)),
+    'zlema': (lambda df: indicators.zlema(df, 'c', WINDOW), str(WINDOW) + '__ZLEMA', ['c'], (WINDOW,)),
+    'momentum': (lambda df: indicators.momentum(df, 'c', WINDOW), str(WINDOW) + ' _momentum', ['c'], (WINDOW,)),
+    'cci': (lambda df: indicators.cci(df, 'h', 'l', 'c', WINDOW), str(WINDOW) + '__CCI', ['h', 'l', 'c'], (WINDOW,)),
+    'rsi': (lambda df: indicators.rsi(df, 'c', WINDOW), str(WINDOW) + ' _RSI', ['c'], (WINDOW,)),
+    'money_flow_index': (lambda df: indicators.money_flow_index(df, 'c', 'h', 'l', 'v', WINDOW), str(WINDOW) + '__MFI', ['c', 'h', 'l', 'v'], (WINDOW,)),
+    'chande_momentum_oscillator': (lambda df: indicators.chande_momentum_oscillator(df, 'c', WINDOW), str(WINDOW) + ' _CMO', ['c'], (WINDOW,)),
+    'annualized_historical_volatility': (lambda df: indicators.annualized_historical_volatility(df, 'c', WINDOW), str(WINDOW) + '__volatility', ['c'], (WINDOW,)),
+    'garman_klass_volatility': (lambda df: indicators.garman_klass_volatility(df, 'o', 'h', 'l', 'c', WINDOW), str(WINDOW) + '__garman.klass', ['o', 'h', 'l', 'c'], (WINDOW,)),
+    'vwap': (lambda df: indicators.vwap(df, 'c', 'h', 'l', 'v', WINDOW), str(WINDOW) + '__VWAP', ['c', 'h', 'l', 'v'], (WINDOW,)),
+}
+
+
+def test_every_streaming_indicator_has_a_case():
+    assert set(CASES) == set(STREAMING_INDICATORS)
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_streaming_matches_batch(name):
+    batch, column, labels, args = CASES[name]
+    df = make_price_frame(1000, seed=1)
+    expected = batch(df)[column].to_numpy(dtype=np.float64)
+
+    indicator = STREAMING_INDICATORS[name](*args)
+    bars = df[labels].to_numpy()
+    values = []
+    for i, bar in enumerate(bars):
+        if i == len(bars) // 2:    # resume from saved state half way through
+            indicator = load_indicator(indicator.to_json())
+        values.append(indicator.update(*bar))
+
+    np.testing.assert_array_equal(np.isnan(values), np.isnan(expected))
+    np.testing.assert_allclose(values, expected, rtol=1e-6, atol=1e-6, equal_nan=True)
+
+
+def test_streaming_indicator_needs_update():
+    class NoUpdate(StreamingIndicator):
+        pass
+
+    with pytest.raises(TypeError):
+        NoUpdate()
+
+
+@pytest.mark.parametrize('name', ['sma', 'bollinger_band', 'cci'])
+def test_nan_bar_only_blanks_its_windows(name):
+    batch, column, labels, args = CASES[name]
+    df = make_price_frame(300, seed=2)
+    df.loc[100, labels] = np.nan    # a missing bar mid stream
+    expected = batch(df)[column].to_numpy(dtype=np.float64)
+
+    indicator = STREAMING_INDICATORS[name](*args)
+    values = [indicator.update(*bar) for bar in df[labels].to_numpy()]
+
+    assert np.isnan(values[100:100 + WINDOW]).all()
+    assert not np.isnan(values[100 + WINDOW:]).any()
+    np.testing.assert_allclose(values, expected, rtol=1e-6, atol=1e-6, equal_nan=True)
+
+
+def test_rolling_window_leaves_nan_out_of_the_totals():
+    window = RollingWindow(3)
+    for value in [1.0, np.nan, 2.0, 3.0, 4.0]:
+        window.push(value)
+    assert window.nans == 0
+    assert window.average() == pytest.approx(3.0)
+    assert window.std() == pytest.approx(1.0)
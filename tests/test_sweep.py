@@ -0,0 +1,59 @@
+###############################################################################
+# FILENAME: test_sweep.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The parameter sweep (sweep.py) resumes from its checkpoint,
+# and only reuses checkpoint rows of the current grid and price data.
+###############################################################################
+from sweep import run_sweep
+from tests.conftest import make_price_frame
+
+
+GRID = {'threshold': [39500, 40000, 40500], 'bet': [1000, 5000]}
+
+
+def test_resume_runs_nothing_twice(tmp_path, capsys):
+    checkpoint = str(tmp_path / 'sweep.jsonl')
+    price_df = make_price_frame(2000, seed=6)
+    first = run_sweep(price_df, GRID, processes=1, checkpoint_path=checkpoint)
+    resumed = run_sweep(price_df, GRID, processes=1, checkpoint_path=checkpoint)
+    assert 'Sweeping 0 of 6' in capsys.readouterr().out
+    assert len(first) == len(resumed) == 6
+    assert 'fingerprint' not in resumed.columns
+    assert resumed.equals(first)
+
+
+def test_smaller_grid_returns_only_its_rows(tmp_path):
+    checkpoint = str(tmp_path / 'sweep.jsonl')
+    price_df = make_price_frame(2000, seed=6)
+    run_sweep(price_df, GRID, processes=1, checkpoint_path=checkpoint)
+    ranked = run_sweep(price_df, {'threshold': [40000], 'bet': [1000, 5000]}, processes=1, checkpoint_path=checkpoint)
+    assert sorted(zip(ranked['threshold'], ranked['bet'])) == [(40000, 1000), (40000, 5000)]
+
+
+def test_other_price_data_is_rerun(tmp_path, capsys):
+    checkpoint = str(tmp_path / 'sweep.jsonl')
+    run_sweep(make_price_frame(2000, seed=6), GRID, processes=1, checkpoint_path=checkpoint)
+    capsys.readouterr()
+    other_df = make_price_frame(2000, seed=7)
+    ranked = run_sweep(other_df, GRID, processes=1, checkpoint_path=checkpoint)
+    assert 'Sweeping 6 of 6' in capsys.readouterr().out
+    assert ranked.equals(run_sweep(other_df, GRID, processes=1))
+
+
+def test_resume_across_grids_with_other_dimensions(tmp_path, capsys):
+    checkpoint = str(tmp_path / 'sweep.jsonl')
+    price_df = make_price_frame(2000, seed=6)
+    run_sweep(price_df, dict(GRID, falconx_fee_estimate=[0.05]), processes=1, checkpoint_path=checkpoint)
+    capsys.readouterr()
+
+    ranked = run_sweep(price_df, GRID, processes=1, checkpoint_path=checkpoint)    # default fee, a different backtest
+    assert 'Sweeping 6 of 6' in capsys.readouterr().out
+    assert 'falconx_fee_estimate' not in ranked.columns
+    assert ranked.equals(run_sweep(price_df, GRID, processes=1))
+
+    explicit = run_sweep(price_df, dict(GRID, falconx_fee_estimate=[0.0]), processes=1, checkpoint_path=checkpoint)    # same backtests as the default
+    assert 'Sweeping 0 of 6' in capsys.readouterr().out
+    assert explicit.drop(columns='falconx_fee_estimate').equals(ranked)
+    assert (explicit['falconx_fee_estimate'] == 0.0).all()
@@ -0,0 +1,96 @@
+###############################################################################
+# FILENAME: test_tracing.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The tick-to-trade trace (utils/tracing.py) stamps every stage
+# of a traded cycle in order on the bot log row, only the decision on a
+# cycle that does not trade, and the report derives the latencies from the
+# stamps.
+###############################################################################
+import io
+import time
+import contextlib
+import contextvars
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bot import Bot
+from base import TRACE_COLUMNS
+from exchanges.simulator import SimulatedMarket
+from utils import tracing
+from utils.bot_log import BotLog
+from tests.conftest import make_history, price_row, bot_params
+
+
+def test_cycle_stamps(start_simulator):
+    simulator = start_simulator(SimulatedMarket(prices={'BTC': 39000.0}, volatility=0.0, seed=1))
+    coinbase_connection, falconx_connection = simulator.connections()
+    bot = Bot(bot_params())
+    log = BotLog.from_frame(make_history())
+    published_at = time.time()
+    for _ in range(2):    # the first cycle only decides, the second buys
+        price_df = price_row(39000.0, published_at)
+        with contextlib.redirect_stdout(io.StringIO()):
+            log = bot.apply_strategy(log, price_df)
+            log = bot.execute_trades(log, coinbase_connection, falconx_connection, bot)
+    waited, traded = log.to_frame(1)[['trade_status'] + TRACE_COLUMNS].to_dict('records')
+
+    assert waited['trade_status'] != 'Buy'
+    assert waited['price_published_at'] <= waited['price_observed_at'] <= waited['decision_made_at']
+    assert np.isnan([waited[stage + '_at'] for stage in ('quote_received', 'order_sent', 'order_acknowledged')]).all()
+
+    assert traded['trade_status'] == 'Buy'
+    assert traded['trace_id'] != waited['trace_id']
+    stamps = [traded[stage + '_at'] for stage in tracing.STAGES]
+    assert stamps[0] == pytest.approx(published_at)
+    assert stamps == sorted(stamps)
+    assert traded['price_age_ms'] == pytest.approx((traded['order_sent_at'] - traded['price_observed_at']) * 1000)
+    assert traded['tick_to_trade_ms'] == pytest.approx((traded['order_acknowledged_at'] - traded['price_observed_at']) * 1000)
+
+
+def test_mark():
+    def run():
+        tracing.mark('order_sent')    # no trace in this context, nothing to stamp
+        assert tracing.current_trace() is None
+        trace = tracing.start_trace(price_observed_at=100.0, price_published_at=99.5)
+        tracing.mark('quote_received', at=100.25)
+        tracing.mark('quote_received', at=100.5)    # a re-quote replaces the stamp
+        tracing.mark('order_sent', at=101.0)
+        with pytest.raises(ValueError):
+            tracing.mark('order_filled')
+        return trace
+
+    trace = contextvars.Context().run(run)
+    row = trace.breakdown()
+    assert list(row) == TRACE_COLUMNS
+    assert (row['price_published_at'], row['quote_received_at'], row['price_age_ms']) == (99.5, 100.5, 1000.0)
+    assert np.isnan(row['decision_made_at']) and np.isnan(row['tick_to_trade_ms'])
+
+
+def test_price_time():
+    assert tracing.price_time(price_row(40000.0, 1700000000)) == 1700000000.0
+    assert tracing.price_time(price_row(40000.0, '2023-11-14 22:13:20')) == 1700000000.0
+    assert tracing.price_time(price_row(40000.0).drop(columns='time')) is None
+    assert tracing.price_time(None) is None
+
+
+def test_latency_breakdown_and_report():
+    df = pd.DataFrame([
+        {'trace_id': 'a', 'exchange_selected': 'Coinbase', 'price_published_at': 99.9, 'price_observed_at': 100.0, 'decision_made_at': 100.001,
+         'quote_received_at': 100.011, 'order_sent_at': 100.012, 'order_acknowledged_at': 100.032},
+        {'trace_id': 'b', 'exchange_selected': 'None', 'price_published_at': 199.9, 'price_observed_at': 200.0, 'decision_made_at': 200.001,
+         'quote_received_at': np.nan, 'order_sent_at': np.nan, 'order_acknowledged_at': np.nan},
+    ])
+    breakdown = tracing.latency_breakdown(df)
+    assert list(breakdown['trace_id']) == ['a']
+    expected = {'feed_ms': 100.0, 'decision_ms': 1.0, 'quote_ms': 10.0, 'order_ms': 1.0, 'ack_ms': 20.0, 'price_age_ms': 12.0, 'tick_to_trade_ms': 32.0, 'publish_to_trade_ms': 132.0}
+    for column, ms in expected.items():
+        assert breakdown[column].iloc[0] == pytest.approx(ms, abs=1e-6)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = tracing.report(df)
+    assert result.loc[('all', 'tick_to_trade_ms'), 'trades'] == 1
+    assert result.loc[('all', 'tick_to_trade_ms'), 'p50'] == pytest.approx(32.0, abs=1e-6)
@@ -0,0 +1,122 @@
+###############################################################################
+# FILENAME: test_trigger.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: The threshold trigger (utils/trigger.py) only changes zone
+# past the hysteresis band, fires once the new zone has held for the debounce
+# time, and the event driven mode retries a run that did not settle.
+###############################################################################
+import time
+import types
+
+import pytest
+
+import run
+from bot import Bot
+from exchanges.price_feed import PriceTick, LocalPriceFeed
+from utils import trigger
+from utils.trigger import ThresholdTrigger, BELOW, ABOVE
+from tests.conftest import bot_params
+
+
+class Clock:
+    """ perf_counter() stand in, moved by hand. """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(trigger, 'time', types.SimpleNamespace(perf_counter=clock))
+    return clock
+
+
+def tick(clock, price, after=0.0):
+    clock.now = clock.now + after
+    return PriceTick(price, received_at=clock.now)
+
+
+def start(trigger_, clock, price):
+    """ Settles the trigger's starting zone. """
+    trigger_.update(tick(clock, price))
+    return trigger_.update(tick(clock, price, after=trigger_.debounce))
+
+
+def test_first_zone_fires_once_it_has_held(clock):
+    trigger_ = ThresholdTrigger(40000, hysteresis=25.0, debounce=2.0)
+    assert trigger_.update(tick(clock, 40010.0)) is None    # no hysteresis before the first zone
+    event = trigger_.update(tick(clock, 40010.0, after=2.0))
+    assert (event.zone, event.previous_zone) == (ABOVE, None)
+
+
+def test_hysteresis_keeps_the_zone(clock):
+    trigger_ = ThresholdTrigger(40000, hysteresis=25.0)
+    start(trigger_, clock, 39990.0)
+    for price in [40000.0, 40024.9, 39980.0, 40010.0]:    # wobbling inside the band
+        assert trigger_.update(tick(clock, price, after=1.0)) is None
+    event = trigger_.update(tick(clock, 40025.0, after=1.0))
+    assert (event.zone, event.previous_zone) == (ABOVE, BELOW)
+    assert trigger_.update(tick(clock, 39990.0, after=1.0)) is None    # above now, so the band is below the threshold
+    assert trigger_.update(tick(clock, 39974.9, after=1.0)).zone == BELOW
+
+
+def test_debounce_waits_for_the_zone_to_hold(clock):
+    trigger_ = ThresholdTrigger(40000, debounce=2.0)
+    start(trigger_, clock, 40100.0)
+    assert trigger_.update(tick(clock, 39900.0, after=1.0)) is None    # crossing starts
+    assert trigger_.update(tick(clock, 39900.0, after=1.5)) is None    # 1.5 s held
+    event = trigger_.update(tick(clock, 39900.0, after=0.5))    # 2 s held
+    assert event.zone == BELOW
+    assert event.fired_at - event.crossed_at == pytest.approx(2.0)
+    assert trigger_.fires == 2
+
+
+def test_debounce_cancelled_by_a_tick_back_in_the_old_zone(clock):
+    trigger_ = ThresholdTrigger(40000, debounce=2.0)
+    start(trigger_, clock, 40100.0)
+    trigger_.update(tick(clock, 39900.0, after=1.0))
+    assert trigger_.update(tick(clock, 40100.0, after=1.0)) is None
+    assert trigger_.update(tick(clock, 39900.0, after=1.5)) is None    # the debounce starts over
+    assert trigger_.cancelled == 1
+    assert trigger_.update(tick(clock, 39900.0, after=2.0)).zone == BELOW
+
+
+def test_retry_and_settled(clock):
+    trigger_ = ThresholdTrigger(40000, debounce=2.0)
+    assert trigger_.settled(None)    # no zone yet
+    start(trigger_, clock, 39900.0)
+    assert trigger_.settled('Buy') and trigger_.settled('Hold')
+    assert not trigger_.settled('No Action') and not trigger_.settled(None)
+
+    event = trigger_.retry(tick(clock, 39900.0, after=30.0))
+    assert (event.zone, event.previous_zone) == (BELOW, BELOW)
+    assert trigger_.retries == 1
+
+    trigger_.update(tick(clock, 40100.0, after=1.0))    # a crossing waiting out its debounce
+    assert trigger_.retry(tick(clock, 40100.0, after=0.5)) is None
+    assert trigger_.retries == 1
+
+
+def test_event_driven_mode_retries_until_the_run_settles(monkeypatch):
+    statuses = iter([RuntimeError('exchange down'), 'No Action', 'Buy'])    # fails, buy skipped, then the buy goes through
+    runs = []
+
+    def fake_run(bot, price_df=None, indicator=None, event=None):
+        runs.append((indicator, event.previous_zone))
+        event.strategy_done_at = event.order_done_at = time.perf_counter()
+        status = next(statuses)
+        if isinstance(status, Exception):
+            raise status
+        return types.SimpleNamespace(last=lambda col_name: status)
+
+    monkeypatch.setattr(run, 'run', fake_run)
+    bot = Bot(bot_params(threshold=40000, trigger_hysteresis=0.0, trigger_debounce=0.0, trigger_retry_interval=0.0))
+    events = run.run_event_driven(bot, LocalPriceFeed([39900.0, 39890.0, 39880.0, 39870.0, 39860.0]))
+    assert runs == [(39900.0, None), (39890.0, BELOW), (39880.0, BELOW)]    # no more runs once settled
+    assert len(events) == 3
@@ -0,0 +1,127 @@
+###############################################################################
+# FILENAME: batch.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Multi-window versions of the rolling indicators in
+# utils/indicators.py for parameter research. Each function takes a numpy
+# array and a list of rolling windows and returns one 2-D float array with a
+# row per input row and a column per window, computed from shared cumulative
+# sums instead of one full-frame call per window.
+###############################################################################
+import math
+import pandas as pd
+import numpy as np
+
+
+BLOCK_ROWS = 256    # rows per cumulative sum block (see rolling_moments), small blocks keep the sums accurate and cache friendly
+ANNUALIZED_FACTOR = 365    # same periods per year as utils.indicators.annualized_historical_volatility()
+
+
+# ENGINE
+def rolling_moments(values, rolling_windows, with_variance=True):
+    """ Rolling mean and sample variance (ddof=1) of "values" for every window in
+    "rolling_windows". Returns (means, variances), each shaped (rows, windows), with NaN
+    where the window is not full or holds a NaN (variances are left NaN when with_variance
+    is False).
+
+    Window sums are differences of cumulative sums (and cumulative sums of squares).
+    The cumulative sums restart every BLOCK_ROWS rows, on values centered around the
+    block's mean, so their magnitude (and so the rounding error of each difference)
+    stays small however long the history gets. """
+
+    x = np.asarray(values, dtype=np.float64)
+    windows = np.asarray(rolling_windows, dtype=np.int64)
+    n = len(x)
+    means = np.full((n, len(windows)), np.nan)
+    variances = np.full((n, len(windows)), np.nan)
+    if n == 0 or len(windows) == 0:
+        return means, variances
+
+    widest = int(windows.max())
+    block_rows = max(BLOCK_ROWS, 4 * widest)
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        lo = max(0, start - widest + 1)    # rows before the block needed by the widest window
+        segment = x[lo:stop]
+        missing = np.isnan(segment)
+        reference = segment[~missing].mean() if (~missing).any() else 0.0
+        centered = np.where(missing, 0.0, segment - reference)
+
+        cum_sum = np.concatenate(([0.0], np.cumsum(centered)))
+        cum_squares = np.concatenate(([0.0], np.cumsum(centered * centered))) if with_variance else None
+        cum_missing = np.concatenate(([0], np.cumsum(missing)))
+
+        rows = np.arange(start, stop)
+        end = rows - lo + 1    # cumulative sum index just past each window, one per row
+        begin = end[:, None] - windows[None, :]    # and where each window starts, shaped (rows, windows)
+        complete = rows[:, None] >= windows[None, :] - 1    # window is full...
+        if start < widest - 1:
+            begin = np.where(complete, begin, 0)
+        if missing.any():    # ...and holds no NaN
+            complete = complete & ((cum_missing[end][:, None] - cum_missing[begin]) == 0)
+
+        window_sum = cum_sum[end][:, None] - cum_sum[begin]
+        means[start:stop] = np.where(complete, window_sum / windows + reference, np.nan)
+        if with_variance:
+            window_squares = cum_squares[end][:, None] - cum_squares[begin]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                variance = np.maximum(window_squares - window_sum * window_sum / windows, 0.0) / (windows - 1)
+            variances[start:stop] = np.where(complete & (windows > 1), variance, np.nan)
+
+    return means, variances
+
+
+def lagged(values, rolling_windows):
+    """ values shifted by (window - 1) rows for every window, i.e. the price at the start of
+    each lookback period as used by roc() and momentum(). Shaped (rows, windows). """
+
+    x = np.asarray(values, dtype=np.float64)
+    periods = np.asarray(rolling_windows, dtype=np.int64) - 1
+    source = np.arange(len(x))[:, None] - periods[None, :]    # row each value comes from, shaped (rows, windows)
+    return np.where(source >= 0, x[np.maximum(source, 0)], np.nan)
+
+
+# INDICATORS
+def sma_windows(values, rolling_windows):
+    """ utils.indicators.sma() for every window. Shaped (rows, windows). """
+    means, _ = rolling_moments(values, rolling_windows, with_variance=False)
+    return means
+
+
+def roc_windows(values, rolling_windows):
+    """ utils.indicators.roc() for every window. Shaped (rows, windows). """
+    x = np.asarray(values, dtype=np.float64)[:, None]
+    previous_price = lagged(values, rolling_windows)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (x - previous_price) / previous_price
+
+
+def momentum_windows(values, rolling_windows):
+    """ utils.indicators.momentum() for every window. Shaped (rows, windows). """
+    x = np.asarray(values, dtype=np.float64)[:, None]
+    return x - lagged(values, rolling_windows)
+
+
+def bollinger_band_windows(values, rolling_windows, standard_deviation):
+    """ utils.indicators.bollinger_band() (normalized width) for every window. Shaped (rows, windows). """
+    bb_mid, variances = rolling_moments(values, rolling_windows)
+    band = standard_deviation * np.sqrt(variances)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return ((bb_mid + band) - (bb_mid - band)) / bb_mid
+
+
+def annualized_historical_volatility_windows(values, rolling_windows):
+    """ utils.indicators.annualized_historical_volatility() for every window. Shaped (rows, windows). """
+    x = np.asarray(values, dtype=np.float64)
+    interday_returns = np.full(len(x), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        interday_returns[1:] = np.log(x[1:] / x[:-1])
+    _, variances = rolling_moments(interday_returns, rolling_windows)
+    return math.sqrt(ANNUALIZED_FACTOR) * np.sqrt(variances)
+
+
+def to_frame(result, rolling_windows, name, index=None):
+    """ Wraps a (rows, windows) result in a data frame with (indicator, window) MultiIndex columns. """
+    columns = pd.MultiIndex.from_product([[name], list(rolling_windows)], names=['indicator', 'rolling_window'])
+    return pd.DataFrame(result, index=index, columns=columns)
@@ -0,0 +1,169 @@
+###############################################################################
+# FILENAME: bot_log.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: In-memory column store for the bot log. Every column is a
+# preallocated, typed numpy array that grows by doubling, so adding the row
+# for a run is a single write per column instead of a data frame append, and
+# filling in trade results never changes a column's dtype. trade_status, the
+# exchange columns and the win/loss labels are kept as small integer codes.
+# A data frame is only built when to_frame() is called.
+###############################################################################
+from base import TRADE_STATUSES, EXCHANGES, WIN_LOSS, HISTORY_COLUMNS
+from utils.lazy import lazy_import
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+
+CATEGORIES = {    # categorical columns -> labels their codes point into (code -1 is None)
+    'trade_status': TRADE_STATUSES,
+    'exchange_selected': EXCHANGES,
+    'nofee_win_loss': WIN_LOSS,
+    'fee_win_loss': WIN_LOSS,
+    'position_exchange': EXCHANGES,
+}
+MISSING_CODE = -1
+TEXT_COLUMNS = ['trace_id']    # history columns kept as python strings
+
+
+class BotLog:
+    """ Growable, typed column store with a fixed schema: the price columns (as given) followed
+    by base.HISTORY_COLUMNS. Categorical columns are int8 codes, TEXT_COLUMNS python strings, the
+    others float64 unless the price columns say otherwise. """
+
+    def __init__(self, price_columns, capacity=1024):
+        """ price_columns: dict of price column name -> numpy dtype (e.g. from a price data frame). """
+        self.schema = dict(price_columns)
+        for col_name in HISTORY_COLUMNS:
+            self.schema[col_name] = np.int8 if col_name in CATEGORIES else object if col_name in TEXT_COLUMNS else np.float64
+        self.capacity = max(1, capacity)
+        self.rows = 0
+        self.columns = {col_name: self._empty(dtype, self.capacity) for col_name, dtype in self.schema.items()}
+        self.codes = {col_name: {label: code for code, label in enumerate(labels)} for col_name, labels in CATEGORIES.items()}
+
+    @classmethod
+    def from_frame(cls, df, capacity=None):
+        """ Builds a log from a bot log data frame (e.g. the history store tail). """
+        price_columns = {col_name: _column_dtype(df[col_name]) for col_name in df.columns if col_name not in HISTORY_COLUMNS}
+        log = cls(price_columns, capacity=max(capacity or 0, 2 * len(df), 1024))
+        for col_name in log.schema:
+            if col_name not in df.columns:
+                continue
+            if col_name in CATEGORIES:
+                log.columns[col_name][:len(df)] = log.encode(col_name, df[col_name].to_numpy(dtype=object))
+            elif log.schema[col_name] == np.float64 and col_name in HISTORY_COLUMNS:
+                log.columns[col_name][:len(df)] = pd.to_numeric(df[col_name], errors='coerce').to_numpy(dtype=np.float64)    # e.g. placeholders logged as strings
+            else:
+                log.columns[col_name][:len(df)] = df[col_name].to_numpy()
+        log.rows = len(df)
+        return log
+
+    def __len__(self):
+        return self.rows
+
+    # writes
+    def append(self, row):
+        """ Commits one row (dict of column name -> value). Columns not given are left empty
+        (NaN, None or code -1). The first row of an empty log may bring new price columns. """
+        unknown = [col_name for col_name in row if col_name not in self.columns]
+        if unknown and self.rows:
+            raise KeyError('Columns ' + ', '.join(unknown) + ' are not in the bot log schema.')
+        for col_name in unknown:
+            self._add_price_column(col_name, row[col_name])
+        if self.rows == self.capacity:
+            self._grow()
+        for col_name, values in self.columns.items():
+            values[self.rows] = self._encode_value(col_name, row[col_name]) if col_name in row else self._missing(col_name)
+        self.rows = self.rows + 1
+
+    def update_last(self, values):
+        """ Overwrites columns of the last row (dict of column name -> value) in one call. """
+        self.update(self.rows - 1, values)
+
+    def update(self, row_number, values):
+        """ Overwrites columns of one row, or of a run of rows if the values are arrays starting at row_number. """
+        for col_name, value in values.items():
+            if col_name not in self.columns:
+                raise KeyError('Column ' + col_name + ' is not in the bot log schema.')
+            if np.ndim(value):
+                encoded = self.encode(col_name, np.asarray(value, dtype=object)) if col_name in CATEGORIES else value
+                self.columns[col_name][row_number:row_number + len(value)] = encoded
+            else:
+                self.columns[col_name][row_number] = self._encode_value(col_name, value)
+
+    # reads
+    def column(self, col_name):
+        """ Raw values of a column (codes for categorical columns), as a view. """
+        return self.columns[col_name][:self.rows]
+
+    def last(self, col_name, offset=1):
+        """ Decoded value of a column "offset" rows from the end (1 = last row). """
+        if offset < 1 or offset > self.rows:    # past either end would read the unused capacity
+            raise IndexError('Row ' + str(offset) + ' from the end is outside a bot log of ' + str(self.rows) + ' rows.')
+        value = self.columns[col_name][self.rows - offset]
+        return self.decode(col_name, value) if col_name in CATEGORIES else value
+
+    def to_frame(self, start=0):
+        """ Data frame of rows start onwards, categorical columns decoded to their labels. """
+        start = max(0, start)
+        data = {}
+        for col_name, values in self.columns.items():
+            values = values[start:self.rows]
+            data[col_name] = self.decode(col_name, values) if col_name in CATEGORIES else values.copy()
+        return pd.DataFrame(data, index=pd.RangeIndex(start, self.rows))
+
+    # codes
+    def encode(self, col_name, labels):
+        codes = self.codes[col_name]
+        return np.array([codes.get(label, MISSING_CODE) if isinstance(label, str) else MISSING_CODE for label in labels], dtype=np.int8)
+
+    def decode(self, col_name, codes):
+        labels = np.array(list(CATEGORIES[col_name]) + [None], dtype=object)    # code -1 picks the trailing None
+        return labels[codes]
+
+    # internals
+    def _encode_value(self, col_name, value):
+        if col_name in CATEGORIES:
+            return self.codes[col_name].get(value, MISSING_CODE) if isinstance(value, str) else MISSING_CODE
+        return value
+
+    def _missing(self, col_name):
+        if col_name in CATEGORIES:
+            return MISSING_CODE
+        kind = self.columns[col_name].dtype.kind
+        return np.nan if kind == 'f' else None if kind == 'O' else 0
+
+    def _add_price_column(self, col_name, value):
+        dtype = np.float64 if isinstance(value, (float, np.floating)) else np.int64 if isinstance(value, (int, np.integer)) and not isinstance(value, bool) else object
+        schema = {k: v for k, v in self.schema.items() if k not in HISTORY_COLUMNS}    # price columns stay ahead of the history columns
+        schema[col_name] = dtype
+        schema.update({k: v for k, v in self.schema.items() if k in HISTORY_COLUMNS})
+        self.schema = schema
+        self.columns[col_name] = self._empty(dtype, self.capacity)
+        self.columns = {k: self.columns[k] for k in schema}
+
+    def _grow(self):
+        self.capacity = self.capacity * 2
+        for col_name, values in self.columns.items():
+            grown = self._empty(values.dtype, self.capacity)
+            grown[:self.rows] = values[:self.rows]
+            self.columns[col_name] = grown
+
+    def _empty(self, dtype, size):
+        dtype = np.dtype(dtype)
+        if dtype.kind == 'f':
+            return np.full(size, np.nan, dtype=dtype)
+        if dtype.kind == 'O':
+            return np.full(size, None, dtype=object)
+        return np.zeros(size, dtype=dtype)
+
+
+def _column_dtype(series):
+    """ Storage dtype for a price column: ints and floats stay numeric, anything else (e.g. timestamp strings) is object. """
+    if series.dtype.kind in 'iu':
+        return np.int64
+    if series.dtype.kind == 'f':
+        return np.float64
+    return object
@@ -0,0 +1,234 @@
+###############################################################################
+# FILENAME: cache.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Memoizing cache for the indicator functions in
+# utils/indicators.py. Results are keyed on the function and its parameters,
+# and reused while the last rows of the input columns they were computed from
+# are unchanged. When the input only gained rows at the end, the cached prefix
+# is extended instead of recomputed.
+#
+# Example:
+#   cache = IndicatorCache(max_bytes=256 * 2 ** 20, disk_dir='/tmp/indicator_cache')
+#   df = cache.compute(indicators.rsi, price_df, 'c', 14)
+#   print(cache.stats())
+###############################################################################
+import os
+import math
+import pickle
+import hashlib
+import inspect
+from collections import OrderedDict
+import numpy as np
+
+
+FLOAT_EPSILON = 1e-16    # relative error allowed when extending a recursive indicator
+CHECK_ROWS = 64    # rows at the end of a cached input compared on every lookup
+
+
+# LOOKBACK RULES
+# Rows of history before the first new row that an indicator needs to reproduce the
+# new rows exactly. Indicators without a rule are always recomputed in full.
+def _windows(params):
+    rolling_window = params['rolling_window']
+    return [rolling_window] if isinstance(rolling_window, int) else list(rolling_window)
+
+
+def _rolling_lookback(params):
+    return max(_windows(params)) + 1    # +1 for the indicators that use a one bar change
+
+
+def _recursive_lookback(decay):
+    """ Recursive (ema style) indicators depend on the whole history, but the weight of a
+    row k rows back is decay ** k. Rows beyond the point where that weight drops below
+    float precision cannot change the result. """
+    def lookback(params):
+        rolling_window = params['rolling_window']
+        return rolling_window + 1 + int(math.ceil(math.log(FLOAT_EPSILON) / math.log(decay(rolling_window))))
+    return lookback
+
+
+LOOKBACK = {
+    'bollinger_band': _rolling_lookback,
+    'roc': _rolling_lookback,
+    'sma': _rolling_lookback,
+    'momentum': _rolling_lookback,
+    'cci': _rolling_lookback,
+    'money_flow_index': _rolling_lookback,
+    'chande_momentum_oscillator': _rolling_lookback,
+    'annualized_historical_volatility': _rolling_lookback,
+    'garman_klass_volatility': _rolling_lookback,
+    'vwap': _rolling_lookback,
+    'zlema': _recursive_lookback(lambda w: 1 - 2 / (w + 1)),
+    'rsi': _recursive_lookback(lambda w: (w - 1) / w),
+}
+
+
+# CACHE
+class IndicatorCache:
+    """ Two tier (memory, then optional disk) cache of indicator results.
+
+    The memory tier is an LRU capped at max_bytes of cached arrays. The disk tier is
+    written through on every store and is also LRU (by file access time) when
+    max_disk_bytes is set. Counters are available from stats().
+
+    A lookup compares only the last CHECK_ROWS rows the entry was computed from with the
+    same rows of the new input, so its cost does not grow with the history. Inputs are
+    expected to grow by appending rows (as the bot's history does): after rewriting older
+    rows, clear() the cache and empty disk_dir. """
+
+    policy = 'lru'
+
+    def __init__(self, max_bytes=256 * 2 ** 20, disk_dir=None, max_disk_bytes=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.entries = OrderedDict()    # key -> entry, least recently used first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self.evictions = 0    # memory tier
+        self.disk_hits = 0
+        self.disk_evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def compute(self, func, input_df, *args, **kwargs):
+        """ Same as func(input_df, *args, **kwargs), served from the cache when possible. """
+        params = inspect.signature(func).bind(input_df, *args, **kwargs).arguments
+        params.pop(next(iter(params)))    # drop the data frame itself
+        labels = [v for k, v in params.items() if k.endswith('_label')]
+        key = (func.__module__, func.__name__, tuple(labels), tuple((k, _freeze(v)) for k, v in params.items() if not k.endswith('_label')))
+
+        rows = len(input_df)
+        entry = self._get(key)
+
+        if entry is not None and entry['rows'] <= rows and np.array_equal(_last_rows(input_df, labels, entry['rows']), entry['last_rows'], equal_nan=True):
+            if entry['rows'] == rows:    # same data, plain hit
+                self.hits = self.hits + 1
+                return _attach(input_df, entry['columns'])
+            lookback = LOOKBACK.get(func.__name__)
+            if lookback is not None:    # rows were only appended, extend the cached prefix
+                self.extensions = self.extensions + 1
+                start = max(0, entry['rows'] - lookback(params))
+                tail_df = func(input_df.iloc[start:], *args, **kwargs)
+                columns = {}
+                for col_name, values in entry['columns'].items():
+                    columns[col_name] = np.concatenate((values, tail_df[col_name].to_numpy()[entry['rows'] - start:]))
+                self._put(key, {'rows': rows, 'last_rows': _last_rows(input_df, labels, rows), 'columns': columns})
+                return _attach(input_df, columns)
+
+        self.misses = self.misses + 1
+        result_df = func(input_df, *args, **kwargs)
+        columns = {col_name: result_df[col_name].to_numpy() for col_name in result_df.columns if col_name not in input_df.columns}
+        self._put(key, {'rows': rows, 'last_rows': _last_rows(input_df, labels, rows), 'columns': columns})
+        return result_df
+
+    def wrap(self, func):
+        """ Returns a cached version of func with the same call signature. """
+        def cached(input_df, *args, **kwargs):
+            return self.compute(func, input_df, *args, **kwargs)
+        cached.__name__ = func.__name__
+        cached.__doc__ = func.__doc__
+        return cached
+
+    def stats(self):
+        return {
+            'policy': self.policy,
+            'hits': self.hits,
+            'misses': self.misses,
+            'extensions': self.extensions,
+            'disk_hits': self.disk_hits,
+            'evictions': self.evictions,
+            'disk_evictions': self.disk_evictions,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def clear(self):
+        """ Empties the memory tier (the disk tier is left alone). """
+        self.entries.clear()
+        self.bytes = 0
+
+    # memory tier
+    def _get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        entry = self._read_disk(key)
+        if entry is not None:
+            self.disk_hits = self.disk_hits + 1
+            self._store_memory(key, entry)
+        return entry
+
+    def _put(self, key, entry):
+        self._store_memory(key, entry)
+        self._write_disk(key, entry)
+
+    def _store_memory(self, key, entry):
+        entry['nbytes'] = sum(values.nbytes for values in entry['columns'].values())
+        if key in self.entries:
+            self.bytes = self.bytes - self.entries.pop(key)['nbytes']
+        if entry['nbytes'] > self.max_bytes:    # would evict everything else and still not fit
+            return
+        self.entries[key] = entry
+        self.bytes = self.bytes + entry['nbytes']
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes = self.bytes - evicted['nbytes']
+            self.evictions = self.evictions + 1
+
+    # disk tier
+    def _path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(repr(key).encode()).hexdigest() + '.pkl')
+
+    def _read_disk(self, key):
+        if not self.disk_dir or not os.path.exists(self._path(key)):
+            return None
+        with open(self._path(key), 'rb') as f:
+            entry = pickle.load(f)
+        os.utime(self._path(key))    # mark as recently used
+        return entry
+
+    def _write_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+        temporary_path = self._path(key) + '.tmp'
+        with open(temporary_path, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, self._path(key))    # atomic, a crash never leaves half a file
+        if self.max_disk_bytes is not None:
+            self._trim_disk()
+
+    def _trim_disk(self):
+        files = [os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir) if name.endswith('.pkl')]
+        files.sort(key=os.path.getmtime)    # least recently used first
+        total = sum(os.path.getsize(path) for path in files)
+        while files and total > self.max_disk_bytes:
+            path = files.pop(0)
+            total = total - os.path.getsize(path)
+            os.remove(path)
+            self.disk_evictions = self.disk_evictions + 1
+
+
+# HELPERS
+def _freeze(value):
+    """ Makes list parameters (e.g. cci windows) usable in a cache key. """
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _last_rows(input_df, labels, rows):
+    """ The last CHECK_ROWS of the first "rows" rows of the input columns, shaped (rows, labels). """
+    start = max(0, rows - CHECK_ROWS)
+    return np.column_stack([input_df[label].iloc[start:rows].to_numpy(dtype=np.float64) for label in labels])
+
+
+def _attach(input_df, columns):
+    """ Returns a copy of input_df with the cached result columns appended, like the indicator functions do. """
+    df = input_df.copy()
+    for col_name, values in columns.items():
+        df[col_name] = values
+    return df
@@ -0,0 +1,130 @@
+###############################################################################
+# FILENAME: filters.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Recursive-filter engine used by the exponential and Wilder
+# style indicators. Every function takes a numpy array and returns a numpy
+# array of the same length.
+###############################################################################
+import math
+import numpy as np
+
+
+# Smallest decay power allowed inside one block. Keeps the inverse powers used
+# by the closed form solution well inside float64 range.
+DECAY_FLOOR = 1e-100
+MAX_BLOCK_SIZE = 65536
+
+
+# ENGINE
+def linear_filter(values, decay, gain, start, initial):
+    """ First order recursive filter evaluated over a whole array at once.
+
+    y[start] = initial
+    y[i] = decay * y[i - 1] + gain * values[i]    for i > start
+
+    Rows before "start" are NaN. The recursion is solved in closed form one block
+    at a time (cumulative sum of the input scaled by inverse decay powers), so the
+    only Python level loop is over blocks, not rows. """
+
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    out = np.full(n, np.nan)
+    if start < 0 or start >= n:
+        return out
+    if not 0 <= decay <= 1:
+        raise ValueError("decay must be between 0 and 1")
+
+    out[start] = initial
+    if decay == 0:    # no memory, output is just the scaled input
+        out[start + 1:] = gain * x[start + 1:]
+        return out
+    if decay == 1:    # no decay, output is a running sum
+        out[start + 1:] = initial + gain * np.cumsum(x[start + 1:])
+        return out
+
+    block_size = int(min(MAX_BLOCK_SIZE, max(1, math.floor(math.log(DECAY_FLOOR) / math.log(decay)))))
+    powers = decay ** np.arange(1, block_size + 1)    # decay^1 ... decay^block_size
+    inverse_powers = 1 / powers
+
+    state = initial
+    position = start + 1
+    while position < n:
+        m = min(block_size, n - position)
+        block = np.cumsum(x[position:position + m] * inverse_powers[:m])    # sum of decay^-k * x[k]
+        out[position:position + m] = powers[:m] * (state + gain * block)    # y[j] = decay^j * (y0 + gain * sum)
+        state = out[position + m - 1]
+        position = position + m
+
+    return out
+
+
+# AVERAGES
+def ema_array(values, rolling_window):
+    """ Classic exponential moving average with smoothing factor 2 / (rolling_window + 1).
+    Seeded with the simple average of the first "rolling_window" valid values. """
+
+    smoothing_factor = 2 / (rolling_window + 1)
+    return _seeded_average(values, rolling_window, 1 - smoothing_factor, smoothing_factor)
+
+
+def wilder_array(values, rolling_window):
+    """ Wilder's smoothed moving average (the average used by RSI), equivalent to an
+    exponential average with smoothing factor 1 / rolling_window. Seeded with the
+    simple average of the first "rolling_window" valid values. """
+
+    return _seeded_average(values, rolling_window, (rolling_window - 1) / rolling_window, 1 / rolling_window)
+
+
+def _seeded_average(values, rolling_window, decay, gain):
+    """ Skips leading NaNs, seeds the filter with the simple average of the first full
+    window and then applies the recursion to every row after it. """
+
+    x = np.asarray(values, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(x))
+    first = valid[0] if len(valid) else len(x)
+    start = first + rolling_window - 1    # first row with a full window
+    if start >= len(x):
+        return np.full(len(x), np.nan)
+    seed = x[first:start + 1].mean()
+    return linear_filter(x, decay, gain, start, seed)
+
+
+# INDICATORS
+def zlema_array(values, rolling_window):
+    """ Zero lag exponential moving average. Applies the exponential average to the
+    de-lagged series close + (close - close[lag]), starting from the close of the
+    lagged row. Same numbers as utils.indicators.zlema(). """
+
+    x = np.asarray(values, dtype=np.float64)
+    lag = int(math.floor((rolling_window - 1) / 2))
+    smoothing_factor = 2 / (rolling_window + 1)
+
+    if lag == 0:    # nothing to de-lag, plain exponential average of the close
+        start = 0
+        delagged = x
+    else:
+        start = lag - 1
+        delagged = np.full(len(x), np.nan)
+        delagged[lag:] = x[lag:] + (x[lag:] - x[:-lag])
+
+    if start >= len(x):
+        return np.full(len(x), np.nan)
+    return linear_filter(delagged, 1 - smoothing_factor, smoothing_factor, start, x[start])
+
+
+def rsi_array(values, rolling_window):
+    """ Wilder's relative strength index. Same numbers as utils.indicators.rsi(). """
+
+    x = np.asarray(values, dtype=np.float64)
+    change = np.full(len(x), np.nan)
+    change[1:] = np.diff(x)
+    gain = np.clip(change, 0, None)    # NaN stays NaN
+    loss = np.abs(np.clip(change, None, 0))
+
+    avg_gain = wilder_array(gain, rolling_window)
+    avg_loss = wilder_array(loss, rolling_window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
@@ -0,0 +1,188 @@
+###############################################################################
+# FILENAME: history_store.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Append-only store for the bot history log. New rows go to a
+# small json lines journal (one append per cycle), full journals are sealed into
+# Parquet segments, and small segments are periodically compacted into
+# bigger ones. Reads of the last few rows only touch the journal and the
+# newest segment(s).
+#
+# Layout of the store directory:
+#   manifest.json               segment list with row counts, journal row count, column dtypes
+#   journal.jsonl               rows appended since the last seal
+#   segment_000001.parquet ...  sealed, immutable columnar segments
+###############################################################################
+import os
+import json
+
+from utils.lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+
+MANIFEST_FILENAME = 'manifest.json'
+JOURNAL_FILENAME = 'journal.jsonl'
+
+
+class HistoryStore:
+    """ Append-only, segmented history log. Segments need a Parquet engine (pyarrow). """
+
+    def __init__(self, directory, segment_rows=1000, compact_segments=16, compact_rows=100000):
+        self.directory = directory
+        self.segment_rows = segment_rows    # journal rows that trigger a seal
+        self.compact_segments = compact_segments    # segment count that triggers a compaction
+        self.compact_rows = compact_rows    # target rows per compacted segment
+        self.changed = set()    # files written since the last upload
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = self._read_manifest()
+
+    # reads
+    def __len__(self):
+        return sum(segment['rows'] for segment in self.manifest['segments']) + self.manifest['journal_rows']
+
+    def read(self):
+        """ Returns the whole history as one data frame. """
+        frames = [self._read_segment(segment) for segment in self.manifest['segments']]
+        frames.append(self._read_journal())
+        return _concat(frames)
+
+    def read_tail(self, rows):
+        """ Returns the last "rows" rows of the history, reading only the journal and as many
+        of the newest segments as needed. """
+        frames = [self._read_journal()]
+        available = len(frames[0])
+        for segment in reversed(self.manifest['segments']):
+            if available >= rows:
+                break
+            frames.insert(0, self._read_segment(segment))
+            available = available + segment['rows']
+        return _concat(frames).tail(rows).reset_index(drop=True)
+
+    # writes
+    def append(self, df):
+        """ Appends rows to the journal, sealing it into a segment once it is full. """
+        if df.empty:
+            return
+        journal_path = os.path.join(self.directory, JOURNAL_FILENAME)
+        new_journal = self.manifest['journal_rows'] == 0 or not os.path.exists(journal_path)
+        if new_journal:
+            self._set_schema(df)
+        df.to_json(journal_path, orient='records', lines=True, mode='w' if new_journal else 'a')    # json keeps None apart from 'None'
+        self.manifest['journal_rows'] = self.manifest['journal_rows'] + len(df)
+        self.changed.add(JOURNAL_FILENAME)
+
+        if self.manifest['journal_rows'] >= self.segment_rows:
+            self.seal()
+        else:
+            self._write_manifest()
+
+    def seal(self):
+        """ Turns the journal into a new immutable segment and starts an empty journal. """
+        if self.manifest['journal_rows'] == 0:
+            return
+        journal_df = self._read_journal()
+        self._add_segment(journal_df)
+        self.manifest['journal_rows'] = 0
+        self._write_manifest()    # new manifest first, so a crash never loses the journal rows (a stale journal is ignored and overwritten)
+        os.remove(os.path.join(self.directory, JOURNAL_FILENAME))
+        if len(self.manifest['segments']) >= self.compact_segments:
+            self.compact()
+
+    def compact(self):
+        """ Merges runs of small segments into segments of up to compact_rows rows. """
+        merged = []
+        batch = []
+        for segment in self.manifest['segments']:
+            if batch and sum(s['rows'] for s in batch) + segment['rows'] > self.compact_rows:
+                merged.append(batch)
+                batch = []
+            batch.append(segment)
+        if batch:
+            merged.append(batch)
+        if len(merged) == len(self.manifest['segments']):    # nothing to merge
+            return
+
+        old_segments = self.manifest['segments']
+        self.manifest['segments'] = []
+        for batch in merged:
+            if len(batch) == 1:
+                self.manifest['segments'].append(batch[0])
+            else:
+                self._add_segment(_concat([self._read_segment(segment) for segment in batch]))
+        self._write_manifest()    # new manifest first, so a crash never points at deleted files
+        kept = {segment['file'] for segment in self.manifest['segments']}
+        for segment in old_segments:
+            if segment['file'] not in kept:
+                os.remove(os.path.join(self.directory, segment['file']))
+
+    def import_frame(self, df):
+        """ Loads an existing history (e.g. the old csv bot log) into an empty store. """
+        if len(self):
+            raise ValueError('History store at ' + self.directory + ' is not empty.')
+        for start in range(0, len(df), self.compact_rows):
+            self._add_segment(df.iloc[start:start + self.compact_rows])
+        self._write_manifest()
+
+    # cloud sync
+    def upload(self, bucket, prefix=''):
+        """ Uploads the files written since the last upload to a google cloud storage bucket. """
+        for filename in sorted(self.changed - {MANIFEST_FILENAME}) + [MANIFEST_FILENAME]:    # manifest last
+            path = os.path.join(self.directory, filename)
+            if os.path.exists(path):
+                bucket.blob(prefix + filename).upload_from_filename(path)
+        self.changed = set()
+
+    def download(self, bucket, prefix=''):
+        """ Fetches the store from a google cloud storage bucket, skipping segments already on disk. """
+        bucket.blob(prefix + MANIFEST_FILENAME).download_to_filename(os.path.join(self.directory, MANIFEST_FILENAME))
+        self.manifest = self._read_manifest()
+        for segment in self.manifest['segments']:
+            path = os.path.join(self.directory, segment['file'])
+            if not os.path.exists(path):    # segments are immutable, a local copy is always current
+                bucket.blob(prefix + segment['file']).download_to_filename(path)
+        if self.manifest['journal_rows']:
+            bucket.blob(prefix + JOURNAL_FILENAME).download_to_filename(os.path.join(self.directory, JOURNAL_FILENAME))
+
+    # internals
+    def _add_segment(self, df):
+        filename = 'segment_' + str(self.manifest['next_segment']).zfill(6) + '.parquet'
+        df.reset_index(drop=True).to_parquet(os.path.join(self.directory, filename), index=False)
+        self.manifest['segments'].append({'file': filename, 'rows': len(df)})
+        self.manifest['next_segment'] = self.manifest['next_segment'] + 1
+        self._set_schema(df)
+        self.changed.add(filename)
+
+    def _read_segment(self, segment):
+        return pd.read_parquet(os.path.join(self.directory, segment['file']))
+
+    def _read_journal(self):
+        path = os.path.join(self.directory, JOURNAL_FILENAME)
+        if self.manifest['journal_rows'] == 0 or not os.path.exists(path):
+            return pd.DataFrame(columns=list(self.manifest['dtypes']))
+        return pd.read_json(path, lines=True, convert_dates=False, dtype=self.manifest['dtypes'])    # json alone would turn 1.0 into an int
+
+    def _set_schema(self, df):
+        self.manifest['dtypes'] = {col_name: str(dtype) for col_name, dtype in df.dtypes.items()}
+
+    def _read_manifest(self):
+        path = os.path.join(self.directory, MANIFEST_FILENAME)
+        if not os.path.exists(path):
+            return {'segments': [], 'journal_rows': 0, 'next_segment': 1, 'dtypes': {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        path = os.path.join(self.directory, MANIFEST_FILENAME)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.manifest, f)
+        os.replace(path + '.tmp', path)    # atomic
+        self.changed.add(MANIFEST_FILENAME)
+
+
+def _concat(frames):
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
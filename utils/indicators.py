@@ -12,6 +12,11 @@ import statistics
 import pandas as pd
 import numpy as np
 
+from utils.filters import linear_filter, wilder_array, zlema_array
+
+
+MEAN_DEVIATION_BLOCK_ELEMENTS = 2 ** 20    # max temporary floats used by rolling_mean_deviation()
+
 
 # GENERAL INDICATORS
 def bollinger_band(input_df, column_label, rolling_window, standard_deviation):
@@ -87,15 +92,13 @@ def zlema(input_df, close_label, rolling_window):
 
     # calc ema
     df['ema'] = df[close_label].rolling(window=rolling_window, min_periods=rolling_window).mean()[:rolling_window+1]    # get regular sma to start
-    for i, row in enumerate(df['ema'].iloc[rolling_window+1:]):    # calculate ema based on first cell with sma
-        df['ema'].iloc[i + rolling_window + 1] = ((df[close_label].iloc[i + rolling_window + 1] - df['ema'].iloc[i + rolling_window]) * smoothing_factor) + df['ema'].iloc[i + rolling_window]
+    if len(df) > rolling_window:    # calculate ema based on first cell with sma
+        ema = linear_filter(df[close_label].to_numpy(dtype=float), 1 - smoothing_factor, smoothing_factor, rolling_window, df['ema'].iloc[rolling_window])
+        df['ema'] = np.where(np.isnan(ema), df['ema'], ema)
 
     # calc zlema
     col_name = str(rolling_window) + '__ZLEMA'
-    df[col_name] = None
-    df[col_name].iloc[lag - 1] = df[close_label].iloc[lag - 1]    # get close price of the lagged day to start the zlema column calc from
-    for i, row in enumerate(df[col_name].iloc[lag:]):    
-        df[col_name].iloc[i + lag] = ((1- smoothing_factor) * df[col_name].iloc[i + lag - 1]) + smoothing_factor * (df[close_label].iloc[i + lag] + (df[close_label].iloc[i + lag] - df[close_label].iloc[i + lag - lag]))    # apply formula
+    df[col_name] = zlema_array(df[close_label].to_numpy(dtype=float), rolling_window)    # apply formula (see utils/filters.py)
 
     return df
 
@@ -121,7 +124,8 @@ def cci(input_df, high_label, low_label, close_label, rolling_window):
     """ Classic commodity channel index (CCI) indicator. CCI is a momentum based oscillator that
     is used to help assess whether an asset is overbought or oversold. This function takes an 
     input pandas data frame, computes rolling CCI based on the given input values, then returns the
-    original input data frame with the cci value column appended.
+    original input data frame with the cci value column appended. Pass a list of rolling windows
+    to get one cci column per window from a single call (the typical price is shared).
     
     Formula:
     CCI = (Typical Price - Moving Average) / (CCI Factor * Mean Deviation)
@@ -132,34 +136,41 @@ def cci(input_df, high_label, low_label, close_label, rolling_window):
     df = input_df.copy()    # make copy of input df
 
     lambert_constant = 0.015
+    rolling_windows = [rolling_window] if isinstance(rolling_window, int) else list(rolling_window)
 
-    df['typical_price'] = (df[high_label] + df[low_label] + df[close_label]) / 3    # calculate typical price
-    df['typical_price_sma'] = df['typical_price'].rolling(rolling_window).mean()    # calculate typical price rolling sma
+    typical_price = (df[high_label] + df[low_label] + df[close_label]) / 3    # calculate typical price
 
-    for x in range(0, rolling_window):    # add a shifted typical price column for each sma period
-        col_name = 'tp_shift_' + str(x)
-        df[col_name] = df['typical_price'].shift(periods=x) 
-        df = df.copy()    # avoid fragmentation
+    for window in rolling_windows:
+        typical_price_sma = typical_price.rolling(window).mean()    # calculate typical price rolling sma
+        mean_deviation_adj = rolling_mean_deviation(typical_price.to_numpy(dtype=float), typical_price_sma.to_numpy(dtype=float), window)    # mean abs difference between sma and prev [rolling window] typical prices
 
-    df['mean_deviation'] = 0    # initialize mean_deviation col
-    for x in range(0, rolling_window):    # sum the abs difference between sma and prev [rolling window] typical prices
-        col_name = 'tp_shift_' + str(x)
-        df['mean_deviation'] = df['mean_deviation'] + abs(df['typical_price_sma'] - df[col_name])
+        col_name = str(window) + '__CCI'
+        df[col_name] = (typical_price - typical_price_sma) / (lambert_constant * mean_deviation_adj)    # calculate cci
 
-    df['mean_deviation_adj'] = df['mean_deviation'] / rolling_window    # normalize by size of rolling window
+    return df
 
-    col_name = str(rolling_window) + '__CCI'
-    df[col_name] = (df['typical_price'] - df['typical_price_sma']) / (lambert_constant * df['mean_deviation_adj'])    # calculate cci
 
-    df.drop('typical_price', axis=1, inplace=True)    # drop unnecessary columns from output
-    df.drop('typical_price_sma', axis=1, inplace=True)
-    df.drop('mean_deviation', axis=1, inplace=True)
-    df.drop('mean_deviation_adj', axis=1, inplace=True)
-    for x in range(0, rolling_window):    
-        col_name = 'tp_shift_' + str(x)
-        df.drop(col_name, axis=1, inplace=True) 
+def rolling_mean_deviation(values, rolling_sma, rolling_window):
+    """ Mean absolute deviation of each rolling window of "values" around that window's
+    entry in "rolling_sma". Reads the windows through a strided view of the input instead
+    of one shifted copy per lag, and evaluates them in blocks of rows so the temporary
+    memory stays fixed (MEAN_DEVIATION_BLOCK_ELEMENTS floats) whatever the window size.
+    Returns a numpy array with NaN for the first rolling_window - 1 rows. """
 
-    return df
+    x = np.asarray(values, dtype=np.float64)
+    out = np.full(len(x), np.nan)
+    if rolling_window > len(x):
+        return out
+
+    windows = np.lib.stride_tricks.sliding_window_view(x, rolling_window)    # view, no copy
+    sma = np.asarray(rolling_sma, dtype=np.float64)[rolling_window - 1:]
+    rows_per_block = max(1, MEAN_DEVIATION_BLOCK_ELEMENTS // rolling_window)
+    for start in range(0, len(windows), rows_per_block):
+        stop = start + rows_per_block
+        block = np.abs(windows[start:stop] - sma[start:stop, None])
+        out[rolling_window - 1 + start:rolling_window - 1 + start + len(block)] = block.sum(axis=1) / rolling_window
+
+    return out
 
 
 def rsi(input_df, close_label, rolling_window):
@@ -178,14 +189,8 @@ def rsi(input_df, close_label, rolling_window):
     df['gain'] = df['change'].clip(lower=0)
     df['loss'] = abs(df['change'].clip(upper=0))
 
-    df['avg_gain'] = df['gain'].rolling(window=rolling_window, min_periods=rolling_window).mean()[:rolling_window+1]    # get regular sma for gains
-    df['avg_loss'] = df['loss'].rolling(window=rolling_window, min_periods=rolling_window).mean()[:rolling_window+1]    # get regular sma for losses
-
-    for i, row in enumerate(df['avg_gain'].iloc[rolling_window+1:]):    # calculate Wilder-method-specific moving averages
-        df['avg_gain'].iloc[i + rolling_window + 1] = (df['avg_gain'].iloc[i + rolling_window] * (rolling_window - 1) + df['gain'].iloc[i + rolling_window + 1]) / rolling_window
-
-    for i, row in enumerate(df['avg_loss'].iloc[rolling_window+1:]):    # calculate Wilder-method-specific moving averages
-        df['avg_loss'].iloc[i + rolling_window + 1] = (df['avg_loss'].iloc[i + rolling_window] * (rolling_window - 1) + df['loss'].iloc[i + rolling_window + 1]) / rolling_window
+    df['avg_gain'] = wilder_array(df['gain'].to_numpy(dtype=float), rolling_window)    # calculate Wilder-method-specific moving averages (sma seeded)
+    df['avg_loss'] = wilder_array(df['loss'].to_numpy(dtype=float), rolling_window)
 
     df['rs'] = df['avg_gain'] / df['avg_loss']    # calculate rs
 
@@ -218,8 +223,8 @@ def money_flow_index(input_df, close_label, high_label, low_label, volume_label,
 
     df['change'] = df['typical_price'] - df['typical_price'].shift(periods=1)
     df['raw_money_flow'] = df[volume_label] * df['typical_price']
-    df['positive_flow'] = 0
-    df['negative_flow'] = 0
+    df['positive_flow'] = 0.0
+    df['negative_flow'] = 0.0
     df.loc[df['change'] >= 0, 'positive_flow'] = df['raw_money_flow']
     df.loc[df['change'] < 0, 'negative_flow'] = df['raw_money_flow']
     df['sum_positive_money_flows'] = df['positive_flow'].rolling(rolling_window).sum()    
@@ -257,8 +262,8 @@ def chande_momentum_oscillator(input_df, close_label, rolling_window):
 
     # sum when closes are higher and when they are lower
     df['change'] = df[close_label] - df[close_label].shift(periods=1)
-    df['higher_closes'] = 0
-    df['lower_closes'] = 0
+    df['higher_closes'] = 0.0
+    df['lower_closes'] = 0.0
     df.loc[df['change'] >= 0, 'higher_closes'] = abs(df['change'])
     df.loc[df['change'] < 0, 'lower_closes'] = abs(df['change'])
     df['sum_higher_closes'] = df['higher_closes'].rolling(rolling_window).sum()    
@@ -0,0 +1,27 @@
+###############################################################################
+# FILENAME: lazy.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Deferred module imports. lazy_import('pandas') returns the
+# module object straight away but only runs the import on first attribute
+# access, so the heavy packages (pandas, numpy, requests, google cloud) load
+# in the run stage that needs them instead of at process start.
+###############################################################################
+import sys
+import importlib.util
+
+
+def lazy_import(name):
+    """ Returns module "name", executed on first attribute access (the module itself if it is already loaded). """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError('No module named ' + repr(name), name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
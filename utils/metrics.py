@@ -0,0 +1,258 @@
+###############################################################################
+# FILENAME: metrics.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: In-process metrics: counters, gauges, latency histograms and
+# timed spans, exported in Prometheus text format on a local port and as
+# json lines. run() times each of its stages with a span and the exchange
+# client counts and times every request, so a run can be measured after the
+# fact. Updates are a dict lookup under one lock (a few microseconds), so the
+# metrics stay on in production.
+#
+# Example:
+#   metrics.serve(9108)    # curl localhost:9108/metrics
+#   metrics.log_to('/tmp/bot_metrics.jsonl')
+#   with metrics.span('bot_stage', stage='strategy', bot='auto ape'):
+#       ...
+#   metrics.inc('exchange_requests_total', exchange='Coinbase', status=200)
+###############################################################################
+import json
+import time
+import bisect
+import threading
+
+from config import config_params
+
+
+# CONFIG
+LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]    # seconds
+HELP = {    # metric name -> description shown in the Prometheus export
+    'bot_stage_seconds': 'Duration of each run() stage.',
+    'bot_stage_errors_total': 'run() stages that raised.',
+    'bot_runs_total': 'Completed run() cycles.',
+    'bot_trades_total': 'Trade actions taken, by action and exchange.',
+    'bot_history_rows': 'Rows of history loaded for the strategy.',
+    'bot_balance_usd': 'USD balance after the last run.',
+    'bot_balance_btc': 'Base token balance after the last run.',
+    'bot_running_net_profit': 'Running net profit after the last run.',
+    'bot_last_run_timestamp': 'Unix time the last run() finished.',
+    'bot_price_age_seconds': 'Age of the price a trade acted on when its order was sent.',
+    'bot_tick_to_trade_seconds': 'Price observation to order acknowledgement, per trade.',
+    'exchange_request_seconds': 'Duration of each exchange request, retries included.',
+    'exchange_requests_total': 'Exchange requests, by response status.',
+    'exchange_errors_total': 'Exchange requests that failed (exception or error status).',
+    'exchange_retries_total': 'Retries made by the exchange client.',
+}
+
+
+# REGISTRY
+class Metrics:
+    """ Thread safe registry of labelled counters, gauges and histograms. A series is a metric
+    name plus its labels; series are created on first use. """
+
+    def __init__(self, buckets=None):
+        self.buckets = list(buckets or LATENCY_BUCKETS)
+        self.counters = {}    # (name, labels) -> value
+        self.gauges = {}    # (name, labels) -> value
+        self.histograms = {}    # (name, labels) -> [bucket counts..., +Inf count, sum]
+        self.lock = threading.Lock()
+        self.sink = None    # json lines file, see log_to()
+        self.server = None
+
+    # updates
+    def inc(self, name, value=1, **labels):
+        key = (name, _labels(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        key = (name, _labels(labels))
+        with self.lock:
+            self.gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, _labels(labels))
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] = series[index] + 1
+            series[-1] = series[-1] + value
+
+    def span(self, name, **labels):
+        """ Context manager timing a block: observes name + '_seconds', counts name + '_errors_total'
+        if the block raises, and writes the span to the json lines sink. Extra fields for the json
+        line only (not labels) can be added with span.note(). """
+        return Span(self, name, labels)
+
+    # json lines
+    def log_to(self, path):
+        """ Appends every finished span (and snapshots written with write_snapshot) to path as json lines. """
+        self.sink = open(path, 'a')
+        return self
+
+    def emit(self, event):
+        if self.sink is None:
+            return
+        line = json.dumps(event, separators=(',', ':'), default=str) + '\n'
+        with self.lock:
+            self.sink.write(line)
+            self.sink.flush()
+
+    def write_snapshot(self):
+        """ Writes the current value of every series to the json lines sink. """
+        self.emit({'t': time.time(), 'snapshot': self.snapshot()})
+
+    # export
+    def snapshot(self):
+        """ Every series as a dict: counters and gauges -> list of {labels, value}, histograms -> list of {labels, count, sum, buckets}. """
+        with self.lock:
+            counters = list(self.counters.items())
+            gauges = list(self.gauges.items())
+            histograms = [(key, list(series)) for key, series in self.histograms.items()]
+        out = {'counters': {}, 'gauges': {}, 'histograms': {}}
+        for kind, items in (('counters', counters), ('gauges', gauges)):
+            for (name, labels), value in items:
+                out[kind].setdefault(name, []).append({'labels': dict(labels), 'value': value})
+        for (name, labels), series in histograms:
+            out['histograms'].setdefault(name, []).append({'labels': dict(labels), 'count': sum(series[:-1]), 'sum': series[-1], 'buckets': dict(zip([str(bound) for bound in self.buckets] + ['+Inf'], series[:-1]))})
+        return out
+
+    def prometheus_text(self):
+        """ Every series in the Prometheus text exposition format. """
+        with self.lock:
+            families = {}
+            for kind, items in (('counter', self.counters.items()), ('gauge', self.gauges.items())):
+                for (name, labels), value in items:
+                    families.setdefault(name, (kind, []))[1].append((labels, value))
+            for (name, labels), series in self.histograms.items():
+                families.setdefault(name, ('histogram', []))[1].append((labels, list(series)))
+
+        lines = []
+        for name in sorted(families):
+            kind, samples = families[name]
+            if name in HELP:
+                lines.append('# HELP ' + name + ' ' + HELP[name])
+            lines.append('# TYPE ' + name + ' ' + kind)
+            for labels, value in sorted(samples, key=lambda sample: sample[0]):
+                if kind != 'histogram':
+                    lines.append(name + _format_labels(labels) + ' ' + _format_value(value))
+                    continue
+                cumulative = 0
+                for bound, count in zip([_format_value(bound) for bound in self.buckets] + ['+Inf'], value[:-1]):
+                    cumulative = cumulative + count
+                    lines.append(name + '_bucket' + _format_labels(labels + (('le', bound),)) + ' ' + str(cumulative))
+                lines.append(name + '_sum' + _format_labels(labels) + ' ' + _format_value(value[-1]))
+                lines.append(name + '_count' + _format_labels(labels) + ' ' + str(cumulative))
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port, host='127.0.0.1'):
+        """ Serves prometheus_text() at http://host:port/metrics (and snapshot() at /metrics.json) from a daemon thread. """
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler    # only loaded when exporting
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] == '/metrics':
+                    body, content_type = registry.prometheus_text().encode(), 'text/plain; version=0.0.4; charset=utf-8'
+                elif self.path.split('?')[0] == '/metrics.json':
+                    body, content_type = json.dumps(registry.snapshot()).encode(), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name='metrics', daemon=True).start()
+        print('Serving metrics on http://' + host + ':' + str(self.server.server_address[1]) + '/metrics')
+        return self
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.sink is not None:
+            with self.lock:
+                self.sink.close()
+            self.sink = None
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+
+class Span:
+    """ One timed block, see Metrics.span(). """
+
+    __slots__ = ('metrics', 'name', 'labels', 'fields', 'started_at', 'start', 'seconds')
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+        self.fields = {}
+        self.seconds = None
+
+    def note(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.seconds = time.perf_counter() - self.start
+        self.metrics.observe(self.name + '_seconds', self.seconds, **self.labels)
+        if exc_type is not None:
+            self.metrics.inc(self.name + '_errors_total', **self.labels)
+            self.fields['error'] = exc_type.__name__
+        if self.metrics.sink is not None:
+            event = {'t': self.started_at, 'span': self.name, 'seconds': round(self.seconds, 6)}
+            event.update(self.labels)
+            event.update(self.fields)
+            self.metrics.emit(event)
+        return False
+
+
+def _labels(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(key + '="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"' for key, value in labels) + '}'
+
+
+def _format_value(value):
+    if value is None:
+        return 'NaN'
+    return repr(float(value))
+
+
+metrics = Metrics()    # shared by run() and the exchange clients
+
+
+def start_exporters(port=None, path=None):
+    """ Starts the exporters set in config.py (metrics_port, metrics_jsonl_file) or given here. Returns the registry. """
+    port = port or config_params.get('metrics_port')
+    path = path or config_params.get('metrics_jsonl_file')
+    if port and metrics.server is None:
+        metrics.serve(port, config_params.get('metrics_host', '127.0.0.1'))
+    if path and metrics.sink is None:
+        metrics.log_to(path)
+    return metrics
@@ -0,0 +1,227 @@
+###############################################################################
+# FILENAME: order_book.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: In-process book of resting synthetic limit orders. Each order
+# has a side, a trigger price and a USD size; a buy triggers once the price is
+# at or below its trigger price, a sell once it is at or above it. Both sides
+# are kept sorted in trigger order, so a price tick finds its triggered orders
+# with one bisect and slices them off the front of the side (O(log n + k) for k
+# triggered orders) instead of scanning the book. Triggered orders are held
+# in flight until their fill comes back (complete) or fails (restore, back in
+# the book with their original time priority). The resting and in-flight
+# orders are saved to a JSON file after every change.
+#
+# Example:
+#   book = SyntheticOrderBook('/tmp/order_book.json')
+#   order_id = book.add('buy', 39500, 2500)
+#   book.amend(order_id, trigger_price=39250)
+#   triggered = book.on_tick(39200.0)    # [the buy], now in flight
+#   book.complete(order_id)    # filled (or book.restore(order_id) if it failed)
+###############################################################################
+import os
+import json
+import time
+import bisect
+import threading
+
+
+SIDES = ['buy', 'sell']
+VENUES = ['best', 'Coinbase', 'FalconX']    # 'best' picks the better quote when the order triggers
+
+
+class SyntheticOrder:
+    """ One resting order. seq orders equal trigger prices by arrival (and is renewed when the price is amended). """
+
+    __slots__ = ('order_id', 'side', 'trigger_price', 'size', 'venue', 'created_at', 'seq')
+
+    def __init__(self, order_id, side, trigger_price, size, venue='best', created_at=None, seq=0):
+        self.order_id = order_id
+        self.side = side
+        self.trigger_price = trigger_price
+        self.size = size    # usd
+        self.venue = venue
+        self.created_at = time.time() if created_at is None else created_at
+        self.seq = seq
+
+    def key(self):
+        """ Sort key within the side: the order that triggers first sorts first. """
+        return (-self.trigger_price if self.side == 'buy' else self.trigger_price, self.seq)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return 'SyntheticOrder(' + self.order_id + ' ' + self.side + ' ' + str(self.size) + ' USD @ ' + str(self.trigger_price) + ' on ' + self.venue + ')'
+
+
+class SyntheticOrderBook:
+    """ Resting synthetic orders indexed by trigger price. Each side is a sorted list of
+    SyntheticOrder.key() keys (highest buy / lowest sell first, then by arrival) with a
+    parallel list of orders, so the orders a tick triggers are always a prefix. Thread safe. """
+
+    def __init__(self, path=None):
+        self.path = path    # state file, None to keep the book in memory only
+        self.orders = {}    # order id -> SyntheticOrder, resting
+        self.in_flight = {}    # order id -> SyntheticOrder, triggered and waiting for its fill
+        self.keys = {'buy': [], 'sell': []}    # sorted SyntheticOrder.key() per side
+        self.sides = {'buy': [], 'sell': []}    # orders in the same order as their keys
+        self.next_seq = 1
+        self.lock = threading.RLock()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.orders)
+
+    def __contains__(self, order_id):
+        return order_id in self.orders
+
+    # orders
+    def add(self, side, trigger_price, size, venue='best', order_id=None):
+        """ Rests a new order. Returns its order id. """
+        if side not in SIDES:
+            raise ValueError('Unknown order side: ' + str(side))
+        if venue not in VENUES:
+            raise ValueError('Unknown venue: ' + str(venue))
+        if size <= 0:
+            raise ValueError('Order size must be positive, got ' + str(size))
+        with self.lock:
+            order_id = order_id or 'so-' + str(self.next_seq)
+            if order_id in self.orders or order_id in self.in_flight:
+                raise ValueError('Duplicate order id: ' + order_id)
+            self._insert(SyntheticOrder(order_id, side, float(trigger_price), float(size), venue, seq=self._take_seq()))
+            self.save()
+            return order_id
+
+    def cancel(self, order_id):
+        """ Removes a resting order. Returns the order (KeyError if it is not in the book). """
+        with self.lock:
+            order = self._remove(self.orders[order_id])
+            self.save()
+            return order
+
+    def amend(self, order_id, trigger_price=None, size=None, venue=None):
+        """ Changes a resting order. A new trigger price re-indexes it (behind any other orders
+        at that price); a new size or venue is changed in place. Returns the order. """
+        if size is not None and size <= 0:
+            raise ValueError('Order size must be positive, got ' + str(size))
+        if venue is not None and venue not in VENUES:
+            raise ValueError('Unknown venue: ' + str(venue))
+        with self.lock:
+            order = self.orders[order_id]
+            if trigger_price is not None and float(trigger_price) != order.trigger_price:
+                self._remove(order)
+                order.trigger_price = float(trigger_price)
+                order.seq = self._take_seq()
+                self._insert(order)
+            if size is not None:
+                order.size = float(size)
+            if venue is not None:
+                order.venue = venue
+            self.save()
+            return order
+
+    def on_tick(self, price):
+        """ Takes every order the price triggers out of the book and holds it in flight until
+        complete() or restore() is called for it. Returns list of the triggered orders, buys
+        (highest trigger first) then sells (lowest trigger first). """
+        with self.lock:
+            last_buy = bisect.bisect_right(self.keys['buy'], (-price, float('inf')))    # buys with trigger >= price
+            last_sell = bisect.bisect_right(self.keys['sell'], (price, float('inf')))    # sells with trigger <= price
+            if last_buy == 0 and last_sell == 0:
+                return []
+
+            triggered = self.sides['buy'][:last_buy] + self.sides['sell'][:last_sell]
+            for side, last in (('buy', last_buy), ('sell', last_sell)):
+                del self.keys[side][:last]
+                del self.sides[side][:last]
+            for order in triggered:
+                del self.orders[order.order_id]
+                self.in_flight[order.order_id] = order
+            self.save()
+            return triggered
+
+    def complete(self, order_id):
+        """ Drops an in-flight order once its fill has come back. Returns the order (KeyError if it is not in flight). """
+        with self.lock:
+            order = self.in_flight.pop(order_id)
+            self.save()
+            return order
+
+    def restore(self, order_id):
+        """ Puts an in-flight order back in the book (e.g. its fill failed or was skipped), ahead of
+        the orders that arrived after it at its trigger price. Returns the order. """
+        with self.lock:
+            order = self.in_flight.pop(order_id)
+            self._insert(order)    # same seq, same place
+            self.save()
+            return order
+
+    def pending(self):
+        """ In-flight orders, including any a previous process left when it stopped before
+        their fill came back (these may or may not have filled: check the venue, then
+        complete() or restore() them). Returns list. """
+        with self.lock:
+            return list(self.in_flight.values())
+
+    def resting(self, side=None):
+        """ Resting orders in trigger order (highest buy / lowest sell first). Returns list. """
+        with self.lock:
+            if side is not None:
+                return list(self.sides[side])
+            return list(self.sides['buy']) + list(self.sides['sell'])
+
+    def best(self, side):
+        """ The order the next move will trigger first on that side (highest buy / lowest sell), or None. """
+        with self.lock:
+            orders = self.sides[side]
+            return orders[0] if orders else None
+
+    # persistence
+    def save(self):
+        """ Writes the resting and in-flight orders to the state file (atomically). """
+        if self.path is None:
+            return
+        with self.lock:
+            state = {'next_seq': self.next_seq, 'orders': [order.to_dict() for order in self.orders.values()], 'in_flight': [order.to_dict() for order in self.in_flight.values()]}
+            with open(self.path + '.tmp', 'w') as f:
+                json.dump(state, f)
+            os.replace(self.path + '.tmp', self.path)    # atomic
+
+    def load(self):
+        """ Replaces the book with the state file's orders. """
+        with open(self.path) as f:
+            state = json.load(f)
+        with self.lock:
+            self.in_flight = {data['order_id']: SyntheticOrder(**data) for data in state.get('in_flight', [])}
+            self.orders = {}
+            self.keys = {'buy': [], 'sell': []}
+            self.sides = {'buy': [], 'sell': []}
+            for order in sorted((SyntheticOrder(**data) for data in state['orders']), key=SyntheticOrder.key):
+                self.orders[order.order_id] = order
+                self.keys[order.side].append(order.key())
+                self.sides[order.side].append(order)
+            self.next_seq = state['next_seq']
+
+    # index
+    def _take_seq(self):
+        seq = self.next_seq
+        self.next_seq = seq + 1
+        return seq
+
+    def _insert(self, order):
+        key = order.key()
+        index = bisect.bisect_right(self.keys[order.side], key)
+        self.keys[order.side].insert(index, key)
+        self.sides[order.side].insert(index, order)
+        self.orders[order.order_id] = order
+
+    def _remove(self, order):
+        keys = self.keys[order.side]
+        index = bisect.bisect_left(keys, order.key())
+        del keys[index]
+        del self.sides[order.side][index]
+        del self.orders[order.order_id]
+        return order
@@ -0,0 +1,253 @@
+###############################################################################
+# FILENAME: pipeline.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Declarative indicator pipeline. List the indicators (and their
+# windows) a strategy needs, and the pipeline builds a dependency graph of the
+# intermediates behind them (typical price, one bar close change, rolling
+# sums...), computes each shared intermediate once and returns every
+# indicator in a single result frame.
+#
+# Example:
+#   pipeline = IndicatorPipeline()
+#   pipeline.add('rsi', close_label='c', rolling_window=14)
+#   pipeline.add('cci', high_label='h', low_label='l', close_label='c', rolling_window=20)
+#   result_df = pipeline.run(price_df)
+###############################################################################
+import math
+import graphlib
+import pandas as pd
+import numpy as np
+
+from utils.filters import wilder_array, zlema_array
+from utils.indicators import rolling_mean_deviation
+
+
+LAMBERT_CONSTANT = 0.015    # same cci factor as utils.indicators.cci()
+ANNUALIZED_FACTOR = 365    # same periods per year as utils.indicators.annualized_historical_volatility()
+
+
+# GRAPH NODES
+# A node is a tuple (kind, *args). Any arg that is itself a tuple is another node the
+# node depends on, so equal tuples are the same intermediate no matter which indicator
+# asked for it. COMPUTE maps each kind to a function of the resolved args.
+def column(label):
+    return ('column', label)
+
+
+def shift(node, periods):
+    return ('shift', node, periods)
+
+
+def typical_price(high_label, low_label, close_label):
+    return ('typical_price', column(high_label), column(low_label), column(close_label))
+
+
+def change(node):
+    return ('subtract', node, shift(node, 1))
+
+
+def rolling(kind, node, rolling_window):
+    return ('rolling_' + kind, node, rolling_window)
+
+
+def _shift(x, periods):
+    out = np.full(len(x), np.nan)
+    if periods == 0:
+        out[:] = x
+    elif periods < len(x):
+        out[periods:] = x[:-periods]
+    return out
+
+
+def _rolling(x, rolling_window, method):
+    return getattr(pd.Series(x).rolling(rolling_window), method)().to_numpy()
+
+
+COMPUTE = {
+    'shift': _shift,
+    'typical_price': lambda high, low, close: (high + low + close) / 3,
+    'subtract': lambda a, b: a - b,
+    'multiply': lambda a, b: a * b,
+    'divide': lambda a, b: a / b,
+    'scale': lambda a, factor: a * factor,
+    'sqrt': np.sqrt,
+    'abs': np.abs,
+    'log_ratio': lambda a, b: np.log(a / b),
+    'square': lambda a: a ** 2,
+    'rolling_mean': lambda x, w: _rolling(x, w, 'mean'),
+    'rolling_sum': lambda x, w: _rolling(x, w, 'sum'),
+    'rolling_std': lambda x, w: _rolling(x, w, 'std'),
+    'wilder': wilder_array,
+    'zlema': zlema_array,
+    'mean_deviation': rolling_mean_deviation,
+    'gain': lambda x: np.clip(x, 0, None),
+    'loss': lambda x: np.abs(np.clip(x, None, 0)),
+    'flow_if': lambda value, direction, positive: np.where(direction >= 0, value, 0.0) if positive else np.where(direction < 0, value, 0.0),
+    'ratio_index': lambda a, b: 100 - (100 / (1 + (a / b))),    # 100 - 100 / (1 + a / b), shared by rsi and mfi
+    'bb_width': lambda mid, std, k: ((mid + (k * std)) - (mid - (k * std))) / mid,
+    'rate_of_change': lambda x, previous: (x - previous) / previous,
+    'cci': lambda tp, sma, mean_deviation: (tp - sma) / (LAMBERT_CONSTANT * mean_deviation),
+    'cmo': lambda higher, lower: ((higher - lower) / (higher + lower)) * 100,
+    'garman_klass_terms': lambda hl, co: (0.5 * hl) + (((2 * np.log(2)) - 1) * co),
+}
+
+
+# INDICATOR DEFINITIONS
+# Each takes the same keyword arguments as its utils.indicators function and returns
+# (output column name, output node). Column names match utils.indicators.
+def _bollinger_band(column_label, rolling_window, standard_deviation):
+    mid = rolling('mean', column(column_label), rolling_window)
+    std = rolling('std', column(column_label), rolling_window)
+    return str(rolling_window) + '__BBands', ('bb_width', mid, std, standard_deviation)
+
+
+def _roc(close_label, rolling_window):
+    close = column(close_label)
+    return str(rolling_window) + ' _ROC', ('rate_of_change', close, shift(close, rolling_window - 1))
+
+
+def _sma(close_label, rolling_window):
+    return str(rolling_window) + ' _SMA', rolling('mean', column(close_label), rolling_window)
+
+
+def _zlema(close_label, rolling_window):
+    return str(rolling_window) + '__ZLEMA', ('zlema', column(close_label), rolling_window)
+
+
+def _momentum(close_label, rolling_window):
+    close = column(close_label)
+    return str(rolling_window) + ' _momentum', ('subtract', close, shift(close, rolling_window - 1))
+
+
+def _cci(high_label, low_label, close_label, rolling_window):
+    tp = typical_price(high_label, low_label, close_label)
+    sma = rolling('mean', tp, rolling_window)
+    return str(rolling_window) + '__CCI', ('cci', tp, sma, ('mean_deviation', tp, sma, rolling_window))
+
+
+def _rsi(close_label, rolling_window):
+    close_change = change(column(close_label))
+    avg_gain = ('wilder', ('gain', close_change), rolling_window)
+    avg_loss = ('wilder', ('loss', close_change), rolling_window)
+    return str(rolling_window) + ' _RSI', ('ratio_index', avg_gain, avg_loss)
+
+
+def _money_flow_index(close_label, high_label, low_label, volume_label, rolling_window):
+    tp = typical_price(high_label, low_label, close_label)
+    raw_money_flow = ('multiply', column(volume_label), tp)
+    positive = rolling('sum', ('flow_if', raw_money_flow, change(tp), True), rolling_window)
+    negative = rolling('sum', ('flow_if', raw_money_flow, change(tp), False), rolling_window)
+    return str(rolling_window) + '__MFI', ('ratio_index', positive, negative)
+
+
+def _chande_momentum_oscillator(close_label, rolling_window):
+    close_change = change(column(close_label))
+    higher = rolling('sum', ('flow_if', ('abs', close_change), close_change, True), rolling_window)
+    lower = rolling('sum', ('flow_if', ('abs', close_change), close_change, False), rolling_window)
+    return str(rolling_window) + ' _CMO', ('cmo', higher, lower)
+
+
+def _annualized_historical_volatility(close_label, rolling_window):
+    close = column(close_label)
+    interday_returns = ('log_ratio', close, shift(close, 1))
+    std = rolling('std', interday_returns, rolling_window)
+    return str(rolling_window) + '__volatility', ('scale', std, math.sqrt(ANNUALIZED_FACTOR))
+
+
+def _garman_klass_volatility(open_label, high_label, low_label, close_label, rolling_window):
+    hl = ('square', ('log_ratio', column(high_label), column(low_label)))
+    co = ('square', ('log_ratio', column(close_label), column(open_label)))
+    terms = ('garman_klass_terms', hl, co)
+    return str(rolling_window) + '__garman.klass', ('sqrt', rolling('mean', terms, rolling_window))
+
+
+def _vwap(close_label, high_label, low_label, volume_label, rolling_window):
+    tp = typical_price(high_label, low_label, close_label)
+    volume_times_price = ('multiply', column(volume_label), tp)
+    cumulative_volume = rolling('sum', column(volume_label), rolling_window)
+    return str(rolling_window) + '__VWAP', ('divide', volume_times_price, cumulative_volume)
+
+
+INDICATORS = {
+    'bollinger_band': _bollinger_band,
+    'roc': _roc,
+    'sma': _sma,
+    'zlema': _zlema,
+    'momentum': _momentum,
+    'cci': _cci,
+    'rsi': _rsi,
+    'money_flow_index': _money_flow_index,
+    'chande_momentum_oscillator': _chande_momentum_oscillator,
+    'annualized_historical_volatility': _annualized_historical_volatility,
+    'garman_klass_volatility': _garman_klass_volatility,
+    'vwap': _vwap,
+}
+
+
+# PIPELINE
+class IndicatorPipeline:
+    """ Computes many indicators over one price frame in a single pass. Indicators are
+    added by utils.indicators function name with the same keyword arguments, e.g.
+    add('sma', close_label='c', rolling_window=20). Unlike utils.indicators.zlema(),
+    the zlema output does not carry the helper 'ema' column. """
+
+    def __init__(self, specs=None):
+        self.outputs = {}    # output column name -> output node
+        for name, params in (specs or []):
+            self.add(name, **params)
+
+    def add(self, name, **params):
+        """ Adds an indicator to the pipeline. Returns the pipeline so calls can be chained. """
+        if name not in INDICATORS:
+            raise ValueError('Unknown indicator: ' + str(name))
+        col_name, node = INDICATORS[name](**params)
+        self.outputs[col_name] = node
+        return self
+
+    def graph(self):
+        """ Returns the dependency graph as {node: set of nodes it depends on}. """
+        graph = {}
+        pending = list(self.outputs.values())
+        while pending:
+            node = pending.pop()
+            if node in graph:
+                continue
+            deps = {arg for arg in node[1:] if isinstance(arg, tuple)}
+            graph[node] = deps
+            pending.extend(deps)
+        return graph
+
+    def run(self, input_df, include_input=True):
+        """ Computes every indicator in the pipeline. Returns the input columns followed by
+        one column per indicator (or only the indicator columns if include_input is False). """
+        graph = self.graph()
+        dependents = {node: 0 for node in graph}    # used to free intermediates once consumed
+        for deps in graph.values():
+            for dep in deps:
+                dependents[dep] = dependents[dep] + 1
+        keep = set(self.outputs.values())
+
+        values = {}
+        for node in graph_order(graph):
+            if node[0] == 'column':
+                values[node] = input_df[node[1]].to_numpy(dtype=float)
+            else:
+                args = [values[arg] if isinstance(arg, tuple) else arg for arg in node[1:]]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    values[node] = COMPUTE[node[0]](*args)
+            for dep in graph[node]:    # drop intermediates nobody else needs
+                dependents[dep] = dependents[dep] - 1
+                if dependents[dep] == 0 and dep not in keep:
+                    del values[dep]
+
+        result_df = pd.DataFrame({col_name: values[node] for col_name, node in self.outputs.items()}, index=input_df.index)
+        if include_input:
+            return pd.concat([input_df, result_df], axis=1)
+        return result_df
+
+
+def graph_order(graph):
+    """ Topological order of a dependency graph (dependencies first). """
+    return list(graphlib.TopologicalSorter(graph).static_order())
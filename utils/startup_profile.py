@@ -0,0 +1,139 @@
+###############################################################################
+# FILENAME: startup_profile.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Startup profile for run.py --profile-startup. Times every
+# module import (cumulative and self time) and the time to the first bot
+# cycle, prints a report and compares it against a recorded JSON baseline so
+# cold start regressions show up. The baseline notes the environment it was
+# recorded in (python, platform, cpus), and a comparison across environments
+# says so.
+###############################################################################
+import os
+import sys
+import json
+import time
+import builtins
+import platform
+
+
+REGRESSION_TOLERANCE = 0.25    # fraction slower than the baseline that is flagged
+REGRESSION_FLOOR = 0.05    # seconds, smaller differences are noise
+
+
+# IMPORT TIMING
+class ImportProfiler:
+    """ Wraps builtins.__import__ and records, for each import that loaded new modules,
+    the cumulative time and the self time (excluding nested imports). """
+
+    def __init__(self):
+        self.cumulative = {}    # module name -> seconds
+        self.self_time = {}    # module name -> seconds
+        self.children = [0.0]    # time spent in nested imports, one entry per active import
+        self.original_import = None
+        self.installed_at = None
+
+    def install(self):
+        self.original_import = builtins.__import__
+        self.installed_at = time.perf_counter()
+        builtins.__import__ = self._import
+        return self
+
+    def uninstall(self):
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        loaded = len(sys.modules)
+        self.children.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self.children.pop()
+            if len(sys.modules) != loaded:    # something new was actually imported
+                module = _absolute_name(name, globals, level)
+                self.cumulative[module] = self.cumulative.get(module, 0.0) + elapsed
+                self.self_time[module] = self.self_time.get(module, 0.0) + elapsed - nested
+                self.children[-1] = self.children[-1] + elapsed
+            else:
+                self.children[-1] = self.children[-1] + nested
+
+    def total(self):
+        """ Seconds spent importing since install (top level imports only, so nothing is counted twice). """
+        return self.children[0]
+
+
+def _absolute_name(name, globals, level):
+    if level == 0 or not globals:
+        return name
+    package = globals.get('__package__') or ''
+    base = package.rsplit('.', level - 1)[0] if level > 1 else package
+    return base + '.' + name if name else base
+
+
+# REPORT
+def report(profiler, time_to_first_cycle, first_cycle_seconds=None, baseline_path=None, record=False, top=15):
+    """ Prints the startup profile and compares it with the baseline at baseline_path (or
+    records it there when record is True). Returns the profile dict. """
+    profile = {
+        'environment': environment(),
+        'import_seconds': round(profiler.total(), 4),
+        'time_to_first_cycle': round(time_to_first_cycle, 4),
+        'first_cycle_seconds': None if first_cycle_seconds is None else round(first_cycle_seconds, 4),
+        'modules': {name: round(seconds, 4) for name, seconds in sorted(profiler.cumulative.items(), key=lambda item: -item[1])[:100]},
+    }
+
+    print('Startup profile...')
+    print('Import time: ' + str(profile['import_seconds']) + ' s')
+    print('Time to first cycle: ' + str(profile['time_to_first_cycle']) + ' s')
+    if first_cycle_seconds is not None:
+        print('First cycle: ' + str(profile['first_cycle_seconds']) + ' s')
+    print('Slowest imports (cumulative / self seconds):')
+    for name, seconds in list(profile['modules'].items())[:top]:
+        print('    ' + name.ljust(40) + str(round(seconds, 3)).rjust(8) + str(round(profiler.self_time.get(name, 0.0), 3)).rjust(8))
+
+    if baseline_path and record:
+        with open(baseline_path, 'w') as f:
+            json.dump(profile, f, indent=2)
+        print('Baseline recorded to ' + baseline_path)
+    elif baseline_path:
+        try:
+            with open(baseline_path) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print('No startup baseline at ' + baseline_path + ' (record one with --simulator --record-baseline).')
+        else:
+            if baseline.get('environment') != profile['environment']:
+                print('Note: the baseline was recorded in a different environment ' + str(baseline.get('environment')))
+            profile['regressions'] = compare(profile, baseline)
+            for regression in profile['regressions']:
+                print('REGRESSION: ' + regression)
+            if not profile['regressions']:
+                print('No regressions against ' + baseline_path)
+    return profile
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(profile, baseline):
+    """ Descriptions of the metrics and modules that got slower than the baseline. Returns list. """
+    regressions = []
+    checks = [(key, profile.get(key), baseline.get(key)) for key in ('import_seconds', 'time_to_first_cycle', 'first_cycle_seconds')]
+    checks = checks + [('import ' + name, seconds, baseline.get('modules', {}).get(name, 0.0)) for name, seconds in profile['modules'].items()]
+    for label, current, previous in checks:
+        if current is None or previous is None:
+            continue
+        if current > previous * (1 + REGRESSION_TOLERANCE) and current - previous > REGRESSION_FLOOR:
+            regressions.append(label + ': ' + str(round(current, 3)) + ' s vs ' + str(round(previous, 3)) + ' s baseline')
+    return regressions
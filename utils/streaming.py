@@ -0,0 +1,462 @@
+###############################################################################
+# FILENAME: streaming.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Streaming (one bar at a time) counterparts of the indicator
+# functions in utils/indicators.py. Each object keeps rolling sums / windows
+# so an update costs O(1), and its state can be saved and restored between
+# runs of the bot.
+###############################################################################
+import json
+import math
+import bisect
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+LAMBERT_CONSTANT = 0.015    # same cci factor as utils.indicators.cci()
+ANNUALIZED_FACTOR = 365    # same periods per year as utils.indicators.annualized_historical_volatility()
+NAN = float('nan')
+
+
+# HELPERS
+class RollingWindow:
+    """ Fixed length window of floats that tracks the mean and sum of squared deviations
+    (Welford) of its values as they are pushed in and out. A NaN is held in the window
+    but left out of the totals, and the window reports NaN until it has been pushed out
+    again (same as a pandas rolling window). The totals are rebuilt from scratch once
+    per window length of pushes to stop floating point drift, which keeps the cost
+    amortized O(1) per push. """
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.nans = 0    # NaN values currently in the window
+        self.pushes = 0
+
+    def push(self, value):
+        """ Adds a value, dropping the oldest one once the window is full. """
+        if len(self.values) == self.size:
+            self._remove(self.values.popleft())
+        self.values.append(value)
+        self._add(value)
+
+        self.pushes = self.pushes + 1
+        if self.pushes >= self.size:    # periodic exact rebuild (amortized O(1))
+            self.rebuild()
+
+    def _add(self, value):
+        if math.isnan(value):
+            self.nans = self.nans + 1
+            return
+        delta = value - self.mean
+        self.mean = self.mean + delta / (len(self.values) - self.nans)
+        self.m2 = self.m2 + delta * (value - self.mean)
+
+    def _remove(self, value):
+        if math.isnan(value):
+            self.nans = self.nans - 1
+            return
+        count = len(self.values) - self.nans    # values left in the totals
+        if count == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = value - self.mean
+        self.mean = self.mean - delta / count
+        self.m2 = self.m2 - delta * (value - self.mean)
+
+    def rebuild(self):
+        numbers = [v for v in self.values if not math.isnan(v)]
+        self.nans = len(self.values) - len(numbers)
+        self.mean = math.fsum(numbers) / len(numbers) if numbers else 0.0
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in numbers)
+        self.pushes = 0
+
+    def full(self):
+        """ True once the window holds size values and none of them is NaN. """
+        return len(self.values) == self.size and not self.nans
+
+    def sum(self):
+        return self.mean * len(self.values) if self.full() else NAN
+
+    def average(self):
+        return self.mean if self.full() else NAN
+
+    def std(self):
+        """ Sample standard deviation (ddof=1, same as pandas rolling std). """
+        if not self.full() or self.size < 2:
+            return NAN
+        return math.sqrt(max(self.m2, 0.0) / (self.size - 1))
+
+
+def _divide(numerator, denominator):
+    """ Float division that follows numpy / pandas semantics instead of raising. """
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+# BASE CLASS
+class StreamingIndicator(ABC):
+    """ Base class for streaming indicators. Subclasses take the same parameters as
+    the matching batch function (minus the data frame and column labels), and their
+    update() takes the bar values in the same order as the batch function's labels.
+    update() returns the indicator value for that bar (NaN until warmed up), which is
+    also kept in self.value. """
+
+    def __init__(self, **params):
+        self.params = params
+        self.value = NAN
+        self.count = 0    # number of bars seen
+
+    @abstractmethod
+    def update(self, *values):
+        """ Feeds one bar. Returns the indicator value for it. """
+        pass
+
+    def get_state(self):
+        """ Returns a JSON serializable dict with everything needed to resume. """
+        state = {}
+        for k, v in self.__dict__.items():
+            if k == 'params':
+                continue
+            if isinstance(v, RollingWindow):
+                state[k] = {'values': list(v.values), 'mean': v.mean, 'm2': v.m2, 'nans': v.nans, 'pushes': v.pushes}
+            elif isinstance(v, deque):
+                state[k] = list(v)
+            else:
+                state[k] = v
+        return {'indicator': type(self).__name__, 'params': self.params, 'state': state}
+
+    @classmethod
+    def from_state(cls, state):
+        """ Rebuilds an indicator from the output of get_state(). """
+        indicator = cls(**state['params'])
+        for k, v in state['state'].items():
+            current = getattr(indicator, k)
+            if isinstance(current, RollingWindow):
+                current.values.extend(v['values'])
+                current.mean = v['mean']
+                current.m2 = v['m2']
+                current.nans = v['nans']
+                current.pushes = v['pushes']
+            elif isinstance(current, deque):
+                current.extend(v)
+            else:
+                setattr(indicator, k, v)
+        return indicator
+
+    def to_json(self):
+        return json.dumps(self.get_state())
+
+
+def load_indicator(state):
+    """ Rebuilds any streaming indicator from get_state() output (dict or JSON string). """
+    if isinstance(state, str):
+        state = json.loads(state)
+    return STREAMING_INDICATORS_BY_CLASS[state['indicator']].from_state(state)
+
+
+# GENERAL INDICATORS
+class StreamingBollingerBand(StreamingIndicator):
+    """ Streaming utils.indicators.bollinger_band(). update(value) -> normalized band width. """
+
+    def __init__(self, rolling_window, standard_deviation):
+        super().__init__(rolling_window=rolling_window, standard_deviation=standard_deviation)
+        self.window = RollingWindow(rolling_window)
+
+    def update(self, value):
+        self.window.push(value)
+        self.count = self.count + 1
+        bb_mid = self.window.average()
+        band = self.params['standard_deviation'] * self.window.std()
+        self.value = _divide((bb_mid + band) - (bb_mid - band), bb_mid)
+        return self.value
+
+
+class StreamingROC(StreamingIndicator):
+    """ Streaming utils.indicators.roc(). update(close) -> rate of change. """
+
+    def __init__(self, rolling_window):
+        super().__init__(rolling_window=rolling_window)
+        self.closes = deque(maxlen=rolling_window)
+
+    def update(self, close):
+        self.closes.append(close)
+        self.count = self.count + 1
+        if len(self.closes) < self.params['rolling_window']:
+            self.value = NAN
+        else:
+            previous_price = self.closes[0]
+            self.value = _divide(close - previous_price, previous_price)
+        return self.value
+
+
+# MOVING AVERAGES
+class StreamingSMA(StreamingIndicator):
+    """ Streaming utils.indicators.sma(). update(close) -> simple moving average. """
+
+    def __init__(self, rolling_window):
+        super().__init__(rolling_window=rolling_window)
+        self.window = RollingWindow(rolling_window)
+
+    def update(self, close):
+        self.window.push(close)
+        self.count = self.count + 1
+        self.value = self.window.average()
+        return self.value
+
+
+class StreamingZLEMA(StreamingIndicator):
+    """ Streaming utils.indicators.zlema(). update(close) -> zero lag ema. """
+
+    def __init__(self, rolling_window):
+        super().__init__(rolling_window=rolling_window)
+        self.lag = int(math.floor((rolling_window - 1) / 2))
+        self.smoothing_factor = 2 / (rolling_window + 1)
+        self.closes = deque(maxlen=self.lag + 1)    # current close plus the lagged ones
+
+    def update(self, close):
+        self.closes.append(close)
+        self.count = self.count + 1
+        start = max(self.lag - 1, 0)    # row the zlema is seeded on (see utils.filters.zlema_array)
+        if self.count - 1 < start:
+            self.value = NAN
+        elif self.count - 1 == start:
+            self.value = close
+        else:
+            delagged = close + (close - self.closes[0])
+            self.value = ((1 - self.smoothing_factor) * self.value) + self.smoothing_factor * delagged
+        return self.value
+
+
+# MOMENTUM INDICATORS
+class StreamingMomentum(StreamingIndicator):
+    """ Streaming utils.indicators.momentum(). update(close) -> momentum. """
+
+    def __init__(self, rolling_window):
+        super().__init__(rolling_window=rolling_window)
+        self.closes = deque(maxlen=rolling_window)
+
+    def update(self, close):
+        self.closes.append(close)
+        self.count = self.count + 1
+        self.value = close - self.closes[0] if len(self.closes) == self.params['rolling_window'] else NAN
+        return self.value
+
+
+class StreamingCCI(StreamingIndicator):
+    """ Streaming utils.indicators.cci(). update(high, low, close) -> cci.
+
+    The mean deviation is taken around the moving average, which moves every bar. The
+    typical prices in the window are also kept sorted, split at the average with a running
+    sum of the ones below it, so the total deviation is 2 * (sma * below - below_sum). A
+    bar only moves the prices the average stepped over from one side to the other, so an
+    update is a binary search plus a list insert and delete instead of a pass over the
+    window. """
+
+    def __init__(self, rolling_window):
+        super().__init__(rolling_window=rolling_window)
+        self.window = RollingWindow(rolling_window)
+        self.sorted_prices = []    # typical prices in the window (NaN left out), ascending
+        self.below = 0    # sorted_prices[:below] are below the last average
+        self.below_sum = 0.0
+
+    def update(self, high, low, close):
+        typical_price = (high + low + close) / 3
+        if len(self.window.values) == self.params['rolling_window']:
+            self._discard(self.window.values[0])
+        self.window.push(typical_price)
+        self._insert(typical_price)
+        if self.window.pushes == 0:    # the window just rebuilt its totals, same for the running sum
+            self.below_sum = math.fsum(self.sorted_prices[:self.below])
+        self.count = self.count + 1
+        if not self.window.full():
+            self.value = NAN
+        else:
+            typical_price_sma = self.window.average()
+            self._split(typical_price_sma)
+            mean_deviation = max(2 * (typical_price_sma * self.below - self.below_sum), 0.0) / self.params['rolling_window']
+            self.value = _divide(typical_price - typical_price_sma, LAMBERT_CONSTANT * mean_deviation)
+        return self.value
+
+    def _insert(self, typical_price):
+        if math.isnan(typical_price):
+            return
+        i = bisect.bisect_right(self.sorted_prices, typical_price)
+        self.sorted_prices.insert(i, typical_price)
+        if i < self.below:
+            self.below = self.below + 1
+            self.below_sum = self.below_sum + typical_price
+
+    def _discard(self, typical_price):
+        if math.isnan(typical_price):
+            return
+        i = bisect.bisect_left(self.sorted_prices, typical_price)
+        del self.sorted_prices[i]
+        if i < self.below:
+            self.below = self.below - 1
+            self.below_sum = self.below_sum - typical_price
+
+    def _split(self, average):
+        """ Moves the split to the new average, one price at a time. """
+        while self.below < len(self.sorted_prices) and self.sorted_prices[self.below] < average:
+            self.below_sum = self.below_sum + self.sorted_prices[self.below]
+            self.below = self.below + 1
+        while self.below > 0 and self.sorted_prices[self.below - 1] >= average:
+            self.below = self.below - 1
+            self.below_sum = self.below_sum - self.sorted_prices[self.below]
+
+
+class StreamingRSI(StreamingIndicator):
+    """ Streaming utils.indicators.rsi(). update(close) -> Wilder's rsi. """
+
+    def __init__(self, rolling_window):
+        super().__init__(rolling_window=rolling_window)
+        self.previous_close = NAN
+        self.avg_gain = 0.0    # running sum until the first window is complete, Wilder average after
+        self.avg_loss = 0.0
+
+    def update(self, close):
+        rolling_window = self.params['rolling_window']
+        change = close - self.previous_close
+        self.previous_close = close
+        self.count = self.count + 1
+        if self.count == 1:    # no change on the first bar
+            self.value = NAN
+            return self.value
+
+        gain = max(change, 0.0)
+        loss = abs(min(change, 0.0))
+        if self.count <= rolling_window:    # still filling the seed window
+            self.avg_gain = self.avg_gain + gain
+            self.avg_loss = self.avg_loss + loss
+            self.value = NAN
+            return self.value
+        if self.count == rolling_window + 1:    # seed with the simple average
+            self.avg_gain = (self.avg_gain + gain) / rolling_window
+            self.avg_loss = (self.avg_loss + loss) / rolling_window
+        else:
+            self.avg_gain = (self.avg_gain * (rolling_window - 1) + gain) / rolling_window
+            self.avg_loss = (self.avg_loss * (rolling_window - 1) + loss) / rolling_window
+
+        self.value = 100 - _divide(100, 1 + _divide(self.avg_gain, self.avg_loss))
+        return self.value
+
+
+class StreamingMoneyFlowIndex(StreamingIndicator):
+    """ Streaming utils.indicators.money_flow_index(). update(close, high, low, volume) -> mfi. """
+
+    def __init__(self, rolling_window):
+        super().__init__(rolling_window=rolling_window)
+        self.previous_typical_price = NAN
+        self.positive_flows = RollingWindow(rolling_window)
+        self.negative_flows = RollingWindow(rolling_window)
+
+    def update(self, close, high, low, volume):
+        typical_price = (close + high + low) / 3
+        change = typical_price - self.previous_typical_price    # NaN on the first bar, counted as neither
+        self.previous_typical_price = typical_price
+        raw_money_flow = volume * typical_price
+        self.positive_flows.push(raw_money_flow if change >= 0 else 0.0)
+        self.negative_flows.push(raw_money_flow if change < 0 else 0.0)
+        self.count = self.count + 1
+        money_flow_ratio = _divide(self.positive_flows.sum(), self.negative_flows.sum())
+        self.value = 100 - _divide(100, 1 + money_flow_ratio)
+        return self.value
+
+
+class StreamingChandeMomentumOscillator(StreamingIndicator):
+    """ Streaming utils.indicators.chande_momentum_oscillator(). update(close) -> cmo. """
+
+    def __init__(self, rolling_window):
+        super().__init__(rolling_window=rolling_window)
+        self.previous_close = NAN
+        self.higher_closes = RollingWindow(rolling_window)
+        self.lower_closes = RollingWindow(rolling_window)
+
+    def update(self, close):
+        change = close - self.previous_close
+        self.previous_close = close
+        self.higher_closes.push(abs(change) if change >= 0 else 0.0)
+        self.lower_closes.push(abs(change) if change < 0 else 0.0)
+        self.count = self.count + 1
+        sum_higher_closes = self.higher_closes.sum()
+        sum_lower_closes = self.lower_closes.sum()
+        self.value = _divide(sum_higher_closes - sum_lower_closes, sum_higher_closes + sum_lower_closes) * 100
+        return self.value
+
+
+# VOLATILITY INDICATORS
+class StreamingAnnualizedHistoricalVolatility(StreamingIndicator):
+    """ Streaming utils.indicators.annualized_historical_volatility(). update(close) -> volatility. """
+
+    def __init__(self, rolling_window):
+        super().__init__(rolling_window=rolling_window)
+        self.previous_close = NAN
+        self.returns = RollingWindow(rolling_window)
+
+    def update(self, close):
+        self.count = self.count + 1
+        if self.count > 1:    # the first bar has no return, so the window starts one bar later
+            self.returns.push(math.log(close / self.previous_close))
+        self.previous_close = close
+        self.value = math.sqrt(ANNUALIZED_FACTOR) * self.returns.std()
+        return self.value
+
+
+class StreamingGarmanKlassVolatility(StreamingIndicator):
+    """ Streaming utils.indicators.garman_klass_volatility(). update(open, high, low, close) -> volatility. """
+
+    def __init__(self, rolling_window):
+        super().__init__(rolling_window=rolling_window)
+        self.constant = (2 * math.log(2)) - 1
+        self.terms = RollingWindow(rolling_window)
+
+    def update(self, open, high, low, close):
+        combined_terms = (0.5 * math.log(high / low) ** 2) + (self.constant * math.log(close / open) ** 2)
+        self.terms.push(combined_terms)
+        self.count = self.count + 1
+        average = self.terms.average()
+        self.value = math.sqrt(average) if average >= 0 else NAN
+        return self.value
+
+
+# PRICE INDICATORS
+class StreamingVWAP(StreamingIndicator):
+    """ Streaming utils.indicators.vwap(). update(close, high, low, volume) -> vwap. """
+
+    def __init__(self, rolling_window):
+        super().__init__(rolling_window=rolling_window)
+        self.volumes = RollingWindow(rolling_window)
+
+    def update(self, close, high, low, volume):
+        typical_price = (close + high + low) / 3
+        self.volumes.push(volume)
+        self.count = self.count + 1
+        self.value = _divide(volume * typical_price, self.volumes.sum())
+        return self.value
+
+
+# REGISTRY
+STREAMING_INDICATORS = {    # batch function name -> streaming class
+    'bollinger_band': StreamingBollingerBand,
+    'roc': StreamingROC,
+    'sma': StreamingSMA,
+    'zlema': StreamingZLEMA,
+    'momentum': StreamingMomentum,
+    'cci': StreamingCCI,
+    'rsi': StreamingRSI,
+    'money_flow_index': StreamingMoneyFlowIndex,
+    'chande_momentum_oscillator': StreamingChandeMomentumOscillator,
+    'annualized_historical_volatility': StreamingAnnualizedHistoricalVolatility,
+    'garman_klass_volatility': StreamingGarmanKlassVolatility,
+    'vwap': StreamingVWAP,
+}
+STREAMING_INDICATORS_BY_CLASS = {cls.__name__: cls for cls in STREAMING_INDICATORS.values()}
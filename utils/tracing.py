@@ -0,0 +1,185 @@
+###############################################################################
+# FILENAME: tracing.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Tick-to-trade tracing. apply_strategy starts a trace (with a
+# trace id) for the price row it acts on, and the decision, the quote the
+# exchange was picked on, the order request and the venue's acknowledgement
+# are stamped on it as the cycle goes through execute_trades and the order
+# functions. The trace follows the cycle through a context variable, so the
+# exchange modules stamp it without it being passed around. execute_trades
+# writes the stamps and the derived latencies to the bot log
+# (base.TRACE_COLUMNS); the event driven mode writes the synthetic order fills
+# and their traces to their own store (synthetic_fill_store_dir). report()
+# gives percentiles over time.
+#
+# Stamps are wall clock (epoch seconds):
+#   price_published_at      the price's own timestamp (the price row's 'time', or the tick's exchange time)
+#   price_observed_at       the bot got the price (tick arrival, or when run() loaded the price data)
+#   decision_made_at        apply_strategy decided the trade action
+#   quote_received_at       the quote the exchange was selected on arrived
+#   order_sent_at           the order request went out
+#   order_acknowledged_at   the venue's response arrived
+# price_age_ms is how long after the bot got the price the order was sent, and
+# tick_to_trade_ms how long after it the venue acknowledged the order; the
+# report also gives feed_ms (publish to arrival) and publish_to_trade_ms.
+#
+# Usage: python -m utils.tracing [--store /tmp/bot_history/] [--synthetic-store /tmp/bot_synthetic_fills/] [--period D] [--rows 100000]
+###############################################################################
+import os
+import time
+import uuid
+import argparse
+import contextvars
+
+from base import TRACE_COLUMNS
+from utils.lazy import lazy_import
+from config import config_params
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+
+# CONFIG
+STAGES = ['price_published', 'price_observed', 'decision_made', 'quote_received', 'order_sent', 'order_acknowledged']
+REPORT_PERCENTILES = [50, 90, 99]
+BREAKDOWN = {    # report column -> (from stamp, to stamp)
+    'feed_ms': ('price_published_at', 'price_observed_at'),
+    'decision_ms': ('price_observed_at', 'decision_made_at'),
+    'quote_ms': ('decision_made_at', 'quote_received_at'),
+    'order_ms': ('quote_received_at', 'order_sent_at'),
+    'ack_ms': ('order_sent_at', 'order_acknowledged_at'),
+    'price_age_ms': ('price_observed_at', 'order_sent_at'),
+    'tick_to_trade_ms': ('price_observed_at', 'order_acknowledged_at'),
+    'publish_to_trade_ms': ('price_published_at', 'order_acknowledged_at'),
+}
+
+
+# TRACE
+class TradeTrace:
+    """ Stamps of one decision / execution path, keyed by stage (see STAGES). """
+
+    __slots__ = ('trace_id', 'stamps')
+
+    def __init__(self, price_observed_at=None, trace_id=None, price_published_at=None):
+        self.trace_id = trace_id or str(uuid.uuid4())    # a uuid, so it can double as a venue client order id
+        self.stamps = {'price_observed': time.time() if price_observed_at is None else price_observed_at}
+        if price_published_at is not None:
+            self.stamps['price_published'] = price_published_at
+
+    def mark(self, stage, at=None):
+        """ Stamps a stage (now, or at the given epoch seconds). A later stamp of the same stage replaces it (e.g. a re-quote). """
+        if stage not in STAGES:
+            raise ValueError('Unknown trace stage: ' + str(stage))
+        self.stamps[stage] = time.time() if at is None else at
+
+    def breakdown(self):
+        """ The trace as bot log columns (base.TRACE_COLUMNS): the stamps, price_age_ms and tick_to_trade_ms. Returns dict. """
+        row = {'trace_id': self.trace_id}
+        for stage in STAGES:
+            row[stage + '_at'] = self.stamps.get(stage, np.nan)
+        observed = self.stamps['price_observed']
+        row['price_age_ms'] = (self.stamps['order_sent'] - observed) * 1000 if 'order_sent' in self.stamps else np.nan
+        row['tick_to_trade_ms'] = (self.stamps['order_acknowledged'] - observed) * 1000 if 'order_acknowledged' in self.stamps else np.nan
+        return {col_name: row[col_name] for col_name in TRACE_COLUMNS}
+
+    def __repr__(self):
+        return 'TradeTrace(' + self.trace_id + ' ' + ', '.join(stage + '=' + str(round(at, 3)) for stage, at in self.stamps.items()) + ')'
+
+
+_current = contextvars.ContextVar('trade_trace', default=None)
+
+
+def start_trace(price_observed_at=None, trace_id=None, price_published_at=None):
+    """ Starts a trace and makes it the current one for this thread / context. Returns TradeTrace. """
+    trace = TradeTrace(price_observed_at, trace_id, price_published_at)
+    _current.set(trace)
+    return trace
+
+
+def current_trace():
+    """ The trace of the cycle being run in this context, or None. """
+    return _current.get()
+
+
+def mark(stage, at=None):
+    """ Stamps a stage on the current trace (no-op outside a traced cycle). """
+    trace = _current.get()
+    if trace is not None:
+        trace.mark(stage, at)
+
+
+def price_time(price_df):
+    """ Epoch seconds of the last price row's own 'time' (epoch seconds or a date string), or None if it has none. """
+    if price_df is None or 'time' not in price_df.columns or not len(price_df):
+        return None
+    value = price_df['time'].iloc[-1]
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        try:
+            return pd.Timestamp(value).timestamp()    # naive times are taken as utc
+        except ValueError:
+            return None
+
+
+def wall_time(perf_counter_reading):
+    """ Epoch seconds of a time.perf_counter() reading (e.g. PriceTick.received_at). """
+    return time.time() - (time.perf_counter() - perf_counter_reading)
+
+
+# REPORT
+def latency_breakdown(df):
+    """ Per trade latencies in ms (BREAKDOWN columns) for the rows of a bot log that sent an
+    order, indexed by when their price was observed. Returns df. """
+    trades = df[df['order_sent_at'].notna()] if 'order_sent_at' in df.columns else df.iloc[0:0]
+    out = pd.DataFrame({name: (pd.to_numeric(trades[end]) - pd.to_numeric(trades[start])) * 1000 for name, (start, end) in BREAKDOWN.items()})
+    out.index = pd.to_datetime(pd.to_numeric(trades['price_observed_at']), unit='s')
+    out['trace_id'] = trades['trace_id'].to_numpy()
+    out['exchange_selected'] = trades['exchange_selected'].to_numpy()
+    return out
+
+
+def report(df, period='D', percentiles=None, columns=None):
+    """ Prints the latency percentiles of the traded rows of a bot log per period (a pandas
+    offset alias, e.g. 'h', 'D', 'W') and over the whole log. Returns df indexed by
+    (period, latency) with one column per percentile plus the trade count. """
+    percentiles = percentiles or REPORT_PERCENTILES
+    columns = columns or ['price_age_ms', 'tick_to_trade_ms', 'feed_ms', 'publish_to_trade_ms', 'decision_ms', 'quote_ms', 'order_ms', 'ack_ms']
+    trades = latency_breakdown(df)
+    if trades.empty:
+        print('No traced trades in the bot log.')
+        return pd.DataFrame()
+
+    rows = []
+    for label, group in [(str(start), group) for start, group in trades.groupby(trades.index.floor(period))] + [('all', trades)]:
+        for column in columns:
+            values = group[column].dropna().to_numpy()
+            if len(values):
+                row = {'period': label, 'latency': column, 'trades': len(values)}
+                row.update({'p' + str(p): float(np.percentile(values, p)) for p in percentiles})
+                row['max'] = float(values.max())
+                rows.append(row)
+    result = pd.DataFrame(rows).set_index(['period', 'latency'])
+
+    print('Tick to trade latency over ' + str(len(trades)) + ' trade(s) (ms, ' + ' / '.join('p' + str(p) for p in percentiles) + ' / max):')
+    for (label, column), row in result.iterrows():
+        print('    ' + label.ljust(26) + column.ljust(21) + str(int(row['trades'])).rjust(6) + ''.join(str(round(row['p' + str(p)], 2)).rjust(11) for p in percentiles) + str(round(row['max'], 2)).rjust(11))
+    return result
+
+
+# ENTRY POINT
+if __name__ == '__main__':
+    from utils.history_store import HistoryStore
+    parser = argparse.ArgumentParser(description='Tick to trade latency percentiles from the bot history store.')
+    parser.add_argument('--store', default=config_params['history_store_dir'], help='history store directory')
+    parser.add_argument('--synthetic-store', default=config_params['synthetic_fill_store_dir'], help='synthetic order fill store directory (skipped if it does not exist)')
+    parser.add_argument('--period', default='D', help="pandas offset alias to group by (e.g. 'h', 'D', 'W')")
+    parser.add_argument('--rows', type=int, help='only the last ROWS rows of the history')
+    args = parser.parse_args()
+    stores = [HistoryStore(args.store)]
+    if args.synthetic_store and os.path.isdir(args.synthetic_store):
+        stores.append(HistoryStore(args.synthetic_store))
+    frames = [store.read_tail(args.rows) if args.rows else store.read() for store in stores]
+    report(pd.concat([df for df in frames if len(df)] or frames[:1], ignore_index=True), args.period)
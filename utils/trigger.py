@@ -0,0 +1,134 @@
+###############################################################################
+# FILENAME: trigger.py
+# PROJECT: EOC Limit Order Bot Template
+# CLIENT:
+# DATE CREATED: 18 Oct 2026
+# DESCRIPTION: Threshold crossing trigger for the event driven run mode. Each
+# price tick from a feed goes through ThresholdTrigger, which fires once when
+# the price has settled on the other side of the bot's threshold: hysteresis
+# keeps a price wobbling around the threshold from flipping the zone back and
+# forth, and debouncing waits for the new zone to hold before firing. When the
+# run a trigger fired did not leave the bot in the zone's trade status (e.g.
+# a buy with no quote in time), retry() fires again for the same zone. The
+# latency from tick to fired trigger to finished order is kept per event.
+###############################################################################
+import time
+
+
+# CONFIG
+BELOW = 'below'    # in the trade zone (apply_strategy buys / holds)
+ABOVE = 'above'    # out of the trade zone (apply_strategy sells / does nothing)
+SETTLED_STATUSES = {BELOW: ['Buy', 'Hold'], ABOVE: ['Sell', 'No Action']}    # trade statuses a run in the zone should end on
+
+
+# EVENTS
+class TriggerEvent:
+    """ One fired trigger. All times are perf_counter() readings. """
+
+    def __init__(self, zone, previous_zone, tick, crossed_at):
+        self.zone = zone
+        self.previous_zone = previous_zone    # None for the first zone of the session, the same zone for a retry
+        self.tick = tick    # the tick that fired the trigger
+        self.price = tick.price
+        self.crossed_at = crossed_at    # arrival of the first tick in the new zone
+        self.fired_at = time.perf_counter()
+        self.strategy_done_at = None
+        self.order_done_at = None
+
+    def latency(self):
+        """ Seconds from the crossing tick to firing (debounce wait), from firing to the end
+        of apply_strategy and on to the end of execute_trades. Returns dict. """
+        return {
+            'debounce': self.fired_at - self.crossed_at,
+            'strategy': None if self.strategy_done_at is None else self.strategy_done_at - self.fired_at,
+            'order': None if self.order_done_at is None or self.strategy_done_at is None else self.order_done_at - self.strategy_done_at,
+            'trigger_to_order': None if self.order_done_at is None else self.order_done_at - self.fired_at,
+            'tick_to_order': None if self.order_done_at is None else self.order_done_at - self.tick.received_at,
+        }
+
+
+# TRIGGER
+class ThresholdTrigger:
+    """ Fires when the price moves to the other side of threshold. The zone only changes
+    once the price is more than "hysteresis" USD past the threshold, and the trigger only
+    fires once the new zone has held for "debounce" seconds (checked as ticks arrive; a
+    tick back in the old zone cancels it). The first tick of a session sets the starting
+    zone and fires too, so the bot acts on where the price already is. """
+
+    def __init__(self, threshold, hysteresis=0.0, debounce=0.0):
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.debounce = debounce
+        self.zone = None    # last zone fired
+        self.pending_zone = None    # zone waiting out the debounce
+        self.pending_since = None
+        self.ticks = 0
+        self.fires = 0
+        self.cancelled = 0    # crossings that reverted before the debounce elapsed
+        self.retries = 0
+
+    def classify(self, price):
+        """ Zone the price is in, allowing for hysteresis around the current zone. """
+        if self.zone == BELOW:
+            return ABOVE if price >= self.threshold + self.hysteresis else BELOW
+        if self.zone == ABOVE:
+            return BELOW if price < self.threshold - self.hysteresis else ABOVE
+        return BELOW if price < self.threshold else ABOVE    # no zone yet: plain comparison, same as apply_strategy
+
+    def update(self, tick):
+        """ Feeds one tick. Returns a TriggerEvent if the trigger fires, else None. """
+        self.ticks = self.ticks + 1
+        zone = self.classify(tick.price)
+        if zone == self.zone:
+            if self.pending_zone is not None:
+                self.cancelled = self.cancelled + 1
+            self.pending_zone = None
+            self.pending_since = None
+            return None
+
+        if zone != self.pending_zone:    # first tick of a new crossing
+            if self.pending_zone is not None:
+                self.cancelled = self.cancelled + 1
+            self.pending_zone = zone
+            self.pending_since = tick.received_at
+        if time.perf_counter() - self.pending_since < self.debounce:
+            return None
+
+        event = TriggerEvent(zone, self.zone, tick, self.pending_since)
+        self.zone = zone
+        self.pending_zone = None
+        self.pending_since = None
+        self.fires = self.fires + 1
+        return event
+
+    def retry(self, tick):
+        """ Fires again for the current zone on this tick, unless a crossing is waiting out its
+        debounce. Returns a TriggerEvent, or None. """
+        if self.zone is None or self.pending_zone is not None:
+            return None
+        self.retries = self.retries + 1
+        self.fires = self.fires + 1
+        return TriggerEvent(self.zone, self.zone, tick, tick.received_at)
+
+    def settled(self, trade_status):
+        """ True if trade_status is where a run in the current zone should leave the bot. """
+        return self.zone is None or trade_status in SETTLED_STATUSES[self.zone]
+
+
+# LATENCY REPORT
+def latency_report(events):
+    """ Prints the trigger to order latencies of the events (in ms) with their median, 95th
+    percentile and max. Returns dict of stage -> list of seconds. """
+    stages = {}
+    for event in events:
+        for stage, seconds in event.latency().items():
+            if seconds is not None:
+                stages.setdefault(stage, []).append(seconds)
+
+    print('Trigger latency over ' + str(len(events)) + ' event(s) (ms, median / p95 / max):')
+    for stage, values in stages.items():
+        values = sorted(values)
+        median = values[len(values) // 2]
+        p95 = values[min(len(values) - 1, int(0.95 * len(values)))]
+        print('    ' + stage.ljust(18) + str(round(median * 1000, 2)).rjust(10) + str(round(p95 * 1000, 2)).rjust(10) + str(round(values[-1] * 1000, 2)).rjust(10))
+    return stages